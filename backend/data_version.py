@@ -0,0 +1,41 @@
+# backend/data_version.py
+"""
+Caches keyed by per-table change counters
+The data_versions table (migration 005) is bumped by a statement-level
+trigger on every write, so checking for changes is one primary-key read
+"""
+
+from typing import Any, Callable, Sequence, Tuple
+
+
+def get_data_version(cursor, tables: Sequence[str]) -> Tuple[int, ...]:
+    """Current counter per table, in the order given"""
+    cursor.execute(
+        "SELECT table_name, version FROM data_versions WHERE table_name = ANY(%s)",
+        (list(tables),),
+    )
+    versions = {row['table_name']: row['version'] for row in cursor.fetchall()}
+    return tuple(versions.get(table, 0) for table in tables)
+
+
+class VersionedCache:
+    """One value built from some tables, rebuilt only when any of them changed"""
+
+    def __init__(self, tables: Sequence[str]):
+        self.tables = tuple(tables)
+        self.version = None
+        self.value = None
+
+    def get(self, cursor, build: Callable[[Any], Any], extra: Tuple = ()) -> Any:
+        """Return the cached value, or build(cursor) if the tables or `extra` changed"""
+        # Read the version before building, so a write during the build is
+        # picked up by the next call
+        version = get_data_version(cursor, self.tables) + tuple(extra)
+        if version != self.version:
+            self.value = build(cursor)
+            self.version = version
+        return self.value
+
+    def clear(self):
+        self.version = None
+        self.value = None
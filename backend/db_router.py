@@ -0,0 +1,247 @@
+# backend/db_router.py
+"""
+Primary/replica connection routing for the API
+Reads go to a streaming replica when one is healthy and caught up; writes,
+view refreshes and reads right after a client's own write go to the primary
+"""
+
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+# HTTP methods that may be served from a replica
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Replay lag in seconds. "Replayed everything received" only means caught up
+# while the WAL receiver is streaming; a disconnected replica reports the time
+# since its last replayed transaction and is never considered usable
+REPLICA_LAG_SQL = """
+    SELECT
+        pg_is_in_recovery() AS in_recovery,
+        streaming,
+        CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN streaming AND pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END AS lag_seconds
+    FROM (
+        SELECT NOT pg_is_in_recovery()
+               OR EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') AS streaming
+    ) AS receiver
+"""
+
+# (is_read, client_id) of the request being handled, set by the API middleware
+_request_route: ContextVar[Optional[tuple]] = ContextVar("request_route", default=None)
+
+
+def is_read_request(method: str, read_only: bool = False) -> bool:
+    """Read methods, plus endpoints that take a body but never write (read_only)"""
+    return read_only or method.upper() in READ_METHODS
+
+
+def begin_request(method: str, client_id: Optional[str], read_only: bool = False):
+    """Record the current request so DatabaseRouter.get_connection() can route it"""
+    return _request_route.set((is_read_request(method, read_only), client_id))
+
+
+def end_request(token):
+    _request_route.reset(token)
+
+
+class ReplicaNode:
+    """Connection string plus the last observed state of one replica"""
+
+    def __init__(self, name: str, dsn: str):
+        self.name = name
+        self.dsn = dsn
+        self.healthy = True
+        self.streaming: Optional[bool] = None
+        self.lag_seconds: Optional[float] = None
+        self.checked_at = 0.0
+        self.error: Optional[str] = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "role": "replica",
+            "status": "healthy" if self.healthy else "unavailable",
+            "streaming": self.streaming,
+            "lag_seconds": self.lag_seconds,
+            "error": self.error,
+        }
+
+
+class DatabaseRouter:
+    """Picks the primary or a replica for each connection request"""
+
+    def __init__(
+        self,
+        primary_dsn: str,
+        replica_dsns: Optional[List[str]] = None,
+        max_lag_seconds: float = 5.0,
+        read_after_write_seconds: float = 10.0,
+        check_interval_seconds: float = 5.0,
+        connect_timeout: int = 2,
+    ):
+        self.primary_dsn = primary_dsn
+        self.replicas = [
+            ReplicaNode(f"replica-{i + 1}", dsn) for i, dsn in enumerate(replica_dsns or [])
+        ]
+        self.max_lag_seconds = max_lag_seconds
+        self.read_after_write_seconds = read_after_write_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.connect_timeout = connect_timeout
+
+        self._next_replica = itertools.count()
+        # Per-process: pins only hold with a single API worker (docs/SETUP.md)
+        self._last_write: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    # Read-after-write pinning
+
+    def record_write(self, client_id: Optional[str]):
+        """Pin the client's reads to the primary for read_after_write_seconds"""
+        if not client_id:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[client_id] = now
+            # Drop expired pins so the map stays bounded by active writers
+            cutoff = now - self.read_after_write_seconds
+            for key in [k for k, t in self._last_write.items() if t < cutoff]:
+                del self._last_write[key]
+
+    def _recently_wrote(self, client_id: Optional[str]) -> bool:
+        if not client_id:
+            return False
+        with self._lock:
+            written_at = self._last_write.get(client_id)
+        return written_at is not None and time.monotonic() - written_at < self.read_after_write_seconds
+
+    # Connections
+
+    def get_connection(self, primary: bool = False):
+        """
+        Open a connection for the current request.
+        Replicas are only used for read requests that did not ask for the
+        primary and whose client has not written recently.
+        """
+        route = _request_route.get()
+        use_replica = (
+            not primary
+            and self.replicas
+            and route is not None
+            and route[0]
+            and not self._recently_wrote(route[1])
+        )
+        if use_replica:
+            conn = self._connect_replica()
+            if conn is not None:
+                return conn
+        return psycopg2.connect(self.primary_dsn, cursor_factory=RealDictCursor)
+
+    def _connect_replica(self):
+        """Connect to the next usable replica, or return None to fall back to the primary"""
+        start = next(self._next_replica)
+        for offset in range(len(self.replicas)):
+            node = self.replicas[(start + offset) % len(self.replicas)]
+            due = time.monotonic() - node.checked_at >= self.check_interval_seconds
+            # Skip known-bad nodes until their next check is due
+            if not due and not self._is_usable(node):
+                continue
+
+            try:
+                conn = psycopg2.connect(
+                    node.dsn,
+                    cursor_factory=RealDictCursor,
+                    connect_timeout=self.connect_timeout,
+                )
+            except psycopg2.Error as e:
+                self._mark_unavailable(node, e)
+                continue
+
+            if due:
+                try:
+                    self._probe(node, conn)
+                except psycopg2.Error as e:
+                    conn.close()
+                    self._mark_unavailable(node, e)
+                    continue
+
+            if self._is_usable(node):
+                conn.set_session(readonly=True)
+                return conn
+            conn.close()
+        return None
+
+    def _is_usable(self, node: ReplicaNode) -> bool:
+        return (
+            node.healthy
+            and node.streaming
+            and node.lag_seconds is not None
+            and node.lag_seconds <= self.max_lag_seconds
+        )
+
+    def _probe(self, node: ReplicaNode, conn):
+        cursor = conn.cursor()
+        cursor.execute(REPLICA_LAG_SQL)
+        row = cursor.fetchone()
+        # End the probe's transaction so the session can still be made read-only
+        conn.rollback()
+
+        lag = row["lag_seconds"]
+        node.lag_seconds = float(lag) if lag is not None else None
+        node.streaming = bool(row["streaming"])
+        node.healthy = True
+        node.error = None
+        node.checked_at = time.monotonic()
+        if not node.streaming:
+            logger.warning(f"{node.name} WAL receiver not streaming; reads fall back to primary")
+        elif not self._is_usable(node):
+            logger.warning(f"{node.name} lagging ({node.lag_seconds}s); reads fall back to primary")
+
+    def _mark_unavailable(self, node: ReplicaNode, error: Exception):
+        if node.healthy:
+            logger.warning(f"{node.name} unavailable; reads fall back to primary: {error}")
+        node.healthy = False
+        node.streaming = None
+        node.lag_seconds = None
+        node.error = str(error).strip()
+        node.checked_at = time.monotonic()
+
+    # Health
+
+    def health(self) -> List[Dict[str, Any]]:
+        """Check every node now; raises if the primary is unreachable"""
+        conn = psycopg2.connect(self.primary_dsn, cursor_factory=RealDictCursor)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+        finally:
+            conn.close()
+        nodes = [{"name": "primary", "role": "primary", "status": "healthy"}]
+
+        for node in self.replicas:
+            try:
+                conn = psycopg2.connect(node.dsn, cursor_factory=RealDictCursor, connect_timeout=self.connect_timeout)
+                try:
+                    self._probe(node, conn)
+                finally:
+                    conn.close()
+            except psycopg2.Error as e:
+                self._mark_unavailable(node, e)
+
+            status = node.status()
+            if node.healthy and not self._is_usable(node):
+                status["status"] = "lagging"
+            nodes.append(status)
+        return nodes
@@ -11,18 +11,22 @@ from psycopg2.extras import RealDictCursor
 from datetime import datetime, date
 import logging
 from config import settings
+from dividend_data import fetch_symbol_dividends, upsert_dividends
+from fmp_client import FMPClient
+from provider_cache import MODE_REPLAY, ProviderCache
 
 logger = logging.getLogger(__name__)
 
 class DividendCollector:
-    def __init__(self, fmp_api_key: str = None, db_connection_string: str = None):
+    def __init__(self, fmp_api_key: str = None, db_connection_string: str = None, cache: ProviderCache = None):
         # Use environment variables by default, allow override for testing
         self.api_key = fmp_api_key or settings.FMP_API_KEY
         self.db_connection_string = db_connection_string or settings.database_url
-        self.base_url = "https://financialmodelingprep.com/api/v3"
+        self.cache = cache or ProviderCache.from_env()
+        self.fmp = FMPClient(self.api_key, self.cache)
         
-        # Validate required settings
-        if not self.api_key:
+        # Validate required settings (replay mode runs fully offline)
+        if not self.api_key and self.cache.mode != MODE_REPLAY:
             raise ValueError("FMP_API_KEY is required. Set it in your .env file.")
         if not self.db_connection_string:
             raise ValueError("Database connection settings are required. Check your .env file.")
@@ -30,20 +34,9 @@ class DividendCollector:
     def get_db_connection(self):
         return psycopg2.connect(self.db_connection_string, cursor_factory=RealDictCursor)
     
-    async def fetch_symbol_dividends(self, symbol: str):
+    async def fetch_symbol_dividends(self, session: aiohttp.ClientSession, symbol: str):
         """Fetch dividend history for a symbol"""
-        url = f"{self.base_url}/historical-price-full/stock_dividend/{symbol}?apikey={self.api_key}"
-        
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if 'historical' in data:
-                            return [(symbol, div) for div in data['historical']]
-            except Exception as e:
-                logger.error(f"Failed to fetch dividends for {symbol}: {e}")
-        return []
+        return await fetch_symbol_dividends(self.fmp, session, symbol)
     
     async def collect_all_dividends(self):
         """Collect dividends for all portfolio symbols"""
@@ -58,8 +51,9 @@ class DividendCollector:
         logger.info(f"Fetching dividends for {len(symbols)} symbols")
         
         # Fetch dividends for all symbols
-        tasks = [self.fetch_symbol_dividends(symbol) for symbol in symbols]
-        results = await asyncio.gather(*tasks)
+        async with aiohttp.ClientSession() as session:
+            tasks = [self.fetch_symbol_dividends(session, symbol) for symbol in symbols]
+            results = await asyncio.gather(*tasks)
         
         # Flatten results
         all_dividends = []
@@ -78,48 +72,17 @@ class DividendCollector:
         conn = self.get_db_connection()
         try:
             cursor = conn.cursor()
-            
-            for symbol, div in dividend_data:
-                # Skip if essential data is missing
-                if not div.get('date') or not div.get('dividend'):
-                    continue
-                
-                # Helper function to handle empty/null dates
-                def clean_date(date_str):
-                    if date_str and date_str.strip():
-                        return date_str
-                    return None
-                
-                cursor.execute("""
-                    INSERT INTO dividends (
-                        symbol, ex_dividend_date, record_date, payment_date, 
-                        declaration_date, dividend_amount, currency
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (symbol, ex_dividend_date) 
-                    DO UPDATE SET
-                        dividend_amount = EXCLUDED.dividend_amount,
-                        record_date = EXCLUDED.record_date,
-                        payment_date = EXCLUDED.payment_date
-                """, (
-                    symbol,
-                    clean_date(div.get('date')),
-                    clean_date(div.get('recordDate')),
-                    clean_date(div.get('paymentDate')),
-                    clean_date(div.get('declarationDate')),
-                    float(div.get('dividend', 0)),
-                    'USD'
-                ))
-            
+            stored = upsert_dividends(cursor, dividend_data)
             conn.commit()
-            logger.info(f"Successfully stored {len([d for d in dividend_data if d[1].get('date') and d[1].get('dividend')])} valid dividend records")
+            logger.info(f"Successfully stored {stored} valid dividend records")
             
         except Exception as e:
             conn.rollback()
             logger.error(f"Failed to store dividends: {e}")
             
             # Log problematic data for debugging
-            for symbol, div in dividend_data[:3]:  # Show first 3 for debugging
-                logger.error(f"Sample data - {symbol}: {div}")
+            for record in dividend_data[:3]:  # Show first 3 for debugging
+                logger.error(f"Sample data - {record}")
             raise
         finally:
             conn.close()
@@ -0,0 +1,94 @@
+# backend/dividend_data.py
+"""
+Dividend history shared by the collectors
+Parses FMP stock_dividend responses into records and upserts them in one
+set-based statement
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from psycopg2.extras import execute_values
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement sent by execute_values
+UPSERT_PAGE_SIZE = 500
+
+
+@dataclass
+class DividendRecord:
+    symbol: str
+    ex_dividend_date: str
+    record_date: Optional[str]
+    payment_date: Optional[str]
+    declaration_date: Optional[str]
+    dividend_amount: float
+    currency: str = 'USD'
+
+
+def clean_date(date_str: Optional[str]) -> Optional[str]:
+    """FMP sends '' for dates it does not know"""
+    if date_str and date_str.strip():
+        return date_str
+    return None
+
+
+def parse_dividends(symbol: str, data: Optional[Dict[str, Any]]) -> List[DividendRecord]:
+    """Records from a stock_dividend response, skipping entries without an ex-date or amount"""
+    if not data or 'historical' not in data:
+        return []
+    return [
+        DividendRecord(
+            symbol=symbol,
+            ex_dividend_date=clean_date(div.get('date')),
+            record_date=clean_date(div.get('recordDate')),
+            payment_date=clean_date(div.get('paymentDate')),
+            declaration_date=clean_date(div.get('declarationDate')),
+            dividend_amount=float(div['dividend']),
+        )
+        for div in data['historical']
+        if clean_date(div.get('date')) and div.get('dividend')
+    ]
+
+
+async def fetch_symbol_dividends(fmp, session, symbol: str) -> List[DividendRecord]:
+    """Fetch and parse the dividend history for a symbol; errors are logged and yield no records"""
+    try:
+        data = await fmp.get_json(session, f"historical-price-full/stock_dividend/{symbol}")
+        return parse_dividends(symbol, data)
+    except Exception as e:
+        logger.error(f"Failed to fetch dividends for {symbol}: {e}")
+        return []
+
+
+def upsert_dividends(cursor, dividends: List[DividendRecord], page_size: int = UPSERT_PAGE_SIZE) -> int:
+    """Upsert dividend history on the caller's transaction; returns rows sent"""
+    # Last value wins if a key repeats; ON CONFLICT cannot touch a row twice
+    rows = {
+        (d.symbol, d.ex_dividend_date): (
+            d.symbol, d.ex_dividend_date, d.record_date, d.payment_date,
+            d.declaration_date, d.dividend_amount, d.currency
+        )
+        for d in dividends
+    }
+    if not rows:
+        return 0
+
+    # Unchanged rows are skipped, so re-fetching full histories does not
+    # rewrite them or pass them to the income ledger triggers
+    execute_values(cursor, """
+        INSERT INTO dividends (
+            symbol, ex_dividend_date, record_date, payment_date,
+            declaration_date, dividend_amount, currency
+        ) VALUES %s
+        ON CONFLICT (symbol, ex_dividend_date)
+        DO UPDATE SET
+            dividend_amount = EXCLUDED.dividend_amount,
+            record_date = EXCLUDED.record_date,
+            payment_date = EXCLUDED.payment_date
+        WHERE (dividends.dividend_amount, dividends.record_date, dividends.payment_date)
+            IS DISTINCT FROM (EXCLUDED.dividend_amount, EXCLUDED.record_date, EXCLUDED.payment_date)
+    """, list(rows.values()), page_size=page_size)
+    return len(rows)
@@ -0,0 +1,221 @@
+# backend/dividend_projection.py
+"""
+Forward dividend income projection
+Infers payment frequency and amount from dividend history and projects
+the next 12 months of payments at current quantities
+"""
+
+from datetime import date
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_version import VersionedCache
+
+# Median days between ex-dates -> payments per year
+FREQUENCY_BANDS = [
+    (45, 12, 'Monthly'),
+    (135, 4, 'Quarterly'),
+    (270, 2, 'Semi-Annual'),
+    (500, 1, 'Annual'),
+]
+
+# Dividend history considered when inferring the current schedule
+HISTORY_DAYS = 730
+
+# Payment lag assumed when the provider gave no payment dates
+DEFAULT_PAYMENT_LAG_DAYS = 14
+
+_cache = VersionedCache(('dividends', 'positions', 'investment_accounts', 'institutions', 'securities_master'))
+
+
+def get_projection(cursor) -> Dict:
+    """Return the projection for the current data version, computing it at most once per day"""
+    return _cache.get(cursor, build_projection, extra=(date.today(),))
+
+
+def build_projection(cursor, as_of: Optional[date] = None) -> Dict:
+    """Load holdings and dividend history and compute the forward calendar"""
+    as_of = as_of or date.today()
+
+    cursor.execute("""
+        SELECT
+            p.account_id,
+            i.institution_name AS brokerage,
+            p.symbol,
+            sm.security_name,
+            SUM(p.quantity) AS quantity,
+            SUM(p.quantity * p.average_cost_basis) AS cost_basis,
+            MAX(p.current_price) AS current_price
+        FROM positions p
+        JOIN securities_master sm ON p.symbol = sm.symbol
+        JOIN investment_accounts ia ON p.account_id = ia.account_id
+        JOIN institutions i ON ia.institution_id = i.institution_id
+        WHERE p.quantity > 0 AND ia.is_active = TRUE
+        GROUP BY p.account_id, i.institution_name, p.symbol, sm.security_name
+    """)
+    holdings = pd.DataFrame(cursor.fetchall())
+
+    cursor.execute("""
+        SELECT d.symbol, d.ex_dividend_date, d.payment_date, d.dividend_amount
+        FROM dividends d
+        WHERE d.ex_dividend_date >= %s
+        AND d.symbol IN (SELECT DISTINCT symbol FROM positions WHERE quantity > 0)
+        ORDER BY d.symbol, d.ex_dividend_date
+    """, (as_of - pd.Timedelta(days=HISTORY_DAYS),))
+    history = pd.DataFrame(cursor.fetchall())
+
+    return project_income(holdings, history, as_of)
+
+
+def infer_schedules(history: pd.DataFrame) -> pd.DataFrame:
+    """Per symbol: payments per year, latest amount, last ex-date and payment lag"""
+    history = history.copy()
+    history['ex_dividend_date'] = pd.to_datetime(history['ex_dividend_date'])
+    history['payment_date'] = pd.to_datetime(history['payment_date'])
+    history['dividend_amount'] = history['dividend_amount'].astype(float)
+    history['gap_days'] = history.groupby('symbol')['ex_dividend_date'].diff().dt.days
+    history['lag_days'] = (history['payment_date'] - history['ex_dividend_date']).dt.days
+
+    schedules = history.groupby('symbol').agg(
+        last_ex_date=('ex_dividend_date', 'last'),
+        last_amount=('dividend_amount', 'last'),
+        median_gap=('gap_days', 'median'),
+        payment_lag=('lag_days', 'median'),
+        payments_observed=('dividend_amount', 'size'),
+    )
+
+    # A single observation gives no gap; assume annual until more history arrives
+    gaps = schedules['median_gap'].fillna(365).to_numpy()
+    band_limits = np.array([limit for limit, _, _ in FREQUENCY_BANDS])
+    band = np.minimum(np.searchsorted(band_limits, gaps), len(FREQUENCY_BANDS) - 1)
+    schedules['payments_per_year'] = np.array([b[1] for b in FREQUENCY_BANDS])[band]
+    schedules['frequency'] = np.array([b[2] for b in FREQUENCY_BANDS])[band]
+    schedules['payment_lag'] = schedules['payment_lag'].fillna(DEFAULT_PAYMENT_LAG_DAYS)
+
+    return schedules
+
+
+def project_income(holdings: pd.DataFrame, history: pd.DataFrame, as_of: date) -> Dict:
+    """Build the 12-month calendar and per-holding income summary"""
+    empty = {
+        'as_of': as_of,
+        'annual_income': 0.0,
+        'next_12_months_income': 0.0,
+        'monthly_totals': [],
+        'calendar': [],
+        'holdings': [],
+        'symbols': [],
+    }
+    if holdings.empty or history.empty:
+        return empty
+
+    schedules = infer_schedules(history)
+    holdings = holdings.copy()
+    for column in ('quantity', 'cost_basis', 'current_price'):
+        holdings[column] = holdings[column].astype(float)
+    holdings = holdings.merge(schedules, left_on='symbol', right_index=True, how='inner')
+
+    # Treat a dividend as suspended once two expected payments have been missed
+    horizon_start = pd.Timestamp(as_of)
+    interval = pd.to_timedelta(np.round(365.25 / holdings['payments_per_year']), unit='D')
+    holdings = holdings[horizon_start - holdings['last_ex_date'] <= 2 * interval].copy()
+    if holdings.empty:
+        return empty
+
+    # Expand every holding into its next ex-dates (last_ex + k * interval); 24 steps
+    # covers a monthly payer whose last ex-date is up to a year old
+    horizon_end = horizon_start + pd.DateOffset(months=12)
+    steps = np.arange(1, 25)
+    interval_days = np.round(365.25 / holdings['payments_per_year'].to_numpy())
+
+    ex_dates = (
+        holdings['last_ex_date'].to_numpy()[:, None]
+        + (interval_days[:, None] * steps[None, :]).astype('timedelta64[D]')
+    )
+    lags = holdings['payment_lag'].to_numpy().astype('timedelta64[D]')
+    pay_dates = ex_dates + lags[:, None]
+    in_window = (pay_dates >= horizon_start.to_datetime64()) & (pay_dates < horizon_end.to_datetime64())
+
+    rows, cols = np.nonzero(in_window)
+    calendar = pd.DataFrame({
+        'account_id': holdings['account_id'].to_numpy()[rows],
+        'brokerage': holdings['brokerage'].to_numpy()[rows],
+        'symbol': holdings['symbol'].to_numpy()[rows],
+        'expected_ex_date': pd.to_datetime(ex_dates[rows, cols]),
+        'expected_payment_date': pd.to_datetime(pay_dates[rows, cols]),
+        'dividend_per_share': holdings['last_amount'].to_numpy()[rows],
+        'quantity': holdings['quantity'].to_numpy()[rows],
+    })
+    calendar['expected_amount'] = calendar['dividend_per_share'] * calendar['quantity']
+    calendar['month'] = calendar['expected_payment_date'].dt.strftime('%Y-%m')
+
+    monthly = (
+        calendar.groupby(['account_id', 'brokerage', 'symbol', 'month'], as_index=False)
+        .agg(expected_amount=('expected_amount', 'sum'), payments=('expected_amount', 'size'))
+        .sort_values(['month', 'account_id', 'symbol'])
+    )
+    monthly_totals = (
+        calendar.groupby('month', as_index=False)['expected_amount'].sum()
+        .sort_values('month')
+    )
+
+    holdings['annual_dividend_per_share'] = holdings['last_amount'] * holdings['payments_per_year']
+    holdings['annual_income'] = holdings['annual_dividend_per_share'] * holdings['quantity']
+    holdings['yield_on_cost'] = np.where(
+        holdings['cost_basis'] > 0,
+        holdings['annual_income'] / holdings['cost_basis'] * 100,
+        np.nan,
+    )
+    holdings['current_yield'] = np.where(
+        holdings['current_price'] > 0,
+        holdings['annual_dividend_per_share'] / holdings['current_price'] * 100,
+        np.nan,
+    )
+
+    # Per symbol across accounts, for tables keyed by symbol
+    symbols = (
+        holdings.groupby(['symbol', 'frequency'], as_index=False)['annual_income'].sum()
+        .merge(
+            calendar.groupby('symbol', as_index=False)['expected_amount'].sum()
+            .rename(columns={'expected_amount': 'next_12_months_income'}),
+            on='symbol', how='left',
+        )
+        .fillna({'next_12_months_income': 0.0})
+        .sort_values('symbol')
+    )
+
+    summary = holdings[[
+        'account_id', 'brokerage', 'symbol', 'security_name', 'quantity', 'frequency',
+        'last_amount', 'last_ex_date', 'annual_dividend_per_share', 'annual_income',
+        'yield_on_cost', 'current_yield',
+    ]].sort_values('annual_income', ascending=False)
+
+    return {
+        'as_of': as_of,
+        # Run rate: latest amount x payments per year
+        'annual_income': float(holdings['annual_income'].sum()),
+        # Payments actually expected in the window; equals the sum of monthly_totals
+        'next_12_months_income': float(calendar['expected_amount'].sum()),
+        'monthly_totals': _records(monthly_totals),
+        'calendar': _records(monthly),
+        'holdings': _records(summary),
+        'symbols': _records(symbols),
+    }
+
+
+def _records(frame: pd.DataFrame):
+    """DataFrame -> list of plain dicts (NaN -> None, Timestamps -> dates)"""
+    records = []
+    for row in frame.to_dict('records'):
+        records.append({
+            key: (
+                None if isinstance(value, float) and np.isnan(value)
+                else value.date() if isinstance(value, pd.Timestamp)
+                else value.item() if isinstance(value, np.generic)
+                else value
+            )
+            for key, value in row.items()
+        })
+    return records
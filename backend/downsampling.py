@@ -0,0 +1,124 @@
+# backend/downsampling.py
+"""
+Server-side downsampling helpers for chart series
+Keeps history payloads bounded regardless of how long the stored history is
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+def align_series(rows: List[Dict], start_date, end_date) -> pd.DataFrame:
+    """Pivot (asset_id, valuation_date, value_usd) rows into a gap-filled date x asset frame.
+
+    Valuations are only recorded when a value changes, so each asset carries its
+    last known value forward until the next valuation. Days before an asset's
+    first valuation stay empty.
+    """
+    if not rows:
+        return pd.DataFrame()
+
+    frame = pd.DataFrame(rows)
+    frame['value_usd'] = frame['value_usd'].astype(float)
+    frame['valuation_date'] = pd.to_datetime(frame['valuation_date'])
+
+    wide = frame.pivot_table(
+        index='valuation_date',
+        columns='asset_id',
+        values='value_usd',
+        aggfunc='last',
+    )
+    calendar = pd.date_range(start=start_date, end=end_date, freq='D')
+    return wide.reindex(wide.index.union(calendar)).ffill().loc[calendar]
+
+
+def lttb_indices(values: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: pick `threshold` indices preserving the visual shape"""
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=float)
+    y = np.nan_to_num(values.astype(float))
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    # Interior points are split into threshold - 2 equally sized buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        next_end = max(next_end, next_start + 1)
+
+        # Average of the following bucket is the third vertex of the triangle
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+
+    return selected
+
+
+def downsample_lttb(wide: pd.DataFrame, points: int) -> Dict:
+    """Downsample every column at the same indices so series stay aligned.
+
+    Indices are chosen from the combined total so the shape of the aggregate
+    line is preserved; individual series are sampled at those same dates.
+    """
+    total = wide.sum(axis=1, min_count=1)
+    idx = lttb_indices(total.to_numpy(), points)
+    sampled = wide.iloc[idx]
+
+    return {
+        'dates': [d.date() for d in sampled.index],
+        'total': _to_list(total.iloc[idx]),
+        'series': {asset_id: _to_list(sampled[asset_id]) for asset_id in sampled.columns},
+    }
+
+
+def downsample_ohlc(wide: pd.DataFrame, points: int) -> Dict:
+    """Bucket the shared date axis into `points` buckets and summarize each with OHLC"""
+    buckets = np.minimum(
+        (np.arange(len(wide)) * points) // max(len(wide), 1),
+        points - 1,
+    )
+    grouped = wide.groupby(buckets)
+    total_grouped = wide.sum(axis=1, min_count=1).groupby(buckets)
+
+    def ohlc(group) -> Dict[str, List]:
+        return {
+            'open': _to_list(group.first()),
+            'high': _to_list(group.max()),
+            'low': _to_list(group.min()),
+            'close': _to_list(group.last()),
+        }
+
+    first, last, high, low = grouped.first(), grouped.last(), grouped.max(), grouped.min()
+    return {
+        'dates': [d.date() for d in wide.index.to_series().groupby(buckets).first()],
+        'total': ohlc(total_grouped),
+        'series': {
+            asset_id: {
+                'open': _to_list(first[asset_id]),
+                'high': _to_list(high[asset_id]),
+                'low': _to_list(low[asset_id]),
+                'close': _to_list(last[asset_id]),
+            }
+            for asset_id in wide.columns
+        },
+    }
+
+
+def _to_list(series: pd.Series) -> List:
+    """Convert to JSON-friendly floats, with gaps (no valuation yet) as None"""
+    return [None if pd.isna(v) else round(float(v), 4) for v in series]
@@ -0,0 +1,49 @@
+# backend/fmp_client.py
+"""
+Financial Modeling Prep API client shared by the collectors
+All provider requests go through the response cache
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from provider_cache import MODE_REPLAY, ProviderCache
+
+logger = logging.getLogger(__name__)
+
+FMP_BASE_URL = "https://financialmodelingprep.com/api/v3"
+
+
+class FMPClient:
+    def __init__(self, api_key: str, cache: Optional[ProviderCache] = None, base_url: str = FMP_BASE_URL):
+        self.api_key = api_key
+        self.cache = cache
+        self.base_url = base_url
+
+    async def get_json(
+        self,
+        session: aiohttp.ClientSession,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Any]:
+        """GET {base_url}/{endpoint}; returns parsed JSON, or None on a non-200 response.
+
+        Raises CacheMiss in replay mode when the request was never recorded.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(endpoint, params)
+            if cached is not None or self.cache.mode == MODE_REPLAY:
+                return cached
+
+        query = dict(params or {}, apikey=self.api_key)
+        async with session.get(f"{self.base_url}/{endpoint}", params=query) as response:
+            if response.status != 200:
+                logger.warning(f"FMP {endpoint} returned HTTP {response.status}")
+                return None
+            data = await response.json()
+
+        if self.cache is not None:
+            self.cache.put(endpoint, params, data)
+        return data
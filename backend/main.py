@@ -3,19 +3,29 @@
 FastAPI backend providing REST API for wealth tracker dashboard
 """
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from contextlib import asynccontextmanager
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date, timedelta
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
+import csv
+import io
+import math
 import os
 from dataclasses import dataclass
+from pydantic import BaseModel, Field, ValidationError
 import uvicorn
 from dotenv import load_dotenv
 
+from db_router import DatabaseRouter, begin_request, end_request, is_read_request
+from dividend_projection import get_projection
+from price_store import get_price_store
+from downsampling import align_series, downsample_lttb, downsample_ohlc
+from security_metadata import get_security_lookup
+from simulation import REBALANCE_MONTHS, load_holdings, run_simulation, shutdown_executor
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -27,6 +37,12 @@ class Config:
     DB_PASSWORD = os.getenv("DB_PASSWORD")
     DB_PORT = os.getenv("DB_PORT", "5432")
     
+    # Read replicas (comma-separated DSNs); GET requests are routed to them when caught up
+    DB_REPLICA_URLS = [url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+    REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    READ_AFTER_WRITE_SECONDS = float(os.getenv("READ_AFTER_WRITE_SECONDS", "10"))
+    REPLICA_CHECK_INTERVAL_SECONDS = float(os.getenv("REPLICA_CHECK_INTERVAL_SECONDS", "5"))
+    
     # API Configuration
     API_HOST = os.getenv("API_HOST", "0.0.0.0")
     API_PORT = int(os.getenv("PORT", os.getenv("API_PORT", "8000")))
@@ -50,12 +66,47 @@ class Config:
 
 config = Config()
 
+# Built on first use so importing the app does not require DB_PASSWORD
+_db_router: Optional[DatabaseRouter] = None
+
+def get_db_router() -> DatabaseRouter:
+    global _db_router
+    if _db_router is None:
+        _db_router = DatabaseRouter(
+            config.database_url,
+            config.DB_REPLICA_URLS,
+            max_lag_seconds=config.REPLICA_MAX_LAG_SECONDS,
+            read_after_write_seconds=config.READ_AFTER_WRITE_SECONDS,
+            check_interval_seconds=config.REPLICA_CHECK_INTERVAL_SECONDS,
+        )
+    return _db_router
+
+# Upper bound on points per series returned by the history endpoints
+MAX_HISTORY_POINTS = 1000
+
+# Longest window the history endpoints accept; bounds the daily calendar built before downsampling
+MAX_HISTORY_DAYS = 365 * 30
+
+# Upper bounds for a single Monte Carlo request
+MAX_SIMULATION_PATHS = 200000
+MAX_SIMULATION_YEARS = 60
+
+# POST endpoints that only read; routed like GETs and never pin the client to the primary
+READ_ONLY_PATHS = {"/api/simulations/monte-carlo"}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Simulation workers are separate processes; stop them with the server
+    shutdown_executor()
+
 # FastAPI app
 app = FastAPI(
     title="Treviwise API",
     description="API for personal wealth and investment tracking",
     version="1.0.0",
-    debug=config.DEBUG
+    debug=config.DEBUG,
+    lifespan=lifespan
 )
 
 # Enable CORS for React frontend
@@ -67,10 +118,48 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def route_database_requests(request: Request, call_next):
+    """Tag each request so reads can go to a replica and writes pin the client to the primary"""
+    client_id = request.headers.get("X-Client-Id") or (request.client.host if request.client else None)
+    read_only = request.url.path in READ_ONLY_PATHS
+    token = begin_request(request.method, client_id, read_only=read_only)
+    try:
+        response = await call_next(request)
+    finally:
+        end_request(token)
+    # The router exists once any handler has opened a connection
+    if not is_read_request(request.method, read_only) and response.status_code < 400 and _db_router is not None:
+        _db_router.record_write(client_id)
+    return response
+
+class AssetRevaluation(BaseModel):
+    asset_id: int
+    value_original: Decimal = Field(ge=0, allow_inf_nan=False)  # in the asset's base currency
+    valuation_method: str = "Manual"  # 'Manual' or 'API'
+
+class CashFlow(BaseModel):
+    annual_amount: float  # contribution, or withdrawal if negative
+    start_year: int = 0
+    end_year: Optional[int] = None  # exclusive; None = until the horizon
+    growth: float = 0.0  # yearly increase, e.g. 0.03 for inflation
+
+class SimulationRequest(BaseModel):
+    years: int = 30
+    paths: int = 10000
+    method: str = "bootstrap"  # 'bootstrap' or 'parametric'
+    rebalance: str = "annual"  # 'none', 'monthly', 'quarterly' or 'annual'
+    target_weights: Optional[Dict[str, float]] = None  # by asset class; default = current mix
+    cash_flows: List[CashFlow] = []
+    assumptions: Optional[Dict[str, List[float]]] = None  # asset class -> [expected return, volatility]
+    percentiles: Optional[List[float]] = None
+    seed: Optional[int] = None
+
 # Database dependency
-def get_db_connection():
+def get_db_connection(primary: bool = False):
+    """Primary for writes; a caught-up replica for GET requests when configured"""
     try:
-        conn = psycopg2.connect(config.database_url, cursor_factory=RealDictCursor)
+        conn = get_db_router().get_connection(primary=primary)
         return conn
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database connection failed: {str(e)}")
@@ -108,12 +197,8 @@ async def root():
 async def health_check():
     """Health check endpoint"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1")
-        cursor.fetchone()
-        conn.close()
-        return {"status": "healthy", "timestamp": datetime.now(), "database": "connected"}
+        nodes = get_db_router().health()
+        return {"status": "healthy", "timestamp": datetime.now(), "database": "connected", "nodes": nodes}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
 
@@ -124,15 +209,14 @@ async def get_portfolio_summary():
     try:
         cursor = conn.cursor()
         
-        # Get total portfolio value and P&L
+        # Get total portfolio value and P&L (trigger-maintained rollup)
         cursor.execute("""
             SELECT 
-                SUM(p.quantity * p.average_cost_basis) as total_cost_basis,
-                SUM(p.market_value) as total_market_value,
-                SUM(p.unrealized_gain_loss) as total_unrealized_gain_loss,
-                COUNT(*) as total_positions
-            FROM positions p
-            WHERE p.quantity > 0
+                cost_basis as total_cost_basis,
+                market_value as total_market_value,
+                unrealized_gain_loss as total_unrealized_gain_loss,
+                position_count as total_positions
+            FROM portfolio_rollup
         """)
         portfolio_totals = cursor.fetchone()
         
@@ -141,13 +225,12 @@ async def get_portfolio_summary():
             SELECT 
                 i.institution_name,
                 ia.cash_balance,
-                COALESCE(SUM(p.market_value), 0) as positions_value,
-                ia.cash_balance + COALESCE(SUM(p.market_value), 0) as total_account_value
+                COALESCE(r.market_value, 0) as positions_value,
+                ia.cash_balance + COALESCE(r.market_value, 0) as total_account_value
             FROM investment_accounts ia
             JOIN institutions i ON ia.institution_id = i.institution_id
-            LEFT JOIN positions p ON ia.account_id = p.account_id
+            LEFT JOIN account_rollups r ON ia.account_id = r.account_id
             WHERE ia.is_active = TRUE
-            GROUP BY ia.account_id, i.institution_name, ia.cash_balance
             ORDER BY total_account_value DESC
         """)
         accounts = cursor.fetchall()
@@ -175,6 +258,40 @@ async def get_portfolio_summary():
     finally:
         conn.close()
 
+@app.get("/api/portfolio/rollups/check")
+async def check_portfolio_rollups():
+    """Compare rollup tables against a full recomputation"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM check_rollup_consistency()")
+        mismatches = cursor.fetchall()
+        
+        return JSONResponse(content=serialize_response({
+            "consistent": not mismatches,
+            "mismatches": mismatches,
+            "checked_at": datetime.now()
+        }))
+        
+    finally:
+        conn.close()
+
+@app.post("/api/portfolio/rollups/rebuild")
+async def rebuild_portfolio_rollups():
+    """Re-seed rollup tables from a full recomputation"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT rebuild_rollups()")
+        conn.commit()
+        
+        return {"message": "Rollups rebuilt successfully", "timestamp": datetime.now()}
+    except Exception as e:
+        conn.rollback()
+        raise HTTPException(status_code=500, detail=f"Rollup rebuild failed: {str(e)}")
+    finally:
+        conn.close()
+
 @app.get("/api/positions")
 async def get_positions():
     """Get all current positions"""
@@ -204,6 +321,9 @@ async def get_positions():
         """)
         positions = cursor.fetchall()
         
+        # Sector and asset class come from the shared in-memory lookup
+        get_security_lookup(cursor).annotate(positions)
+        
         return JSONResponse(content=serialize_response(positions))
         
     finally:
@@ -241,6 +361,171 @@ async def get_assets():
     finally:
         conn.close()
 
+def apply_revaluations(conn, revaluations: List[AssetRevaluation]) -> Dict[str, Any]:
+    """Apply every revaluation in one set-based UPDATE, converting to USD from the latest FX rates"""
+    if not revaluations:
+        raise HTTPException(status_code=400, detail="No revaluations provided")
+    
+    methods = [r.valuation_method.upper() for r in revaluations]
+    if any(m not in ("MANUAL", "API") for m in methods):
+        raise HTTPException(status_code=400, detail="valuation_method must be 'Manual' or 'API'")
+    
+    cursor = conn.cursor()
+    # exchange_rates stores USD -> currency, so USD value = original / rate
+    cursor.execute("""
+        WITH incoming AS (
+            SELECT DISTINCT ON (asset_id) asset_id, value_original, is_api
+            FROM unnest(%s::int[], %s::numeric[], %s::boolean[]) WITH ORDINALITY
+                AS t(asset_id, value_original, is_api, ord)
+            ORDER BY asset_id, ord DESC
+        ),
+        latest_fx AS (
+            SELECT DISTINCT ON (to_currency) to_currency AS currency, rate
+            FROM exchange_rates
+            WHERE from_currency = 'USD' AND rate > 0
+            ORDER BY to_currency, rate_date DESC
+        ),
+        fx AS (
+            SELECT currency, rate FROM latest_fx
+            UNION ALL
+            SELECT 'USD', 1
+        )
+        UPDATE assets a SET
+            current_value_original = v.value_original,
+            current_value_usd = ROUND(v.value_original / fx.rate, 4),
+            last_manual_update = CASE WHEN v.is_api THEN a.last_manual_update ELSE CURRENT_TIMESTAMP END,
+            last_api_update = CASE WHEN v.is_api THEN CURRENT_TIMESTAMP ELSE a.last_api_update END,
+            updated_at = CURRENT_TIMESTAMP
+        FROM incoming v, fx
+        WHERE a.asset_id = v.asset_id
+        AND fx.currency = COALESCE(a.base_currency, 'USD')
+        RETURNING a.asset_id, a.asset_name, a.base_currency, a.current_value_original, a.current_value_usd
+    """, (
+        [r.asset_id for r in revaluations],
+        [r.value_original for r in revaluations],
+        [m == "API" for m in methods],
+    ))
+    updated = cursor.fetchall()
+    
+    # Anything not updated is either an unknown asset or lacks an FX rate
+    updated_ids = {row['asset_id'] for row in updated}
+    skipped_ids = sorted({r.asset_id for r in revaluations} - updated_ids)
+    
+    return {
+        "updated_count": len(updated),
+        "updated": updated,
+        "skipped_asset_ids": skipped_ids,
+    }
+
+@app.post("/api/assets/revalue")
+async def revalue_assets(revaluations: List[AssetRevaluation]):
+    """Revalue many assets in one statement"""
+    conn = get_db_connection()
+    try:
+        result = apply_revaluations(conn, revaluations)
+        conn.commit()
+        
+        return JSONResponse(content=serialize_response(result))
+        
+    except HTTPException:
+        conn.rollback()
+        raise
+    except Exception as e:
+        conn.rollback()
+        raise HTTPException(status_code=500, detail=f"Revaluation failed: {str(e)}")
+    finally:
+        conn.close()
+
+@app.post("/api/assets/revalue/csv")
+async def revalue_assets_csv(file: UploadFile = File(...)):
+    """Revalue assets from a CSV with columns asset_id, value_original[, valuation_method]"""
+    content = (await file.read()).decode("utf-8-sig")
+    revaluations = []
+    invalid_rows = []
+    for line_number, row in enumerate(csv.DictReader(io.StringIO(content)), start=2):
+        try:
+            revaluations.append(AssetRevaluation(
+                asset_id=int(row["asset_id"]),
+                value_original=Decimal(row["value_original"].strip()),
+                valuation_method=(row.get("valuation_method") or "Manual").strip(),
+            ))
+        except ValidationError as e:
+            messages = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            invalid_rows.append({"row": line_number, "error": messages})
+        except KeyError as e:
+            invalid_rows.append({"row": line_number, "error": f"missing column {e}"})
+        except (ValueError, InvalidOperation, AttributeError) as e:
+            invalid_rows.append({"row": line_number, "error": str(e)})
+    
+    # Report every bad row at once so the file can be fixed in one pass
+    if invalid_rows:
+        raise HTTPException(status_code=400, detail={"message": "Invalid CSV rows", "rows": invalid_rows})
+    
+    return await revalue_assets(revaluations)
+
+@app.post("/api/simulations/monte-carlo")
+async def run_monte_carlo(request: SimulationRequest):
+    """Project portfolio value with Monte Carlo paths and return percentile bands"""
+    if not 1 <= request.years <= MAX_SIMULATION_YEARS:
+        raise HTTPException(status_code=400, detail=f"years must be between 1 and {MAX_SIMULATION_YEARS}")
+    if not 100 <= request.paths <= MAX_SIMULATION_PATHS:
+        raise HTTPException(status_code=400, detail=f"paths must be between 100 and {MAX_SIMULATION_PATHS}")
+    if request.method not in ("bootstrap", "parametric"):
+        raise HTTPException(status_code=400, detail="method must be 'bootstrap' or 'parametric'")
+    if request.rebalance not in REBALANCE_MONTHS:
+        raise HTTPException(status_code=400, detail=f"rebalance must be one of {', '.join(REBALANCE_MONTHS)}")
+    if request.target_weights is not None and (
+        any(w < 0 for w in request.target_weights.values()) or sum(request.target_weights.values()) <= 0
+    ):
+        raise HTTPException(status_code=400, detail="target_weights must be non-negative and not all zero")
+    if request.assumptions and any(len(a) != 2 or a[1] < 0 for a in request.assumptions.values()):
+        raise HTTPException(status_code=400, detail="assumptions must be [expected_return, volatility] pairs")
+    # Monthly drift uses log(1 + expected_return), which has no value at or below -100%
+    if request.assumptions and any(
+        not math.isfinite(a[0]) or not math.isfinite(a[1]) or a[0] <= -1 for a in request.assumptions.values()
+    ):
+        raise HTTPException(status_code=400, detail="assumptions must be finite with expected_return above -1")
+    if request.percentiles and any(not 0 <= p <= 100 for p in request.percentiles):
+        raise HTTPException(status_code=400, detail="percentiles must be between 0 and 100")
+
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        lookup = get_security_lookup(cursor)
+        holdings, symbol_values = load_holdings(cursor, lookup)
+    finally:
+        conn.close()
+
+    if not holdings:
+        raise HTTPException(status_code=400, detail="No holdings to simulate")
+
+    params = {
+        "years": request.years,
+        "paths": request.paths,
+        "method": request.method,
+        "rebalance": request.rebalance,
+        "target_weights": request.target_weights,
+        "cash_flows": [
+            {
+                "annual_amount": flow.annual_amount,
+                "start_year": flow.start_year,
+                "end_year": flow.end_year,
+                "growth": flow.growth,
+            }
+            for flow in request.cash_flows
+        ],
+        "assumptions": request.assumptions,
+        "percentiles": request.percentiles,
+        "seed": request.seed,
+    }
+
+    try:
+        # Bootstrap draws monthly returns from the memory-mapped price store
+        result = await run_simulation(holdings, symbol_values, params, get_price_store(), lookup)
+        return JSONResponse(content=serialize_response(result))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Simulation failed: {str(e)}")
+
 @app.get("/api/dividends")
 async def get_recent_dividends(limit: int = 20):
     """Get recent dividend payments"""
@@ -255,14 +540,14 @@ async def get_recent_dividends(limit: int = 20):
                 d.payment_date,
                 d.dividend_amount,
                 d.frequency,
-                -- Calculate total dividend for owned position
-                CASE 
-                    WHEN p.quantity IS NOT NULL THEN d.dividend_amount * p.quantity
-                    ELSE 0
-                END as total_dividend_received
+                -- Income across all accounts, from holdings at the ex-dividend date
+                COALESCE((
+                    SELECT SUM(l.income_amount)
+                    FROM dividend_income_ledger l
+                    WHERE l.symbol = d.symbol AND l.ex_dividend_date = d.ex_dividend_date
+                ), 0) as total_dividend_received
             FROM dividends d
             JOIN securities_master sm ON d.symbol = sm.symbol
-            LEFT JOIN positions p ON d.symbol = p.symbol AND p.quantity > 0
             WHERE d.ex_dividend_date >= CURRENT_DATE - INTERVAL '1 year'
             ORDER BY d.ex_dividend_date DESC
             LIMIT %s
@@ -274,10 +559,85 @@ async def get_recent_dividends(limit: int = 20):
     finally:
         conn.close()
 
+@app.get("/api/dividends/income")
+async def get_dividend_income(months: int = 12, account_id: Optional[int] = None):
+    """Get received dividend income per month and account from the income ledger"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT 
+                date_trunc('month', l.income_date)::date as month,
+                l.account_id,
+                i.institution_name as brokerage,
+                SUM(l.income_amount) as income,
+                COUNT(*) as payments
+            FROM dividend_income_ledger l
+            JOIN investment_accounts ia ON l.account_id = ia.account_id
+            JOIN institutions i ON ia.institution_id = i.institution_id
+            WHERE l.income_date >= date_trunc('month', CURRENT_DATE) - make_interval(months => %s - 1)
+            AND l.income_date <= CURRENT_DATE
+            AND (%s::int IS NULL OR l.account_id = %s::int)
+            GROUP BY 1, l.account_id, i.institution_name
+            ORDER BY month, l.account_id
+        """, (months, account_id, account_id))
+        income = cursor.fetchall()
+
+        return JSONResponse(content=serialize_response({
+            "total_income": sum(row['income'] for row in income),
+            "by_month": income,
+        }))
+
+    finally:
+        conn.close()
+
+@app.get("/api/dividends/unattributed")
+async def get_unattributed_dividends(account_id: Optional[int] = None):
+    """Get dividends on holdings without transactions that the income ledger cannot attribute"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT 
+                u.account_id,
+                i.institution_name as brokerage,
+                u.symbol,
+                u.ex_dividend_date,
+                u.payment_date,
+                u.dividend_amount,
+                u.current_quantity,
+                u.held_since
+            FROM unattributed_dividends u
+            JOIN investment_accounts ia ON u.account_id = ia.account_id
+            JOIN institutions i ON ia.institution_id = i.institution_id
+            WHERE (%s::int IS NULL OR u.account_id = %s::int)
+            ORDER BY u.ex_dividend_date DESC, u.symbol
+        """, (account_id, account_id))
+        unattributed = cursor.fetchall()
+
+        return JSONResponse(content=serialize_response(unattributed))
+
+    finally:
+        conn.close()
+
+@app.get("/api/dividends/projection")
+async def get_dividend_projection():
+    """Get the 12-month forward dividend calendar and income estimate"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        projection = get_projection(cursor)
+
+        return JSONResponse(content=serialize_response(projection))
+
+    finally:
+        conn.close()
+
 @app.get("/api/net-worth")
 async def get_net_worth():
     """Get detailed net worth breakdown"""
-    conn = get_db_connection()
+    # Refreshes the materialized view, so this read has to run on the primary
+    conn = get_db_connection(primary=True)
     try:
         cursor = conn.cursor()
         
@@ -340,6 +700,121 @@ async def get_asset_history(asset_id: int, days: int = 90):
     finally:
         conn.close()
 
+@app.get("/api/assets/history")
+async def get_assets_history(
+    asset_ids: Optional[List[int]] = Query(None),
+    asset_class: Optional[str] = None,
+    days: int = Query(365, ge=1, le=MAX_HISTORY_DAYS),
+    points: int = 200,
+    method: str = "lttb",
+):
+    """Get aligned, downsampled value history for several assets at once"""
+    if not asset_ids and not asset_class:
+        raise HTTPException(status_code=400, detail="Provide asset_ids or asset_class")
+    if method not in ("lttb", "ohlc"):
+        raise HTTPException(status_code=400, detail="method must be 'lttb' or 'ohlc'")
+    points = max(3, min(points, MAX_HISTORY_POINTS))
+
+    start_date = date.today() - timedelta(days=days)
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        # One pass over idx_asset_valuations_asset_date: every valuation in the window
+        # plus each asset's last valuation before it, so the series start gap-filled
+        cursor.execute("""
+            WITH selected AS (
+                SELECT a.asset_id, a.asset_name
+                FROM assets a
+                JOIN asset_classes ac ON a.class_id = ac.class_id
+                WHERE a.is_active = TRUE
+                AND (%(asset_ids)s::int[] IS NULL OR a.asset_id = ANY(%(asset_ids)s::int[]))
+                AND (%(asset_class)s::text IS NULL OR ac.class_name = %(asset_class)s::text)
+            )
+            SELECT s.asset_id, s.asset_name, v.valuation_date, v.value_usd
+            FROM selected s
+            CROSS JOIN LATERAL (
+                (SELECT av.valuation_date, av.value_usd, av.created_at
+                 FROM asset_valuations av
+                 WHERE av.asset_id = s.asset_id
+                 AND av.valuation_date < %(start_date)s
+                 ORDER BY av.valuation_date DESC, av.created_at DESC
+                 LIMIT 1)
+                UNION ALL
+                (SELECT av.valuation_date, av.value_usd, av.created_at
+                 FROM asset_valuations av
+                 WHERE av.asset_id = s.asset_id
+                 AND av.valuation_date >= %(start_date)s
+                 AND av.valuation_date <= CURRENT_DATE)
+            ) v
+            WHERE v.value_usd IS NOT NULL
+            ORDER BY s.asset_id, v.valuation_date, v.created_at
+        """, {
+            "asset_ids": asset_ids,
+            "asset_class": asset_class,
+            "start_date": start_date,
+        })
+        rows = cursor.fetchall()
+
+        names = {row['asset_id']: row['asset_name'] for row in rows}
+        wide = align_series(rows, start_date, date.today())
+        if wide.empty:
+            return JSONResponse(content={"dates": [], "total": [], "series": [], "method": method})
+
+        sampled = (downsample_lttb if method == "lttb" else downsample_ohlc)(wide, points)
+
+        return JSONResponse(content=serialize_response({
+            "dates": sampled["dates"],
+            "total": sampled["total"],
+            "series": [
+                {"asset_id": int(asset_id), "asset_name": names.get(asset_id), "values": values}
+                for asset_id, values in sampled["series"].items()
+            ],
+            "method": method,
+            "source_points": len(rows),
+        }))
+
+    finally:
+        conn.close()
+
+@app.get("/api/prices/history")
+async def get_price_history(
+    symbols: List[str] = Query(...),
+    days: int = Query(365, ge=1, le=MAX_HISTORY_DAYS),
+    points: int = 200,
+    method: str = "lttb",
+):
+    """Get downsampled daily price history from the memory-mapped price store"""
+    if method not in ("lttb", "ohlc"):
+        raise HTTPException(status_code=400, detail="method must be 'lttb' or 'ohlc'")
+    points = max(3, min(points, MAX_HISTORY_POINTS))
+
+    store = get_price_store()
+    if store is None:
+        raise HTTPException(status_code=503, detail="Price store has not been built; run price_store.py")
+
+    start = date.today() - timedelta(days=days)
+    wide = store.window(symbols, start, date.today())
+    if wide.empty or wide.columns.empty:
+        return JSONResponse(content={"dates": [], "series": [], "method": method})
+
+    # Markets are closed on some days; carry the last close forward, starting
+    # from each symbol's last close before the window so series don't open on NaN
+    wide.iloc[0] = wide.iloc[0].fillna(store.last_before(wide.columns, start))
+    wide = wide.ffill()
+
+    sampled = (downsample_lttb if method == "lttb" else downsample_ohlc)(wide, points)
+
+    return JSONResponse(content=serialize_response({
+        "dates": sampled["dates"],
+        "series": [
+            {"symbol": symbol, "values": values}
+            for symbol, values in sampled["series"].items()
+        ],
+        "method": method,
+        "store_generation": store.generation,
+        "store_watermark": store.meta.get("watermark"),
+    }))
+
 @app.get("/api/market-prices")
 async def get_latest_market_prices():
     """Get latest market prices for all securities"""
@@ -8,15 +8,22 @@ import os
 import asyncio
 import aiohttp
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 import pandas as pd
 from datetime import datetime, date
 import logging
+import time
+from functools import partial
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 import json
 from dotenv import load_dotenv
 
+from dividend_data import fetch_symbol_dividends, upsert_dividends
+from fmp_client import FMPClient
+from price_store import build as build_price_store
+from provider_cache import ProviderCache
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -34,6 +41,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Currencies quoted against USD
+FX_CURRENCIES = ['KWD', 'EUR', 'GBP']
+
+# Pipeline tuning: in-flight provider requests, queued results, rows per upsert
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "16"))
+PIPELINE_QUEUE_SIZE = 256
+WRITE_BATCH_SIZE = 500
+
 @dataclass
 class SecurityPrice:
     symbol: str
@@ -81,196 +96,212 @@ class DatabaseManager:
         finally:
             conn.close()
     
-    def update_market_prices(self, prices: List[SecurityPrice]):
-        """Update market prices in database"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            
-            for price in prices:
-                cursor.execute("""
-                    INSERT INTO market_prices (symbol, price, price_date, currency, created_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                    ON CONFLICT (symbol, price_date) 
-                    DO UPDATE SET 
-                        price = EXCLUDED.price,
-                        created_at = EXCLUDED.created_at
-                """, (price.symbol, price.price, price.date, price.currency, datetime.now()))
-            
-            conn.commit()
-            logger.info(f"Updated prices for {len(prices)} securities")
-            
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Failed to update market prices: {e}")
-            raise
-        finally:
-            conn.close()
+    def upsert_market_prices(self, cursor, prices: List[SecurityPrice]) -> int:
+        """Upsert prices in one statement on the caller's transaction"""
+        # Last value wins if a key repeats; ON CONFLICT cannot touch a row twice
+        rows = {(p.symbol, p.date): (p.symbol, p.price, p.date, p.currency, datetime.now()) for p in prices}
+        execute_values(cursor, """
+            INSERT INTO market_prices (symbol, price, price_date, currency, created_at)
+            VALUES %s
+            ON CONFLICT (symbol, price_date) 
+            DO UPDATE SET 
+                price = EXCLUDED.price,
+                created_at = EXCLUDED.created_at
+        """, list(rows.values()), page_size=WRITE_BATCH_SIZE)
+        return len(rows)
     
-    def update_exchange_rates(self, rates: List[ExchangeRate]):
-        """Update exchange rates in database"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            
-            for rate in rates:
-                cursor.execute("""
-                    INSERT INTO exchange_rates (from_currency, to_currency, rate, rate_date, created_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                    ON CONFLICT (from_currency, to_currency, rate_date)
-                    DO UPDATE SET 
-                        rate = EXCLUDED.rate,
-                        created_at = EXCLUDED.created_at
-                """, (rate.from_currency, rate.to_currency, rate.rate, rate.date, datetime.now()))
-            
-            conn.commit()
-            logger.info(f"Updated {len(rates)} exchange rates")
-            
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Failed to update exchange rates: {e}")
-            raise
-        finally:
-            conn.close()
+    def upsert_exchange_rates(self, cursor, rates: List[ExchangeRate]) -> int:
+        """Upsert exchange rates in one statement on the caller's transaction"""
+        rows = {
+            (r.from_currency, r.to_currency, r.date): (r.from_currency, r.to_currency, r.rate, r.date, datetime.now())
+            for r in rates
+        }
+        execute_values(cursor, """
+            INSERT INTO exchange_rates (from_currency, to_currency, rate, rate_date, created_at)
+            VALUES %s
+            ON CONFLICT (from_currency, to_currency, rate_date)
+            DO UPDATE SET 
+                rate = EXCLUDED.rate,
+                created_at = EXCLUDED.created_at
+        """, list(rows.values()), page_size=WRITE_BATCH_SIZE)
+        return len(rows)
     
-    def update_position_values(self):
-        """Update position market values and calculations"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            
-            # Update positions with current market prices
-            cursor.execute("""
-                UPDATE positions 
-                SET 
-                    current_price = mp.price,
-                    market_value = positions.quantity * mp.price,
-                    unrealized_gain_loss = (positions.quantity * mp.price) - (positions.quantity * positions.average_cost_basis),
-                    unrealized_gain_loss_percent = 
-                        CASE 
-                            WHEN positions.average_cost_basis > 0 THEN
-                                ((mp.price - positions.average_cost_basis) / positions.average_cost_basis) * 100
-                            ELSE 0
-                        END,
-                    last_updated = CURRENT_TIMESTAMP
-                FROM market_prices mp
-                WHERE positions.symbol = mp.symbol
-                AND mp.price_date = CURRENT_DATE
-                AND positions.quantity > 0
-            """)
-            
-            rows_updated = cursor.rowcount
-            conn.commit()
-            logger.info(f"Updated market values for {rows_updated} positions")
-            
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Failed to update position values: {e}")
-            raise
-        finally:
-            conn.close()
+    def reprice_positions(self, cursor) -> int:
+        """Recompute position market values from today's prices; returns rows updated"""
+        cursor.execute("""
+            UPDATE positions 
+            SET 
+                current_price = mp.price,
+                market_value = positions.quantity * mp.price,
+                unrealized_gain_loss = (positions.quantity * mp.price) - (positions.quantity * positions.average_cost_basis),
+                unrealized_gain_loss_percent = 
+                    CASE 
+                        WHEN positions.average_cost_basis > 0 THEN
+                            ((mp.price - positions.average_cost_basis) / positions.average_cost_basis) * 100
+                        ELSE 0
+                    END,
+                last_updated = CURRENT_TIMESTAMP
+            FROM market_prices mp
+            WHERE positions.symbol = mp.symbol
+            AND mp.price_date = CURRENT_DATE
+            AND positions.quantity > 0
+        """)
+        return cursor.rowcount
 
 class MarketDataService:
-    def __init__(self, fmp_api_key: str, db_manager: DatabaseManager):
+    def __init__(self, fmp_api_key: str, db_manager: DatabaseManager, cache: Optional[ProviderCache] = None):
         self.api_key = fmp_api_key
         self.db_manager = db_manager
-        self.base_url = "https://financialmodelingprep.com/api/v3"
-    
-    async def fetch_security_prices(self, symbols: List[str]) -> List[SecurityPrice]:
-        """Fetch current market prices for securities"""
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            for symbol in symbols:
-                url = f"{self.base_url}/quote-short/{symbol}?apikey={self.api_key}"
-                tasks.append(self._fetch_single_price(session, url, symbol))
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            prices = [r for r in results if isinstance(r, SecurityPrice)]
-            
-            logger.info(f"Successfully fetched prices for {len(prices)}/{len(symbols)} symbols")
-            return prices
+        self.fmp = FMPClient(fmp_api_key, cache)
     
-    async def _fetch_single_price(self, session: aiohttp.ClientSession, url: str, symbol: str) -> Optional[SecurityPrice]:
+    async def _fetch_single_price(self, session: aiohttp.ClientSession, symbol: str) -> Optional[SecurityPrice]:
         """Fetch single security price"""
         try:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data and len(data) > 0:
-                        price_data = data[0]
-                        return SecurityPrice(
-                            symbol=symbol,
-                            price=float(price_data['price']),
-                            currency='USD',
-                            date=date.today().isoformat(),
-                            change_percent=price_data.get('changesPercentage')
-                        )
+            data = await self.fmp.get_json(session, f"quote-short/{symbol}")
+            if data and len(data) > 0:
+                price_data = data[0]
+                return SecurityPrice(
+                    symbol=symbol,
+                    price=float(price_data['price']),
+                    currency='USD',
+                    date=date.today().isoformat(),
+                    change_percent=price_data.get('changesPercentage')
+                )
         except Exception as e:
             logger.error(f"Failed to fetch price for {symbol}: {e}")
             return None
     
-    async def fetch_exchange_rates(self) -> List[ExchangeRate]:
-        """Fetch current exchange rates"""
-        rates = []
-        currencies = ['KWD', 'EUR', 'GBP']  # Convert from USD to these
+    async def _fetch_single_rate(self, session: aiohttp.ClientSession, currency: str) -> Optional[ExchangeRate]:
+        """Fetch a single USD/{currency} rate"""
+        try:
+            data = await self.fmp.get_json(session, f"fx/USD{currency}")
+            if data and len(data) > 0:
+                rate_data = data[0]
+                return ExchangeRate(
+                    from_currency='USD',
+                    to_currency=currency,
+                    rate=float(rate_data['bid']),
+                    date=date.today().isoformat()
+                )
+        except Exception as e:
+            logger.error(f"Failed to fetch rate for USD/{currency}: {e}")
+        return None
+    
+    async def _produce(self, queue: asyncio.Queue, semaphore: asyncio.Semaphore, session, kind: str, fetch, key: str):
+        """Run one fetch and hand its result to the writer"""
+        async with semaphore:
+            result = await fetch(session, key)
+        if not result:
+            return
+        await queue.put((kind, result if isinstance(result, list) else [result]))
+    
+    async def _write_results(self, queue: asyncio.Queue, cursor) -> Dict[str, int]:
+        """Drain the queue into batched upserts until the None sentinel arrives"""
+        writers = {
+            'price': self.db_manager.upsert_market_prices,
+            'fx': self.db_manager.upsert_exchange_rates,
+            'dividend': partial(upsert_dividends, page_size=WRITE_BATCH_SIZE),
+        }
+        written = {kind: 0 for kind in writers}
+        done = False
         
-        async with aiohttp.ClientSession() as session:
-            for currency in currencies:
-                url = f"{self.base_url}/fx/USD{currency}?apikey={self.api_key}"
-                try:
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            if data and len(data) > 0:
-                                rate_data = data[0]
-                                rates.append(ExchangeRate(
-                                    from_currency='USD',
-                                    to_currency=currency,
-                                    rate=float(rate_data['bid']),
-                                    date=date.today().isoformat()
-                                ))
-                except Exception as e:
-                    logger.error(f"Failed to fetch rate for USD/{currency}: {e}")
+        while not done:
+            # Block for the next result, then take whatever else is already queued
+            batch = {kind: [] for kind in writers}
+            item = await queue.get()
+            while True:
+                if item is None:
+                    done = True
+                    break
+                kind, records = item
+                batch[kind].extend(records)
+                if sum(len(records) for records in batch.values()) >= WRITE_BATCH_SIZE or queue.empty():
+                    break
+                item = queue.get_nowait()
+            
+            for kind, records in batch.items():
+                if records:
+                    # psycopg2 blocks; keep the event loop free for the fetchers
+                    written[kind] += await asyncio.to_thread(writers[kind], cursor, records)
         
-        return rates
+        return written
     
-    async def update_all_market_data(self):
-        """Main method to update all market data"""
+    @staticmethod
+    async def _unless_writer_failed(step: asyncio.Future, writer: asyncio.Task):
+        """Wait for a pipeline step, re-raising the writer's error if it stops first"""
+        # A failed writer stops draining the queue, so producers and the
+        # sentinel put could otherwise block forever on a full queue
+        await asyncio.wait({step, writer}, return_when=asyncio.FIRST_COMPLETED)
+        if writer.done():
+            writer.result()
+        return await step
+    
+    async def update_all_market_data(self, include_dividends: bool = True) -> Dict[str, int]:
+        """
+        Main method to update all market data.
+        Price, FX and dividend fetches run concurrently and stream into a single
+        writer; the upserts, repricing and view refresh commit as one transaction.
+        """
         logger.info("Starting market data update")
+        started = time.monotonic()
+        
+        # Get symbols that need updates
+        symbols = self.db_manager.get_active_symbols()
+        logger.info(f"Updating data for {len(symbols)} symbols: {symbols}")
         
+        conn = self.db_manager.get_connection()
+        tasks = []
+        committed = False
         try:
-            # Get symbols that need updates
-            symbols = self.db_manager.get_active_symbols()
-            logger.info(f"Updating data for {len(symbols)} symbols: {symbols}")
-            
-            # Fetch and update security prices
-            prices = await self.fetch_security_prices(symbols)
-            if prices:
-                self.db_manager.update_market_prices(prices)
+            cursor = conn.cursor()
+            queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+            semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+            writer = asyncio.create_task(self._write_results(queue, cursor))
+            tasks.append(writer)
             
-            # Fetch and update exchange rates
-            rates = await self.fetch_exchange_rates()
-            if rates:
-                self.db_manager.update_exchange_rates(rates)
+            async with aiohttp.ClientSession() as session:
+                fetches = [('price', self._fetch_single_price, symbol) for symbol in symbols]
+                fetches += [('fx', self._fetch_single_rate, currency) for currency in FX_CURRENCIES]
+                if include_dividends:
+                    fetch_dividends = partial(fetch_symbol_dividends, self.fmp)
+                    fetches += [('dividend', fetch_dividends, symbol) for symbol in symbols]
+                
+                producers = asyncio.gather(
+                    *(self._produce(queue, semaphore, session, kind, fetch, key) for kind, fetch, key in fetches)
+                )
+                tasks.append(producers)
+                await self._unless_writer_failed(producers, writer)
             
-            # Update position calculations
-            self.db_manager.update_position_values()
+            sentinel = asyncio.ensure_future(queue.put(None))
+            tasks.append(sentinel)
+            await self._unless_writer_failed(sentinel, writer)
+            written = await writer
+            logger.info(
+                f"Fetched and wrote {written['price']}/{len(symbols)} prices, "
+                f"{written['fx']}/{len(FX_CURRENCIES)} exchange rates, {written['dividend']} dividend records"
+            )
             
-            # Refresh net worth view
-            conn = self.db_manager.get_connection()
-            try:
-                cursor = conn.cursor()
-                cursor.execute("SELECT refresh_net_worth_view()")
-                conn.commit()
-                logger.info("Refreshed net worth materialized view")
-            finally:
-                conn.close()
+            # Reprice and refresh on the same transaction as the writes
+            written['positions'] = await asyncio.to_thread(self.db_manager.reprice_positions, cursor)
+            await asyncio.to_thread(cursor.execute, "SELECT refresh_net_worth_view()")
+            conn.commit()
+            committed = True
             
-            logger.info("Market data update completed successfully")
+            logger.info(f"Updated market values for {written['positions']} positions")
+            logger.info(f"Market data update completed successfully in {time.monotonic() - started:.1f}s")
+            return written
             
         except Exception as e:
-            logger.error(f"Market data update failed: {e}")
+            logger.error(f"Market data update failed; all changes rolled back: {e}")
             raise
+        finally:
+            # Also runs when the update itself is cancelled
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if not committed:
+                conn.rollback()
+            conn.close()
 
 # Configuration using environment variables
 class Config:
@@ -289,6 +320,11 @@ class Config:
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     LOG_FILE = os.getenv("LOG_FILE", "treviwise.log")
     
+    # Provider response cache (mode: cache, record, replay or off)
+    FMP_CACHE_DIR = os.getenv("FMP_CACHE_DIR", ".cache/fmp")
+    FMP_CACHE_MODE = os.getenv("FMP_CACHE_MODE", "cache").lower()
+    FMP_CACHE_MAX_MB = int(os.getenv("FMP_CACHE_MAX_MB", "256"))
+    
     def __post_init__(self):
         """Validate required environment variables"""
         if not self.DB_PASSWORD:
@@ -310,21 +346,36 @@ async def main():
             logger.error("DB_PASSWORD environment variable is required")
             return
         
-        if not config.FMP_API_KEY:
+        if not config.FMP_API_KEY and config.FMP_CACHE_MODE != "replay":
             logger.error("FMP_API_KEY environment variable is required")
             return
         
         logger.info(f"Starting Treviwise market data service")
         logger.info(f"Database: {config.DB_HOST}:{config.DB_PORT}/{config.DB_NAME}")
         logger.info(f"Debug mode: {config.DEBUG}")
+        logger.info(f"Provider cache: {config.FMP_CACHE_MODE} ({config.FMP_CACHE_DIR})")
         
         # Initialize services
         db_manager = DatabaseManager(config.database_url)
-        market_service = MarketDataService(config.FMP_API_KEY, db_manager)
+        cache = ProviderCache(
+            config.FMP_CACHE_DIR,
+            mode=config.FMP_CACHE_MODE,
+            max_bytes=config.FMP_CACHE_MAX_MB * 1024 * 1024,
+        )
+        market_service = MarketDataService(config.FMP_API_KEY, db_manager, cache)
         
         # Run market data update
         await market_service.update_all_market_data()
         
+        # Fold the new prices into the analytics price store; the API keeps serving the old generation on failure
+        conn = db_manager.get_connection()
+        try:
+            build_price_store(conn.cursor())
+        except Exception as e:
+            logger.warning(f"Price store update failed: {e}")
+        finally:
+            conn.close()
+        
         # Show summary
         conn = db_manager.get_connection()
         try:
@@ -0,0 +1,198 @@
+# backend/metadata_sync.py
+"""
+Sync securities_master metadata from FMP company profiles
+Finds missing and stale symbols, fetches profiles in batches and upserts
+them in one set-based statement
+"""
+
+import asyncio
+import logging
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+import aiohttp
+from psycopg2.extras import execute_values
+
+from fmp_client import FMPClient
+from market_data_service import Config, DatabaseManager
+from provider_cache import MODE_REPLAY, ProviderCache
+
+logger = logging.getLogger(__name__)
+
+# Symbols per profile request (the endpoint takes a comma-separated list)
+PROFILE_BATCH_SIZE = 50
+
+# Re-sync metadata older than this; matches the profile cache TTL
+STALE_AFTER_DAYS = 30
+
+
+def profile_security_type(profile: Dict[str, Any]) -> str:
+    if profile.get('isEtf'):
+        return 'ETF'
+    if profile.get('isFund'):
+        return 'Mutual Fund'
+    return 'Stock'
+
+
+def _text(value) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+class SecurityMetadataSync:
+    def __init__(self, fmp_api_key: str, db_manager: DatabaseManager, cache: Optional[ProviderCache] = None):
+        self.db_manager = db_manager
+        self.fmp = FMPClient(fmp_api_key, cache)
+
+    def find_symbols_to_sync(self, cursor, new_symbols: Sequence[str] = ()) -> List[str]:
+        """Active symbols never synced or synced too long ago, plus requested symbols not yet listed"""
+        cursor.execute("""
+            SELECT symbol
+            FROM securities_master
+            WHERE is_active = TRUE
+            AND (metadata_updated_at IS NULL
+                 OR metadata_updated_at < CURRENT_TIMESTAMP - make_interval(days => %s))
+            UNION
+            SELECT requested.symbol
+            FROM unnest(%s::text[]) AS requested(symbol)
+            WHERE NOT EXISTS (SELECT 1 FROM securities_master sm WHERE sm.symbol = requested.symbol)
+            ORDER BY symbol
+        """, (STALE_AFTER_DAYS, [symbol.upper() for symbol in new_symbols]))
+        return [row['symbol'] for row in cursor.fetchall()]
+
+    async def _fetch_profile_batch(self, session: aiohttp.ClientSession, symbols: List[str]) -> List[Dict]:
+        try:
+            data = await self.fmp.get_json(session, f"profile/{','.join(symbols)}")
+            return data or []
+        except Exception as e:
+            logger.error(f"Failed to fetch profiles for {symbols[0]}..{symbols[-1]}: {e}")
+            return []
+
+    async def fetch_profiles(self, symbols: List[str]) -> List[Dict]:
+        """Fetch company profiles, PROFILE_BATCH_SIZE symbols per request, batches in parallel"""
+        batches = [symbols[i:i + PROFILE_BATCH_SIZE] for i in range(0, len(symbols), PROFILE_BATCH_SIZE)]
+        async with aiohttp.ClientSession() as session:
+            results = await asyncio.gather(*(self._fetch_profile_batch(session, batch) for batch in batches))
+        profiles = [profile for batch in results for profile in batch if profile.get('symbol')]
+        logger.info(f"Fetched {len(profiles)}/{len(symbols)} profiles in {len(batches)} requests")
+        return profiles
+
+    def upsert_profiles(self, cursor, profiles: List[Dict]) -> int:
+        """Insert new securities and fill metadata on existing ones in one statement"""
+        # One row per symbol; ON CONFLICT cannot update the same row twice
+        rows = {
+            profile['symbol']: (
+                profile['symbol'],
+                _text(profile.get('companyName')) or profile['symbol'],
+                profile_security_type(profile),
+                _text(profile.get('exchangeShortName')),
+                _text(profile.get('sector')),
+                _text(profile.get('currency')),
+                _text(profile.get('country')),
+                _text(profile.get('isin')),
+                _text(profile.get('cusip')),
+                profile.get('isActivelyTrading', True) is not False,
+            )
+            for profile in profiles
+        }
+        if not rows:
+            return 0
+
+        execute_values(cursor, """
+            INSERT INTO securities_master (
+                symbol, security_name, security_type, exchange, sector,
+                currency, country, isin, cusip, is_active, metadata_updated_at
+            )
+            SELECT
+                v.symbol,
+                LEFT(v.security_name, 200),
+                v.security_type,
+                LEFT(v.exchange, 10),
+                LEFT(v.sector, 50),
+                -- Unknown currencies would violate the currencies foreign key
+                (SELECT c.currency_code FROM currencies c WHERE c.currency_code = v.currency),
+                LEFT(v.country, 50),
+                LEFT(v.isin, 20),
+                LEFT(v.cusip, 20),
+                v.is_active,
+                CURRENT_TIMESTAMP
+            FROM (VALUES %s) AS v(symbol, security_name, security_type, exchange, sector,
+                                  currency, country, isin, cusip, is_active)
+            ON CONFLICT (symbol) DO UPDATE SET
+                -- Keep the stored name when the profile had none
+                security_name = CASE
+                    WHEN EXCLUDED.security_name = EXCLUDED.symbol THEN securities_master.security_name
+                    ELSE EXCLUDED.security_name
+                END,
+                -- Profiles only tell stocks, ETFs and funds apart; keep hand-set types such as 'Bond'
+                security_type = CASE
+                    WHEN securities_master.security_type IN ('Stock', 'ETF', 'Mutual Fund') THEN EXCLUDED.security_type
+                    ELSE securities_master.security_type
+                END,
+                exchange = COALESCE(EXCLUDED.exchange, securities_master.exchange),
+                sector = COALESCE(EXCLUDED.sector, securities_master.sector),
+                currency = COALESCE(EXCLUDED.currency, securities_master.currency),
+                country = COALESCE(EXCLUDED.country, securities_master.country),
+                isin = COALESCE(EXCLUDED.isin, securities_master.isin),
+                cusip = COALESCE(EXCLUDED.cusip, securities_master.cusip),
+                is_active = EXCLUDED.is_active,
+                metadata_updated_at = EXCLUDED.metadata_updated_at
+        """, list(rows.values()), page_size=len(rows))
+        return len(rows)
+
+    async def sync(self, new_symbols: Sequence[str] = ()) -> Dict[str, int]:
+        """Fetch and upsert metadata for every symbol that needs it, in one transaction"""
+        conn = self.db_manager.get_connection()
+        try:
+            cursor = conn.cursor()
+            symbols = self.find_symbols_to_sync(cursor, new_symbols)
+            if not symbols:
+                logger.info("Security metadata is up to date")
+                return {'candidates': 0, 'updated': 0}
+
+            logger.info(f"Syncing metadata for {len(symbols)} symbols")
+            profiles = await self.fetch_profiles(symbols)
+            updated = self.upsert_profiles(cursor, profiles)
+
+            # Security types feed the asset class breakdown in the materialized view
+            cursor.execute("SELECT refresh_net_worth_view()")
+            conn.commit()
+
+            missing = sorted(set(symbols) - {profile['symbol'] for profile in profiles})
+            if missing:
+                logger.warning(f"No profile returned for: {missing}")
+            logger.info(f"Upserted metadata for {updated} securities")
+            return {'candidates': len(symbols), 'updated': updated}
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Security metadata sync failed: {e}")
+            raise
+        finally:
+            conn.close()
+
+
+async def main():
+    """Sync stale metadata; symbols given on the command line are added if missing"""
+    config = Config()
+
+    if not config.DB_PASSWORD:
+        logger.error("DB_PASSWORD environment variable is required")
+        return
+
+    if not config.FMP_API_KEY and config.FMP_CACHE_MODE != MODE_REPLAY:
+        logger.error("FMP_API_KEY environment variable is required")
+        return
+
+    cache = ProviderCache(
+        config.FMP_CACHE_DIR,
+        mode=config.FMP_CACHE_MODE,
+        max_bytes=config.FMP_CACHE_MAX_MB * 1024 * 1024,
+    )
+    sync = SecurityMetadataSync(config.FMP_API_KEY, DatabaseManager(config.database_url), cache)
+    await sync.sync(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
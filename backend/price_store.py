@@ -0,0 +1,294 @@
+# backend/price_store.py
+"""
+Memory-mapped columnar cache of market_prices for analytics
+A symbol x date float64 matrix plus symbol and date index arrays, rebuilt
+incrementally from a created_at watermark and opened read-only with mmap so
+every worker shares the same OS page cache
+"""
+
+import io
+import json
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = ".cache/prices"
+
+# Pointer to the published generation; swapped atomically with os.replace
+CURRENT_FILE = "CURRENT"
+KEEP_GENERATIONS = 2
+
+# Collectors stamp created_at before they commit, so re-read a margin behind
+# the watermark to pick up rows from transactions that committed late
+WATERMARK_OVERLAP = timedelta(hours=1)
+
+# Builder lock file; one left behind by a crashed build is taken over once it is this old
+LOCK_FILE = ".lock"
+LOCK_STALE_SECONDS = 3600
+LOCK_POLL_SECONDS = 0.5
+
+_store: Optional["PriceStore"] = None
+
+
+class PriceStore:
+    """Read-only view of one published generation"""
+
+    def __init__(self, path: str, symbols: np.ndarray, dates: np.ndarray, prices: np.ndarray, meta: Dict):
+        self.path = path
+        self.symbols = symbols
+        self.dates = dates
+        self.prices = prices
+        self.meta = meta
+        self.symbol_index = {symbol: i for i, symbol in enumerate(symbols.tolist())}
+
+    @classmethod
+    def open(cls, root: Optional[str] = None) -> Optional["PriceStore"]:
+        """Map the current generation, or return None if nothing was built yet"""
+        root = root or store_dir()
+        generation = _read_current(root)
+        if generation is None:
+            return None
+
+        path = os.path.join(root, generation)
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        return cls(
+            path,
+            np.load(os.path.join(path, "symbols.npy")),
+            np.load(os.path.join(path, "dates.npy")),
+            # Zero copy: pages are read on first touch and shared across processes
+            np.load(os.path.join(path, "prices.npy"), mmap_mode="r"),
+            meta,
+        )
+
+    @property
+    def generation(self) -> str:
+        return os.path.basename(self.path)
+
+    def window(self, symbols: Optional[Iterable[str]] = None, start=None, end=None) -> pd.DataFrame:
+        """Date x symbol prices between start and end (inclusive); unknown symbols are skipped.
+
+        Without `symbols` the frame wraps the mapped matrix without copying.
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(start, "D"), side="left"))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(end, "D"), side="right"))
+
+        if symbols is None:
+            rows, block = self.symbols, self.prices[:, lo:hi]
+        else:
+            found = [s for s in symbols if s in self.symbol_index]
+            rows = np.array(found, dtype=self.symbols.dtype)
+            block = self.prices[[self.symbol_index[s] for s in found], lo:hi]
+
+        return pd.DataFrame(block.T, index=pd.DatetimeIndex(self.dates[lo:hi]), columns=rows, copy=False)
+
+    def last_before(self, symbols: Iterable[str], start) -> pd.Series:
+        """Each symbol's last known price strictly before start (NaN if none); unknown symbols are skipped"""
+        lo = int(np.searchsorted(self.dates, np.datetime64(start, "D"), side="left"))
+        found = [s for s in symbols if s in self.symbol_index]
+        if not lo or not found:
+            return pd.Series(np.nan, index=found, dtype=float)
+
+        # Column of each row's last non-NaN price; rows without one read NaN anyway
+        block = self.prices[[self.symbol_index[s] for s in found], :lo]
+        last = lo - 1 - np.argmax(~np.isnan(block[:, ::-1]), axis=1)
+        return pd.Series(block[np.arange(len(found)), last], index=found, dtype=float)
+
+
+def store_dir() -> str:
+    return os.getenv("PRICE_STORE_DIR", DEFAULT_STORE_DIR)
+
+
+def _read_current(root: str) -> Optional[str]:
+    try:
+        with open(os.path.join(root, CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def get_price_store() -> Optional[PriceStore]:
+    """Process-wide store, remapped when a newer generation is published"""
+    global _store
+    generation = _read_current(store_dir())
+    if generation is None:
+        return None
+    if _store is None or _store.generation != generation:
+        _store = PriceStore.open()
+    return _store
+
+
+def _fetch_rows(cursor, since: Optional[datetime]) -> pd.DataFrame:
+    """Stream market_prices rows through COPY instead of building a dict per row"""
+    query = "SELECT symbol, price_date, price, created_at FROM market_prices"
+    if since is not None:
+        query = cursor.mogrify(query + " WHERE created_at > %s", (since,)).decode()
+
+    buffer = io.StringIO()
+    cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv)", buffer)
+    buffer.seek(0)
+
+    rows = pd.read_csv(
+        buffer,
+        names=["symbol", "price_date", "price", "created_at"],
+        dtype={"symbol": str, "price": np.float64},
+        parse_dates=["price_date", "created_at"],
+    )
+    # A later write to the same (symbol, date) wins
+    return rows.sort_values("created_at").drop_duplicates(["symbol", "price_date"], keep="last")
+
+
+@contextmanager
+def _builder_lock(root: str):
+    """Hold an O_EXCL lock file so only one build runs at a time; works on any platform"""
+    path = os.path.join(root, LOCK_FILE)
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                age = time.time() - os.path.getmtime(path)
+            except FileNotFoundError:
+                continue
+            if age > LOCK_STALE_SECONDS:
+                logger.warning(f"Removing stale price store lock ({age:.0f}s old)")
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                continue
+            time.sleep(LOCK_POLL_SECONDS)
+
+    try:
+        os.write(fd, str(os.getpid()).encode())
+        yield
+    finally:
+        os.close(fd)
+        os.remove(path)
+
+
+def build(cursor, root: Optional[str] = None, full: bool = False) -> PriceStore:
+    """Publish a new generation with every market_prices row written since the last build.
+
+    The previous generation is copied forward and only the delta is read from
+    the database; `full=True` rebuilds from scratch (e.g. after deletes).
+    """
+    root = root or store_dir()
+    os.makedirs(root, exist_ok=True)
+
+    # One builder at a time; readers never take the lock
+    with _builder_lock(root):
+        previous = None if full else PriceStore.open(root)
+        since = None
+        if previous is not None and previous.meta.get("watermark"):
+            since = datetime.fromisoformat(previous.meta["watermark"]) - WATERMARK_OVERLAP
+
+        started = time.monotonic()
+        delta = _fetch_rows(cursor, since)
+
+        delta_dates = delta["price_date"].to_numpy().astype("datetime64[D]")
+        if previous is not None:
+            symbols = np.union1d(previous.symbols, delta["symbol"].to_numpy().astype(str))
+            dates = np.union1d(previous.dates, delta_dates)
+        else:
+            symbols = np.unique(delta["symbol"].to_numpy().astype(str))
+            dates = np.unique(delta_dates)
+
+        generation = f"gen-{time.time_ns()}"
+        path = os.path.join(root, generation)
+        os.makedirs(path)
+
+        prices = np.lib.format.open_memmap(
+            os.path.join(path, "prices.npy"), mode="w+", dtype=np.float64, shape=(len(symbols), len(dates))
+        )
+        if previous is not None and previous.prices.shape == prices.shape:
+            # Same axes: straight block copy
+            prices[:] = previous.prices
+        else:
+            prices[:] = np.nan
+            if previous is not None and previous.prices.size:
+                rows = np.searchsorted(symbols, previous.symbols)
+                cols = np.searchsorted(dates, previous.dates)
+                prices[np.ix_(rows, cols)] = previous.prices
+
+        if len(delta):
+            prices[
+                np.searchsorted(symbols, delta["symbol"].to_numpy().astype(str)),
+                np.searchsorted(dates, delta_dates),
+            ] = delta["price"].to_numpy()
+        prices.flush()
+        del prices
+
+        watermark = delta["created_at"].max() if len(delta) else None
+        if pd.isna(watermark):
+            watermark = previous.meta.get("watermark") if previous is not None else None
+        else:
+            watermark = watermark.isoformat()
+            # Never move the watermark backwards on an overlapping re-read
+            if previous is not None and previous.meta.get("watermark"):
+                watermark = max(watermark, previous.meta["watermark"])
+
+        np.save(os.path.join(path, "symbols.npy"), symbols)
+        np.save(os.path.join(path, "dates.npy"), dates)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({
+                "watermark": watermark,
+                "built_at": datetime.now().isoformat(),
+                "rows_applied": int(len(delta)),
+                "symbols": int(len(symbols)),
+                "dates": int(len(dates)),
+            }, f)
+
+        # Publish: readers see either the old or the new generation, never a partial one
+        pointer = os.path.join(root, CURRENT_FILE + ".tmp")
+        with open(pointer, "w") as f:
+            f.write(generation)
+        os.replace(pointer, os.path.join(root, CURRENT_FILE))
+
+        _prune_generations(root, generation)
+        logger.info(
+            f"Price store {generation}: {len(symbols)} symbols x {len(dates)} dates, "
+            f"{len(delta)} rows applied in {time.monotonic() - started:.2f}s"
+        )
+
+    return PriceStore.open(root)
+
+
+def _prune_generations(root: str, current: str):
+    """Keep the newest generations; workers still mapping an older one keep its pages until they remap"""
+    generations = sorted(name for name in os.listdir(root) if name.startswith("gen-"))
+    for name in generations[:-KEEP_GENERATIONS]:
+        if name != current:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+def main():
+    """Build or update the store; pass --full to rebuild from scratch"""
+    import sys
+
+    from market_data_service import Config, DatabaseManager
+
+    config = Config()
+    if not config.DB_PASSWORD:
+        logger.error("DB_PASSWORD environment variable is required")
+        return
+
+    conn = DatabaseManager(config.database_url).get_connection()
+    try:
+        build(conn.cursor(), full="--full" in sys.argv)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
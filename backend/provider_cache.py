@@ -0,0 +1,175 @@
+# backend/provider_cache.py
+"""
+Disk-backed cache for market data provider responses
+Keyed by endpoint + params, with per-endpoint TTLs, size-bounded LRU
+eviction and record/replay modes for offline runs
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Cache modes
+MODE_OFF = "off"        # always hit the provider, store nothing
+MODE_CACHE = "cache"    # serve fresh entries, fetch and store on miss/expiry
+MODE_RECORD = "record"  # always hit the provider and store every response
+MODE_REPLAY = "replay"  # never hit the provider; serve stored entries regardless of age
+MODES = (MODE_OFF, MODE_CACHE, MODE_RECORD, MODE_REPLAY)
+
+# TTL in seconds by endpoint prefix; the longest matching prefix wins
+DEFAULT_TTLS = {
+    "quote-short": 30,
+    "quote": 30,
+    "fx": 60,
+    "historical-price-full/stock_dividend": 24 * 3600,
+    "historical-price-full": 12 * 3600,
+    "profile": 30 * 24 * 3600,
+}
+FALLBACK_TTL = 3600
+
+
+class CacheMiss(LookupError):
+    """Raised in replay mode when a request was never recorded"""
+
+
+class ProviderCache:
+    def __init__(
+        self,
+        cache_dir: str,
+        mode: str = MODE_CACHE,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttls: Optional[Dict[str, int]] = None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cache mode '{mode}', expected one of {MODES}")
+
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "provider_cache.sqlite3")
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                params TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        self._total_bytes = self._stored_bytes()
+
+    @classmethod
+    def from_env(cls) -> "ProviderCache":
+        """Build from FMP_CACHE_DIR / FMP_CACHE_MODE / FMP_CACHE_MAX_MB"""
+        return cls(
+            cache_dir=os.getenv("FMP_CACHE_DIR", ".cache/fmp"),
+            mode=os.getenv("FMP_CACHE_MODE", MODE_CACHE).lower(),
+            max_bytes=int(os.getenv("FMP_CACHE_MAX_MB", "256")) * 1024 * 1024,
+        )
+
+    @property
+    def reads_enabled(self) -> bool:
+        return self.mode in (MODE_CACHE, MODE_REPLAY)
+
+    @property
+    def writes_enabled(self) -> bool:
+        return self.mode in (MODE_CACHE, MODE_RECORD)
+
+    def ttl_for(self, endpoint: str) -> int:
+        matches = [prefix for prefix in self.ttls if endpoint.startswith(prefix)]
+        return self.ttls[max(matches, key=len)] if matches else FALLBACK_TTL
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+        """Stable key from endpoint + params; the API key never takes part"""
+        canonical = json.dumps(
+            {k: v for k, v in (params or {}).items() if k != "apikey"},
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.sha256(f"{endpoint}?{canonical}".encode()).hexdigest()
+        return digest, canonical
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Return the cached JSON body, or None when missing/expired"""
+        if not self.reads_enabled:
+            return None
+
+        key, _ = self.make_key(endpoint, params)
+        row = self.conn.execute(
+            "SELECT body, fetched_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            if self.mode == MODE_REPLAY:
+                raise CacheMiss(f"No recorded response for {endpoint} {params or {}}")
+            return None
+
+        body, fetched_at = row
+        if self.mode != MODE_REPLAY and time.time() - fetched_at > self.ttl_for(endpoint):
+            return None
+
+        self.conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return json.loads(body)
+
+    def put(self, endpoint: str, params: Optional[Dict[str, Any]], data: Any):
+        """Store a JSON body and evict least recently used entries over the size bound"""
+        if not self.writes_enabled:
+            return
+
+        key, canonical = self.make_key(endpoint, params)
+        body = json.dumps(data).encode()
+        now = time.time()
+        self.conn.execute("""
+            INSERT OR REPLACE INTO responses (key, endpoint, params, body, size, fetched_at, accessed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (key, endpoint, canonical, body, len(body), now, now))
+
+        # Over-counts replaced entries; corrected whenever eviction runs
+        self._total_bytes += len(body)
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _stored_bytes(self) -> int:
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _evict(self):
+        # Keep the most recently used entries whose running size fits the bound
+        cursor = self.conn.execute("""
+            DELETE FROM responses WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS running_size
+                    FROM responses
+                )
+                WHERE running_size > ?
+            )
+        """, (self.max_bytes,))
+        if cursor.rowcount:
+            logger.info(f"Evicted {cursor.rowcount} cached provider responses")
+        self._total_bytes = self._stored_bytes()
+
+    def clear(self):
+        self.conn.execute("DELETE FROM responses")
+        self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        entries, total = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        return {"mode": self.mode, "entries": entries, "bytes": total, "max_bytes": self.max_bytes}
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,64 @@
+# backend/security_metadata.py
+"""
+In-memory security metadata lookup shared by the API and analytics
+Holds securities_master plus the security_type -> asset class mapping,
+reloaded only when either table changes
+"""
+
+from typing import Any, Dict, Optional
+
+from data_version import VersionedCache
+
+# Asset class for security types missing from security_type_asset_classes
+FALLBACK_ASSET_CLASS = 'Alternative Investments'
+
+_cache = VersionedCache(('securities_master', 'security_type_asset_classes'))
+
+
+class SecurityLookup:
+    """symbol -> metadata, with the asset class already resolved"""
+
+    def __init__(self, securities: Dict[str, Dict[str, Any]], type_classes: Dict[str, str]):
+        self.type_classes = type_classes
+        self.securities = {
+            symbol: dict(row, asset_class=self.asset_class_for_type(row['security_type']))
+            for symbol, row in securities.items()
+        }
+
+    def asset_class_for_type(self, security_type: Optional[str]) -> str:
+        return self.type_classes.get(security_type, FALLBACK_ASSET_CLASS)
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        return self.securities.get(symbol)
+
+    def asset_class(self, symbol: str) -> str:
+        security = self.securities.get(symbol)
+        return security['asset_class'] if security else FALLBACK_ASSET_CLASS
+
+    def sector(self, symbol: str) -> Optional[str]:
+        security = self.securities.get(symbol)
+        return security['sector'] if security else None
+
+    def annotate(self, rows, symbol_key: str = 'symbol'):
+        """Add sector and asset_class to each row dict in place; returns rows"""
+        for row in rows:
+            row['sector'] = self.sector(row[symbol_key])
+            row['asset_class'] = self.asset_class(row[symbol_key])
+        return rows
+
+
+def load_lookup(cursor) -> SecurityLookup:
+    cursor.execute("SELECT security_type, asset_class FROM security_type_asset_classes")
+    type_classes = {row['security_type']: row['asset_class'] for row in cursor.fetchall()}
+
+    cursor.execute("""
+        SELECT symbol, security_name, security_type, sector, exchange, country, currency, is_active
+        FROM securities_master
+    """)
+    securities = {row['symbol']: dict(row) for row in cursor.fetchall()}
+    return SecurityLookup(securities, type_classes)
+
+
+def get_security_lookup(cursor) -> SecurityLookup:
+    """Return the lookup for the current data version, loading it at most once"""
+    return _cache.get(cursor, load_lookup)
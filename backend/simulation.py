@@ -0,0 +1,324 @@
+# backend/simulation.py
+"""
+Monte Carlo projection of portfolio value
+Holdings are grouped by asset class and simulated month by month with
+bootstrapped or parametric returns, cash flows and periodic rebalancing;
+path batches run in a process pool and results are cached by input hash
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Annual (expected return, volatility) per asset class for parametric draws,
+# and for classes without price history in bootstrap mode
+DEFAULT_ASSUMPTIONS = {
+    'Equities': (0.07, 0.16),
+    'Fixed Income': (0.03, 0.06),
+    'Cash & Equivalents': (0.02, 0.01),
+    'Real Estate': (0.04, 0.10),
+}
+FALLBACK_ASSUMPTION = (0.04, 0.12)
+
+# Months between rebalances
+REBALANCE_MONTHS = {'none': 0, 'monthly': 1, 'quarterly': 3, 'annual': 12}
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Bootstrap needs at least this many monthly returns for a class
+MIN_HISTORY_MONTHS = 24
+
+# Paths per worker task; smaller batches balance better, larger ones cost less IPC
+MIN_BATCH_PATHS = 2000
+
+# Worker processes; capped so a large host does not spawn one interpreter per core
+MAX_WORKERS = 8
+WORKERS = int(os.getenv('SIMULATION_WORKERS') or 0) or min(os.cpu_count() or 1, MAX_WORKERS)
+
+CACHE_SIZE = 32
+
+_cache: 'OrderedDict[str, Dict]' = OrderedDict()
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Shared worker pool; spawn keeps workers independent of the server's threads"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=WORKERS, mp_context=get_context('spawn'))
+    return _executor
+
+
+def shutdown_executor():
+    """Stop the worker pool, dropping batches that have not started"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+def load_holdings(cursor, lookup) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """Current USD value per asset class, plus per-symbol position values.
+
+    Positions are classified with the security lookup; direct assets and
+    account cash come from the net worth view.
+    """
+    cursor.execute("""
+        SELECT p.symbol, SUM(COALESCE(p.market_value, p.quantity * p.average_cost_basis)) AS value
+        FROM positions p
+        JOIN investment_accounts ia ON p.account_id = ia.account_id
+        WHERE ia.is_active = TRUE AND p.quantity > 0
+        GROUP BY p.symbol
+    """)
+    positions = cursor.fetchall()
+
+    cursor.execute("""
+        SELECT asset_class, SUM(value_usd) AS value
+        FROM current_net_worth_detailed
+        WHERE source_type <> 'Investment Position'
+        GROUP BY asset_class
+    """)
+
+    holdings: Dict[str, float] = {}
+    for row in cursor.fetchall():
+        holdings[row['asset_class']] = holdings.get(row['asset_class'], 0.0) + float(row['value'] or 0)
+    for row in positions:
+        asset_class = lookup.asset_class(row['symbol'])
+        holdings[asset_class] = holdings.get(asset_class, 0.0) + float(row['value'] or 0)
+
+    symbol_values = {row['symbol']: float(row['value'] or 0) for row in positions}
+    return {k: v for k, v in holdings.items() if v > 0}, symbol_values
+
+
+def class_return_history(store, lookup, symbol_values: Dict[str, float], classes: List[str]) -> Optional[np.ndarray]:
+    """Monthly value-weighted returns per class from the price store (months x classes, NaN = no history)"""
+    if store is None or not symbol_values:
+        return None
+
+    prices = store.window(list(symbol_values))
+    closes = prices.groupby(prices.index.to_period('M')).last()
+    returns = closes.pct_change().iloc[1:]
+    if len(returns) < MIN_HISTORY_MONTHS:
+        return None
+
+    history = np.full((len(returns), len(classes)), np.nan)
+    for k, asset_class in enumerate(classes):
+        symbols = [s for s in returns.columns if lookup.asset_class(s) == asset_class]
+        if not symbols:
+            continue
+        r = returns[symbols].to_numpy()
+        w = np.array([symbol_values[s] for s in symbols])
+        # Weight each month by the symbols that traded in it
+        weights = np.where(np.isnan(r), 0.0, w)
+        total = weights.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            history[:, k] = np.where(total > 0, np.nansum(np.nan_to_num(r) * weights, axis=1) / total, np.nan)
+
+    # Bootstrap samples whole months, so keep months every class with history has
+    has_history = ~np.isnan(history).all(axis=0)
+    if has_history.any():
+        complete = ~np.isnan(history[:, has_history]).any(axis=1)
+        history = history[complete]
+    if len(history) < MIN_HISTORY_MONTHS:
+        return None
+    return history
+
+
+def cash_flow_schedule(cash_flows: List[Dict], months: int) -> np.ndarray:
+    """Monthly net cash flow; each flow is an annual amount (negative = withdrawal) with optional yearly growth"""
+    schedule = np.zeros(months)
+    month = np.arange(months)
+    for flow in cash_flows:
+        start = int(flow.get('start_year', 0)) * 12
+        end = months if flow.get('end_year') is None else min(int(flow['end_year']) * 12, months)
+        active = (month >= start) & (month < end)
+        growth = (1 + float(flow.get('growth', 0.0))) ** ((month - start) // 12)
+        schedule += np.where(active, float(flow['annual_amount']) / 12 * growth, 0.0)
+    return schedule
+
+
+def simulate_batch(
+    seed: int,
+    paths: int,
+    initial: np.ndarray,
+    target: np.ndarray,
+    flows: np.ndarray,
+    rebalance_every: int,
+    history: Optional[np.ndarray],
+    bootstrap_mask: np.ndarray,
+    mu: np.ndarray,
+    sigma: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate `paths` paths; returns year-end totals (paths x years+1) and a depleted flag per path"""
+    rng = np.random.default_rng(seed)
+    months = len(flows)
+
+    # Class-major (classes x paths) with bootstrapped classes first, so each kind
+    # of draw fills a contiguous block in place
+    order = np.concatenate([np.flatnonzero(bootstrap_mask), np.flatnonzero(~bootstrap_mask)])
+    n_boot = int(bootstrap_mask.sum())
+    initial, target, mu, sigma = initial[order], target[order], mu[order], sigma[order]
+    growth_history = np.ascontiguousarray(1 + history[:, order[:n_boot]].T) if n_boot else None
+    target_column = target[:, None]
+
+    # Lognormal monthly parameters for the classes that are not bootstrapped
+    drift = (np.log1p(mu) / 12 - sigma ** 2 / 24)[n_boot:, None]
+    scale = (sigma / math.sqrt(12))[n_boot:, None]
+
+    values = np.repeat(initial[:, None], paths, axis=1)
+    growth = np.empty_like(values)
+    totals = np.empty((paths, months // 12 + 1), dtype=np.float32)
+    totals[:, 0] = values.sum(axis=0)
+    depleted = np.zeros(paths, dtype=bool)
+
+    for t in range(months):
+        if n_boot:
+            # Same sampled month for every class keeps their historical correlation
+            np.take(growth_history, rng.integers(0, growth_history.shape[1], size=paths), axis=1, out=growth[:n_boot])
+        if n_boot < len(initial):
+            parametric = growth[n_boot:]
+            rng.standard_normal(out=parametric)
+            parametric *= scale
+            parametric += drift
+            np.exp(parametric, out=parametric)
+        values *= growth
+
+        flow = flows[t]
+        if flow > 0:
+            values += flow * target_column
+        elif flow < 0:
+            total = values.sum(axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                share = np.where(total > 0, values / total, target_column)
+            values += flow * share
+            empty = values.sum(axis=0) <= 0
+            depleted |= empty
+            values[:, empty] = 0.0
+
+        if rebalance_every and (t + 1) % rebalance_every == 0:
+            values = values.sum(axis=0) * target_column
+
+        if (t + 1) % 12 == 0:
+            totals[:, (t + 1) // 12] = values.sum(axis=0)
+
+    return totals, depleted
+
+
+def cache_key(inputs: Dict) -> str:
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+async def run_simulation(
+    holdings: Dict[str, float],
+    symbol_values: Dict[str, float],
+    params: Dict,
+    store=None,
+    lookup=None,
+) -> Dict:
+    """Split the paths into batches across the pool and aggregate percentile bands"""
+    # A new price store generation changes the bootstrap sample, so it is part of the key
+    inputs = {
+        'holdings': holdings,
+        'symbol_values': symbol_values if params['method'] == 'bootstrap' else None,
+        'params': params,
+        'data_version': store.generation if store is not None else None,
+    }
+    key = cache_key(inputs)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return dict(_cache[key], cached=True)
+
+    started = time.monotonic()
+    years, paths = params['years'], params['paths']
+
+    target_weights = params.get('target_weights') or {}
+    classes = sorted(set(holdings) | set(target_weights))
+    initial = np.array([holdings.get(c, 0.0) for c in classes])
+    if target_weights:
+        target = np.array([float(target_weights.get(c, 0.0)) for c in classes])
+    else:
+        # No target: rebalance back to today's mix
+        target = initial.copy()
+    target = target / target.sum()
+
+    overrides = params.get('assumptions') or {}
+    assumptions = [overrides.get(c) or DEFAULT_ASSUMPTIONS.get(c, FALLBACK_ASSUMPTION) for c in classes]
+    mu = np.array([float(a[0]) for a in assumptions])
+    sigma = np.array([float(a[1]) for a in assumptions])
+
+    class_history = None
+    bootstrap_mask = np.zeros(len(classes), dtype=bool)
+    if params['method'] == 'bootstrap':
+        class_history = class_return_history(store, lookup, symbol_values, classes)
+    if class_history is not None:
+        bootstrap_mask = ~np.isnan(class_history).any(axis=0)
+        if bootstrap_mask.any():
+            class_history = np.nan_to_num(class_history)
+        else:
+            class_history = None
+
+    flows = cash_flow_schedule(params.get('cash_flows') or [], years * 12)
+    rebalance_every = REBALANCE_MONTHS[params['rebalance']]
+
+    batch_paths = max(MIN_BATCH_PATHS, math.ceil(paths / WORKERS))
+    sizes = [min(batch_paths, paths - start) for start in range(0, paths, batch_paths)]
+    # Deterministic per input, so a repeated request reproduces the same bands
+    seed = params.get('seed')
+    seeds = np.random.SeedSequence(int(key[:16], 16) if seed is None else seed).generate_state(len(sizes))
+
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(
+            get_executor(), simulate_batch,
+            int(batch_seed), size, initial, target, flows, rebalance_every,
+            class_history, bootstrap_mask, mu, sigma,
+        )
+        for batch_seed, size in zip(seeds, sizes)
+    ))
+    totals = np.concatenate([r[0] for r in results])
+    depleted = np.concatenate([r[1] for r in results])
+
+    percentiles = params.get('percentiles') or DEFAULT_PERCENTILES
+    bands = np.percentile(totals, percentiles, axis=0)
+
+    result = {
+        'years': list(range(years + 1)),
+        'percentiles': {f"p{p:g}": band.round(2).tolist() for p, band in zip(percentiles, bands)},
+        'mean': totals.mean(axis=0).round(2).tolist(),
+        'success_rate': float(1 - depleted.mean()),
+        'initial_value': float(initial.sum()),
+        'allocation': [
+            {
+                'asset_class': c,
+                'value': float(initial[k]),
+                'weight': float(initial[k] / initial.sum()) if initial.sum() else 0.0,
+                'target_weight': float(target[k]),
+                'returns': 'bootstrap' if bootstrap_mask[k] else 'parametric',
+                'expected_return': float(
+                    np.prod(1 + class_history[:, k]) ** (12 / len(class_history)) - 1
+                ) if bootstrap_mask[k] else float(mu[k]),
+                'volatility': float(class_history[:, k].std() * math.sqrt(12)) if bootstrap_mask[k] else float(sigma[k]),
+            }
+            for k, c in enumerate(classes)
+        ],
+        'history_months': int(len(class_history)) if class_history is not None else 0,
+        'paths': paths,
+        'method': params['method'],
+        'rebalance': params['rebalance'],
+        'batches': len(sizes),
+        'elapsed_seconds': round(time.monotonic() - started, 3),
+    }
+
+    _cache[key] = result
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return dict(result, cached=False)
@@ -0,0 +1,12 @@
+# backend/tests/conftest.py
+"""
+Shared pytest setup: backend modules are imported as top-level modules
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# market_data_service configures a file log handler on import
+os.environ.setdefault("LOG_FILE", os.devnull)
@@ -0,0 +1,95 @@
+# backend/tests/test_api_routing.py
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+import db_router
+import main
+
+
+class FakeRouter:
+    def __init__(self):
+        self.writes = []
+
+    def record_write(self, client_id):
+        self.writes.append(client_id)
+
+
+class FakeConnection:
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=None):
+        pass
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def api(monkeypatch):
+    router = FakeRouter()
+    routes = []
+
+    def get_db_connection(primary=False):
+        routes.append((db_router._request_route.get(), primary))
+        return FakeConnection()
+
+    async def run_simulation(holdings, symbol_values, params, store=None, lookup=None):
+        return {'paths': params['paths']}
+
+    monkeypatch.setattr(main, "_db_router", router)
+    monkeypatch.setattr(main, "get_db_connection", get_db_connection)
+    monkeypatch.setattr(main, "get_security_lookup", lambda cursor: None)
+    monkeypatch.setattr(main, "load_holdings", lambda cursor, lookup: ({'Equities': 1000.0}, {}))
+    monkeypatch.setattr(main, "get_price_store", lambda: None)
+    monkeypatch.setattr(main, "run_simulation", run_simulation)
+    return router, routes
+
+
+def test_simulation_post_is_routed_as_a_read(api):
+    router, routes = api
+    client = TestClient(main.app)
+
+    response = client.post("/api/simulations/monte-carlo", json={"paths": 1000}, headers={"X-Client-Id": "c1"})
+
+    assert response.status_code == 200
+    assert routes == [((True, "c1"), False)]
+    assert router.writes == []
+
+
+@pytest.mark.parametrize("assumption", [[-1.5, 0.1], [-1.0, 0.1], [0.05, -0.1], [0.05]])
+def test_simulation_rejects_invalid_assumptions(api, assumption):
+    router, routes = api
+    client = TestClient(main.app)
+
+    response = client.post("/api/simulations/monte-carlo", json={"assumptions": {"Equities": assumption}})
+
+    assert response.status_code == 400
+    assert routes == []
+
+
+def test_other_posts_pin_the_client_to_the_primary(api):
+    router, routes = api
+    client = TestClient(main.app)
+
+    response = client.post("/api/portfolio/rollups/rebuild", headers={"X-Client-Id": "c1"})
+
+    assert response.status_code == 200
+    assert routes == [((False, "c1"), False)]
+    assert router.writes == ["c1"]
+
+
+def test_shutdown_stops_simulation_workers(monkeypatch):
+    stopped = []
+    monkeypatch.setattr(main, "shutdown_executor", lambda: stopped.append(True))
+
+    with TestClient(main.app):
+        assert stopped == []
+    assert stopped == [True]
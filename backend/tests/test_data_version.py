@@ -0,0 +1,40 @@
+# backend/tests/test_data_version.py
+from data_version import VersionedCache, get_data_version
+
+
+class FakeCursor:
+    def __init__(self, versions):
+        self.versions = versions
+        self.result = []
+
+    def execute(self, query, params=None):
+        self.result = [
+            {'table_name': table, 'version': version}
+            for table, version in self.versions.items() if table in params[0]
+        ]
+
+    def fetchall(self):
+        return self.result
+
+
+def test_get_data_version_orders_and_defaults_missing_tables():
+    cursor = FakeCursor({'positions': 4, 'dividends': 9})
+    assert get_data_version(cursor, ['dividends', 'positions', 'institutions']) == (9, 4, 0)
+
+
+def test_versioned_cache_rebuilds_only_on_change():
+    cursor = FakeCursor({'dividends': 1})
+    cache = VersionedCache(['dividends'])
+    builds = []
+
+    def build(cur):
+        builds.append(cursor.versions['dividends'])
+        return len(builds)
+
+    assert cache.get(cursor, build) == 1
+    assert cache.get(cursor, build) == 1
+
+    cursor.versions['dividends'] = 2
+    assert cache.get(cursor, build) == 2
+    assert cache.get(cursor, build, extra=('tomorrow',)) == 3
+    assert builds == [1, 2, 2]
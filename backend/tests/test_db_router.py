@@ -0,0 +1,121 @@
+# backend/tests/test_db_router.py
+import pytest
+
+pytest.importorskip("psycopg2")
+
+import db_router
+from db_router import DatabaseRouter, begin_request, end_request
+
+
+class FakeConnection:
+    def __init__(self, row):
+        self.row = row
+        self.readonly = False
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchone(self):
+        return self.row
+
+    def rollback(self):
+        pass
+
+    def set_session(self, readonly=False):
+        self.readonly = readonly
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connect(monkeypatch):
+    """Route psycopg2.connect to fake connections keyed by DSN"""
+    nodes = {}
+
+    def fake_connect(dsn, **kwargs):
+        return FakeConnection(nodes[dsn])
+
+    monkeypatch.setattr(db_router.psycopg2, "connect", fake_connect)
+    return nodes
+
+
+def _route(method, client_id="client"):
+    return begin_request(method, client_id)
+
+
+def test_reads_use_caught_up_streaming_replica(connect):
+    connect.update({
+        "primary": {"role": "primary"},
+        "replica": {"in_recovery": True, "streaming": True, "lag_seconds": 0},
+    })
+    router = DatabaseRouter("primary", ["replica"])
+
+    token = _route("GET")
+    try:
+        conn = router.get_connection()
+    finally:
+        end_request(token)
+    assert conn.readonly
+
+
+def test_disconnected_replica_is_treated_as_lagging(connect):
+    # Receive and replay LSNs match, but nothing is arriving from the primary
+    connect.update({
+        "primary": {"role": "primary"},
+        "replica": {"in_recovery": True, "streaming": False, "lag_seconds": 0},
+    })
+    router = DatabaseRouter("primary", ["replica"])
+
+    token = _route("GET")
+    try:
+        conn = router.get_connection()
+    finally:
+        end_request(token)
+    assert not conn.readonly
+    assert router.health()[1]["status"] == "lagging"
+
+
+def test_lagging_replica_falls_back_to_primary(connect):
+    connect.update({
+        "primary": {"role": "primary"},
+        "replica": {"in_recovery": True, "streaming": True, "lag_seconds": 30},
+    })
+    router = DatabaseRouter("primary", ["replica"], max_lag_seconds=5)
+
+    token = _route("GET")
+    try:
+        assert not router.get_connection().readonly
+    finally:
+        end_request(token)
+
+
+def test_writes_and_read_after_write_stay_on_primary(connect):
+    connect.update({
+        "primary": {"role": "primary"},
+        "replica": {"in_recovery": True, "streaming": True, "lag_seconds": 0},
+    })
+    router = DatabaseRouter("primary", ["replica"])
+
+    token = _route("POST")
+    try:
+        assert not router.get_connection().readonly
+    finally:
+        end_request(token)
+
+    router.record_write("client")
+    token = _route("GET")
+    try:
+        assert not router.get_connection().readonly
+    finally:
+        end_request(token)
+
+    token = _route("GET", "other-client")
+    try:
+        assert router.get_connection().readonly
+    finally:
+        end_request(token)
@@ -0,0 +1,77 @@
+# backend/tests/test_dividend_data.py
+import asyncio
+
+import pytest
+
+pytest.importorskip("psycopg2")
+
+from dividend_data import DividendRecord, fetch_symbol_dividends, parse_dividends, upsert_dividends
+
+
+class FakeConnection:
+    encoding = "UTF8"
+
+
+class FakeCursor:
+    """Enough of a psycopg2 cursor for execute_values"""
+
+    connection = FakeConnection()
+
+    def __init__(self):
+        self.statements = []
+        self.rows = []
+
+    def mogrify(self, template, args):
+        self.rows.append(args)
+        return repr(args).encode()
+
+    def execute(self, query, params=None):
+        self.statements.append(query.decode() if isinstance(query, bytes) else query)
+
+
+def test_parse_dividends_cleans_dates_and_skips_incomplete_entries():
+    data = {"historical": [
+        {"date": "2024-05-10", "dividend": 0.25, "recordDate": "", "paymentDate": "2024-05-16", "declarationDate": " "},
+        {"date": "", "dividend": 0.25},
+        {"date": "2024-02-09", "dividend": 0},
+    ]}
+    assert parse_dividends("AAPL", data) == [
+        DividendRecord("AAPL", "2024-05-10", None, "2024-05-16", None, 0.25),
+    ]
+
+
+def test_parse_dividends_handles_empty_response():
+    assert parse_dividends("AAPL", None) == []
+    assert parse_dividends("AAPL", {"symbol": "AAPL"}) == []
+
+
+def test_fetch_symbol_dividends_logs_and_returns_nothing_on_error():
+    class BrokenClient:
+        async def get_json(self, session, endpoint, params=None):
+            raise RuntimeError("boom")
+
+    assert asyncio.run(fetch_symbol_dividends(BrokenClient(), None, "AAPL")) == []
+
+
+def test_upsert_dividends_dedupes_keys_and_skips_unchanged_rows():
+    cursor = FakeCursor()
+    records = [
+        DividendRecord("AAPL", "2024-05-10", None, None, None, 0.24),
+        DividendRecord("AAPL", "2024-05-10", None, "2024-05-16", None, 0.25),
+        DividendRecord("MSFT", "2024-05-15", None, "2024-06-13", None, 0.75),
+    ]
+
+    assert upsert_dividends(cursor, records) == 2
+    assert len(cursor.statements) == 1
+    assert cursor.rows[0] == ("AAPL", "2024-05-10", None, "2024-05-16", None, 0.25, "USD")
+    assert "IS DISTINCT FROM" in cursor.statements[0]
+
+
+def test_upsert_dividends_pages_and_skips_empty_input():
+    cursor = FakeCursor()
+    assert upsert_dividends(cursor, []) == 0
+    assert cursor.statements == []
+
+    records = [DividendRecord("AAPL", f"2024-01-{day:02d}", None, None, None, 0.1) for day in range(1, 6)]
+    upsert_dividends(cursor, records, page_size=2)
+    assert len(cursor.statements) == 3
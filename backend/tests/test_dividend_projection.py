@@ -0,0 +1,94 @@
+# backend/tests/test_dividend_projection.py
+from datetime import date, timedelta
+
+import pandas as pd
+
+from dividend_projection import DEFAULT_PAYMENT_LAG_DAYS, infer_schedules, project_income
+
+
+def _history(symbol, first, gap_days, count, amount=0.5, lag_days=14):
+    rows = []
+    for k in range(count):
+        ex_date = first + timedelta(days=gap_days * k)
+        rows.append({
+            'symbol': symbol,
+            'ex_dividend_date': ex_date,
+            'payment_date': ex_date + timedelta(days=lag_days) if lag_days is not None else None,
+            'dividend_amount': amount,
+        })
+    return rows
+
+
+def test_infer_schedules_frequency_bands():
+    history = pd.DataFrame(
+        _history('MON', date(2024, 1, 5), 30, 12)
+        + _history('QTR', date(2024, 1, 5), 91, 4)
+        + _history('SEMI', date(2023, 1, 5), 182, 3)
+        + _history('ANN', date(2022, 1, 5), 365, 2)
+    )
+    schedules = infer_schedules(history)
+
+    assert schedules.loc['MON', 'frequency'] == 'Monthly'
+    assert schedules.loc['QTR', 'payments_per_year'] == 4
+    assert schedules.loc['SEMI', 'frequency'] == 'Semi-Annual'
+    assert schedules.loc['ANN', 'frequency'] == 'Annual'
+    assert schedules.loc['QTR', 'payment_lag'] == 14
+
+
+def test_infer_schedules_single_payment_and_missing_payment_dates():
+    history = pd.DataFrame(_history('NEW', date(2024, 6, 1), 0, 1, lag_days=None))
+    schedule = infer_schedules(history).loc['NEW']
+
+    assert schedule['frequency'] == 'Annual'
+    assert schedule['payment_lag'] == DEFAULT_PAYMENT_LAG_DAYS
+
+
+def test_infer_schedules_uses_latest_amount():
+    rows = _history('QTR', date(2024, 1, 5), 91, 4)
+    rows[-1]['dividend_amount'] = 0.6
+    assert infer_schedules(pd.DataFrame(rows)).loc['QTR', 'last_amount'] == 0.6
+
+
+def test_project_income_quarterly_holding():
+    holdings = pd.DataFrame([{
+        'account_id': 1,
+        'brokerage': 'Broker',
+        'symbol': 'QTR',
+        'security_name': 'Quarterly Co',
+        'quantity': 100,
+        'cost_basis': 1000,
+        'current_price': 20,
+    }])
+    history = pd.DataFrame(_history('QTR', date(2024, 1, 5), 91, 4))
+    projection = project_income(holdings, history, date(2024, 11, 1))
+
+    assert projection['annual_income'] == 200.0
+    assert sum(month['payments'] for month in projection['calendar']) == 4
+    assert projection['holdings'][0]['yield_on_cost'] == 20.0
+
+
+def test_project_income_drops_suspended_dividends():
+    holdings = pd.DataFrame([{
+        'account_id': 1, 'brokerage': 'Broker', 'symbol': 'QTR', 'security_name': 'Quarterly Co',
+        'quantity': 100, 'cost_basis': 1000, 'current_price': 20,
+    }])
+    history = pd.DataFrame(_history('QTR', date(2022, 1, 5), 91, 4))
+    assert project_income(holdings, history, date(2024, 11, 1))['annual_income'] == 0.0
+
+
+def test_project_income_rolls_up_symbols_across_accounts():
+    holdings = pd.DataFrame([
+        {'account_id': account, 'brokerage': 'Broker', 'symbol': 'QTR', 'security_name': 'Quarterly Co',
+         'quantity': quantity, 'cost_basis': 1000, 'current_price': 20}
+        for account, quantity in ((1, 100), (2, 50))
+    ])
+    history = pd.DataFrame(_history('QTR', date(2024, 1, 5), 91, 4))
+    projection = project_income(holdings, history, date(2024, 11, 1))
+
+    assert projection['symbols'] == [{
+        'symbol': 'QTR',
+        'frequency': 'Quarterly',
+        'annual_income': 300.0,
+        'next_12_months_income': 300.0,
+    }]
+    assert projection['next_12_months_income'] == sum(m['expected_amount'] for m in projection['monthly_totals'])
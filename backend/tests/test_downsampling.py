@@ -0,0 +1,65 @@
+# backend/tests/test_downsampling.py
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from downsampling import align_series, downsample_lttb, downsample_ohlc, lttb_indices
+
+
+def test_align_series_carries_last_valuation_forward():
+    rows = [
+        {'asset_id': 1, 'valuation_date': date(2024, 1, 1), 'value_usd': 100},
+        {'asset_id': 1, 'valuation_date': date(2024, 1, 4), 'value_usd': 130},
+        {'asset_id': 2, 'valuation_date': date(2024, 1, 3), 'value_usd': 50},
+    ]
+    wide = align_series(rows, date(2024, 1, 2), date(2024, 1, 5))
+
+    assert list(wide.index.date) == [date(2024, 1, d) for d in range(2, 6)]
+    assert wide[1].tolist() == [100, 100, 130, 130]
+    # Nothing before the first valuation
+    assert np.isnan(wide[2].iloc[0])
+    assert wide[2].iloc[1:].tolist() == [50, 50, 50]
+
+
+def test_align_series_empty():
+    assert align_series([], date(2024, 1, 1), date(2024, 1, 2)).empty
+
+
+def test_lttb_keeps_endpoints_and_peak():
+    values = np.zeros(1000)
+    values[437] = 100.0
+    idx = lttb_indices(values, 20)
+
+    assert len(idx) == 20
+    assert idx[0] == 0 and idx[-1] == 999
+    assert 437 in idx
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_returns_everything_below_threshold():
+    assert lttb_indices(np.arange(10.0), 50).tolist() == list(range(10))
+
+
+def test_downsample_lttb_samples_all_series_at_same_dates():
+    index = pd.date_range('2024-01-01', periods=500, freq='D')
+    wide = pd.DataFrame({1: np.arange(500.0), 2: np.arange(500.0) * 2}, index=index)
+    sampled = downsample_lttb(wide, 50)
+
+    assert len(sampled['dates']) == 50
+    assert len(sampled['series'][1]) == len(sampled['series'][2]) == 50
+    assert sampled['total'] == [a + b for a, b in zip(sampled['series'][1], sampled['series'][2])]
+
+
+def test_downsample_ohlc_buckets():
+    index = pd.date_range('2024-01-01', periods=8, freq='D')
+    wide = pd.DataFrame({1: [1.0, 5.0, 2.0, 3.0, 4.0, 9.0, 0.0, 6.0]}, index=index)
+    sampled = downsample_ohlc(wide, 2)
+
+    assert sampled['dates'] == [date(2024, 1, 1), date(2024, 1, 5)]
+    assert sampled['series'][1] == {
+        'open': [1.0, 4.0],
+        'high': [5.0, 9.0],
+        'low': [1.0, 0.0],
+        'close': [3.0, 6.0],
+    }
@@ -0,0 +1,181 @@
+# backend/tests/test_market_data_service.py
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("psycopg2")
+
+import market_data_service
+from market_data_service import ExchangeRate, MarketDataService, SecurityPrice
+
+
+class FakeCursor:
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, query, params=None):
+        self.executed.append(query)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.cursor_ = FakeCursor()
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    def cursor(self):
+        return self.cursor_
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeDatabaseManager:
+    def __init__(self, symbols, fail_price_write=False, write_delay=0.0):
+        self.symbols = symbols
+        self.fail_price_write = fail_price_write
+        self.write_delay = write_delay
+        self.conn = FakeConnection()
+        self.price_batches = []
+        self.rate_batches = []
+
+    def get_active_symbols(self):
+        return self.symbols
+
+    def get_connection(self):
+        return self.conn
+
+    def upsert_market_prices(self, cursor, prices):
+        time.sleep(self.write_delay)
+        if self.fail_price_write:
+            raise RuntimeError("write failed")
+        self.price_batches.append([p.symbol for p in prices])
+        return len(prices)
+
+    def upsert_exchange_rates(self, cursor, rates):
+        self.rate_batches.append([r.to_currency for r in rates])
+        return len(rates)
+
+    def reprice_positions(self, cursor):
+        return 7
+
+
+def price(symbol):
+    return SecurityPrice(symbol=symbol, price=10.0, currency='USD', date='2026-10-16')
+
+
+def make_service(db, fetch_price, fetch_rate=None):
+    async def no_rate(session, currency):
+        return None
+
+    service = MarketDataService("key", db)
+    service._fetch_single_price = fetch_price
+    service._fetch_single_rate = fetch_rate or no_rate
+    return service
+
+
+def run_update(service, **kwargs):
+    # A hung pipeline fails the test instead of blocking the suite
+    return asyncio.run(asyncio.wait_for(service.update_all_market_data(**kwargs), timeout=5))
+
+
+def test_write_results_batches_by_kind_until_sentinel(monkeypatch):
+    monkeypatch.setattr(market_data_service, "WRITE_BATCH_SIZE", 2)
+    db = FakeDatabaseManager([])
+    service = make_service(db, None)
+
+    async def run():
+        queue = asyncio.Queue()
+        for item in [
+            ('price', [price('AAPL')]),
+            ('fx', [ExchangeRate('USD', 'EUR', 0.9, '2026-10-16')]),
+            ('price', [price('MSFT')]),
+            ('price', [price('GOOG')]),
+            None,
+            ('price', [price('LATE')]),
+        ]:
+            queue.put_nowait(item)
+        return await service._write_results(queue, FakeCursor())
+
+    written = asyncio.run(run())
+
+    assert written == {'price': 3, 'fx': 1, 'dividend': 0}
+    assert db.price_batches == [['AAPL'], ['MSFT', 'GOOG']]
+    assert db.rate_batches == [['EUR']]
+
+
+def test_writes_stream_while_fetches_are_in_flight():
+    db = FakeDatabaseManager(['AAPL', 'SLOW'])
+
+    async def fetch_price(session, symbol):
+        if symbol == 'SLOW':
+            # Only completes once the first price has been written
+            while not db.price_batches:
+                await asyncio.sleep(0.01)
+        return price(symbol)
+
+    written = run_update(make_service(db, fetch_price), include_dividends=False)
+
+    assert db.price_batches == [['AAPL'], ['SLOW']]
+    assert written['price'] == 2
+    assert written['positions'] == 7
+
+
+def test_successful_update_commits_once():
+    db = FakeDatabaseManager(['AAPL', 'MSFT'])
+
+    async def fetch_price(session, symbol):
+        return price(symbol)
+
+    async def fetch_rate(session, currency):
+        return ExchangeRate('USD', currency, 1.5, '2026-10-16')
+
+    run_update(make_service(db, fetch_price, fetch_rate), include_dividends=False)
+
+    assert db.conn.commits == 1
+    assert db.conn.rollbacks == 0
+    assert db.conn.closed
+    assert "SELECT refresh_net_worth_view()" in db.conn.cursor_.executed
+    assert sorted(c for batch in db.rate_batches for c in batch) == sorted(market_data_service.FX_CURRENCIES)
+
+
+def test_writer_failure_with_full_queue_rolls_back(monkeypatch):
+    # Queue of one: the second result fills it while the first write fails,
+    # so the sentinel put could never complete
+    monkeypatch.setattr(market_data_service, "PIPELINE_QUEUE_SIZE", 1)
+    db = FakeDatabaseManager(['AAPL', 'MSFT'], fail_price_write=True, write_delay=0.05)
+
+    async def fetch_price(session, symbol):
+        return price(symbol)
+
+    with pytest.raises(RuntimeError, match="write failed"):
+        run_update(make_service(db, fetch_price), include_dividends=False)
+
+    assert db.conn.commits == 0
+    assert db.conn.rollbacks == 1
+    assert db.conn.closed
+
+
+def test_producer_failure_rolls_back_and_stops_the_writer():
+    db = FakeDatabaseManager(['AAPL', 'BROKEN'])
+
+    async def fetch_price(session, symbol):
+        if symbol == 'BROKEN':
+            raise ValueError("provider exploded")
+        return price(symbol)
+
+    with pytest.raises(ValueError, match="provider exploded"):
+        run_update(make_service(db, fetch_price), include_dividends=False)
+
+    assert db.conn.commits == 0
+    assert db.conn.rollbacks == 1
+    assert db.conn.closed
@@ -0,0 +1,147 @@
+# backend/tests/test_price_store.py
+import csv
+import os
+import re
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+import price_store
+from price_store import KEEP_GENERATIONS, LOCK_FILE, PriceStore, build
+
+
+class FakeCursor:
+    """market_prices in memory, served through mogrify + COPY like psycopg2"""
+
+    def __init__(self):
+        self.rows = []
+        self.copied = []
+
+    def add(self, symbol, price_date, price, created_at):
+        self.rows.append((symbol, price_date, price, created_at))
+
+    def mogrify(self, query, params):
+        return query.replace("%s", f"'{params[0].isoformat()}'").encode()
+
+    def copy_expert(self, sql, buffer):
+        match = re.search(r"created_at > '([^']+)'", sql)
+        since = datetime.fromisoformat(match.group(1)) if match else None
+        rows = [row for row in self.rows if since is None or row[3] > since]
+        self.copied.append(len(rows))
+        writer = csv.writer(buffer)
+        for symbol, price_date, price, created_at in rows:
+            writer.writerow([symbol, price_date.isoformat(), price, created_at.isoformat()])
+
+
+def _prices(store, symbol):
+    return store.window([symbol])[symbol].tolist()
+
+
+def test_full_build_and_window(tmp_path):
+    cursor = FakeCursor()
+    cursor.add("AAPL", date(2024, 1, 2), 185.0, datetime(2024, 1, 2, 22))
+    cursor.add("AAPL", date(2024, 1, 3), 184.0, datetime(2024, 1, 3, 22))
+    cursor.add("MSFT", date(2024, 1, 3), 370.0, datetime(2024, 1, 3, 22))
+
+    store = build(cursor, str(tmp_path))
+
+    assert store.symbols.tolist() == ["AAPL", "MSFT"]
+    assert _prices(store, "AAPL") == [185.0, 184.0]
+    assert np.isnan(_prices(store, "MSFT")[0])
+    assert store.window(["AAPL", "NOPE"], start=date(2024, 1, 3)).shape == (1, 1)
+    assert not os.path.exists(tmp_path / LOCK_FILE)
+
+
+def test_incremental_build_reads_only_the_delta_and_grows_axes(tmp_path):
+    cursor = FakeCursor()
+    for day in range(1, 11):
+        cursor.add("AAPL", date(2024, 1, day), 100.0 + day, datetime(2024, 1, day, 22))
+    first = build(cursor, str(tmp_path))
+
+    cursor.add("AAPL", date(2024, 1, 11), 111.0, datetime(2024, 1, 11, 22))
+    cursor.add("NVDA", date(2024, 1, 11), 500.0, datetime(2024, 1, 11, 22))
+    second = build(cursor, str(tmp_path))
+
+    # The delta plus the last row inside WATERMARK_OVERLAP
+    assert cursor.copied == [10, 3]
+    assert second.generation != first.generation
+    assert second.symbols.tolist() == ["AAPL", "NVDA"]
+    assert _prices(second, "AAPL") == [100.0 + day for day in range(1, 12)]
+    assert _prices(second, "NVDA")[-1] == 500.0
+    assert second.meta["watermark"] == datetime(2024, 1, 11, 22).isoformat()
+
+
+def test_late_commit_inside_overlap_is_picked_up(tmp_path):
+    cursor = FakeCursor()
+    cursor.add("AAPL", date(2024, 1, 2), 185.0, datetime(2024, 1, 2, 22))
+    build(cursor, str(tmp_path))
+
+    # Stamped before the watermark, committed after the previous build
+    cursor.add("AAPL", date(2024, 1, 2), 186.0, datetime(2024, 1, 2, 21, 30))
+    cursor.add("AAPL", date(2024, 1, 1), 180.0, datetime(2024, 1, 2, 21, 45))
+    store = build(cursor, str(tmp_path))
+
+    # Same key re-read: the later created_at still wins
+    assert _prices(store, "AAPL") == [180.0, 185.0]
+    assert store.meta["watermark"] == datetime(2024, 1, 2, 22).isoformat()
+
+
+def test_full_rebuild_and_generation_pruning(tmp_path):
+    cursor = FakeCursor()
+    cursor.add("AAPL", date(2024, 1, 2), 185.0, datetime(2024, 1, 2, 22))
+    for _ in range(KEEP_GENERATIONS + 2):
+        build(cursor, str(tmp_path))
+    store = build(cursor, str(tmp_path), full=True)
+
+    generations = [name for name in os.listdir(tmp_path) if name.startswith("gen-")]
+    assert len(generations) == KEEP_GENERATIONS
+    assert store.generation in generations
+    assert cursor.copied[-1] == 1
+    assert PriceStore.open(str(tmp_path)).generation == store.generation
+
+
+def test_open_without_a_build(tmp_path):
+    assert PriceStore.open(str(tmp_path)) is None
+
+
+def test_stale_lock_is_taken_over(tmp_path):
+    lock = tmp_path / LOCK_FILE
+    lock.write_text("12345")
+    old = time.time() - price_store.LOCK_STALE_SECONDS - 60
+    os.utime(lock, (old, old))
+
+    cursor = FakeCursor()
+    cursor.add("AAPL", date(2024, 1, 2), 185.0, datetime(2024, 1, 2, 22))
+    assert build(cursor, str(tmp_path)) is not None
+    assert not lock.exists()
+
+
+def test_live_lock_blocks_the_builder(tmp_path, monkeypatch):
+    (tmp_path / LOCK_FILE).write_text("12345")
+
+    def give_up(seconds):
+        raise TimeoutError
+
+    monkeypatch.setattr(price_store.time, "sleep", give_up)
+    with pytest.raises(TimeoutError):
+        build(FakeCursor(), str(tmp_path))
+    # Someone else's lock is left alone
+    assert (tmp_path / LOCK_FILE).exists()
+
+
+def test_last_before_skips_gaps_and_unknown_symbols(tmp_path):
+    cursor = FakeCursor()
+    cursor.add("AAPL", date(2024, 1, 2), 185.0, datetime(2024, 1, 2, 22))
+    cursor.add("MSFT", date(2024, 1, 3), 370.0, datetime(2024, 1, 3, 22))
+    cursor.add("NVDA", date(2024, 1, 5), 500.0, datetime(2024, 1, 5, 22))
+    store = build(cursor, str(tmp_path))
+
+    seed = store.last_before(["AAPL", "MSFT", "NVDA", "NOPE"], date(2024, 1, 5))
+
+    assert seed.index.tolist() == ["AAPL", "MSFT", "NVDA"]
+    assert seed["AAPL"] == 185.0
+    assert seed["MSFT"] == 370.0
+    assert np.isnan(seed["NVDA"])
+    assert store.last_before(["AAPL"], date(2024, 1, 1)).isna().all()
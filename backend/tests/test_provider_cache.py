@@ -0,0 +1,146 @@
+# backend/tests/test_provider_cache.py
+import asyncio
+
+import pytest
+
+from provider_cache import MODE_CACHE, MODE_OFF, MODE_RECORD, MODE_REPLAY, CacheMiss, ProviderCache
+
+
+@pytest.fixture
+def record_then_replay(tmp_path):
+    """Record responses into a tmpdir cache, then reopen the same directory in replay mode"""
+    recorder = ProviderCache(str(tmp_path), mode=MODE_RECORD)
+
+    def replay(entries):
+        for endpoint, params, data in entries:
+            recorder.put(endpoint, params, data)
+        recorder.close()
+        return ProviderCache(str(tmp_path), mode=MODE_REPLAY)
+
+    return replay
+
+
+def test_replay_serves_recorded_responses_regardless_of_age(record_then_replay, monkeypatch):
+    cache = record_then_replay([("quote-short/AAPL", None, [{"symbol": "AAPL", "price": 190.5}])])
+    # Far past the 30s quote TTL
+    monkeypatch.setattr("provider_cache.time.time", lambda: 4_000_000_000)
+
+    assert cache.get("quote-short/AAPL") == [{"symbol": "AAPL", "price": 190.5}]
+
+
+def test_replay_raises_on_unrecorded_request(record_then_replay):
+    cache = record_then_replay([])
+    with pytest.raises(CacheMiss):
+        cache.get("quote-short/MSFT")
+
+
+def test_replay_never_writes(record_then_replay):
+    cache = record_then_replay([])
+    cache.put("quote-short/MSFT", None, [{"price": 1}])
+    assert cache.stats()["entries"] == 0
+
+
+def test_key_ignores_api_key_and_param_order():
+    a, _ = ProviderCache.make_key("fx", {"apikey": "one", "from": "EUR", "to": "USD"})
+    b, _ = ProviderCache.make_key("fx", {"to": "USD", "from": "EUR", "apikey": "two"})
+    assert a == b
+
+
+def test_cache_mode_expires_by_longest_prefix_ttl(tmp_path, monkeypatch):
+    cache = ProviderCache(str(tmp_path), mode=MODE_CACHE)
+    now = [1_000_000.0]
+    monkeypatch.setattr("provider_cache.time.time", lambda: now[0])
+
+    cache.put("historical-price-full/stock_dividend/AAPL", None, {"historical": []})
+    cache.put("historical-price-full/AAPL", None, {"historical": []})
+    assert cache.ttl_for("historical-price-full/stock_dividend/AAPL") == 24 * 3600
+
+    now[0] += 13 * 3600
+    assert cache.get("historical-price-full/stock_dividend/AAPL") == {"historical": []}
+    assert cache.get("historical-price-full/AAPL") is None
+
+
+def test_off_mode_neither_reads_nor_writes(tmp_path):
+    cache = ProviderCache(str(tmp_path), mode=MODE_OFF)
+    cache.put("quote-short/AAPL", None, [1])
+    assert cache.get("quote-short/AAPL") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_eviction_keeps_most_recently_used(tmp_path, monkeypatch):
+    cache = ProviderCache(str(tmp_path), mode=MODE_CACHE, max_bytes=350)
+    now = [1_000_000.0]
+    monkeypatch.setattr("provider_cache.time.time", lambda: now[0])
+
+    for symbol in ("A", "B", "C"):
+        now[0] += 1
+        cache.put(f"profile/{symbol}", None, "x" * 98)
+    now[0] += 1
+    cache.get("profile/A")
+    now[0] += 1
+    cache.put("profile/D", None, "x" * 98)
+
+    assert cache.stats()["bytes"] <= 350
+    assert cache.get("profile/A") is not None
+    assert cache.get("profile/B") is None
+
+
+def test_unknown_mode_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ProviderCache(str(tmp_path), mode="sometimes")
+
+
+class FailingSession:
+    """Any network access in replay mode is a bug"""
+
+    def get(self, *args, **kwargs):
+        raise AssertionError("replay mode must not hit the provider")
+
+
+def test_fmp_client_replays_without_network(record_then_replay):
+    pytest.importorskip("aiohttp")
+    from fmp_client import FMPClient
+
+    cache = record_then_replay([
+        ("profile/AAPL,MSFT", None, [{"symbol": "AAPL", "isEtf": False}, {"symbol": "MSFT", "isEtf": False}]),
+    ])
+    client = FMPClient("", cache)
+
+    data = asyncio.run(client.get_json(FailingSession(), "profile/AAPL,MSFT"))
+    assert [profile["symbol"] for profile in data] == ["AAPL", "MSFT"]
+
+    with pytest.raises(CacheMiss):
+        asyncio.run(client.get_json(FailingSession(), "profile/GOOG"))
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+
+    def fetchall(self):
+        return self.rows
+
+
+def test_metadata_sync_replays_profiles_for_stale_symbols(record_then_replay):
+    pytest.importorskip("aiohttp")
+    pytest.importorskip("psycopg2")
+    from metadata_sync import SecurityMetadataSync, profile_security_type
+
+    cache = record_then_replay([
+        ("profile/SPY,VTSAX", None, [
+            {"symbol": "SPY", "isEtf": True},
+            {"symbol": "VTSAX", "isEtf": False, "isFund": True},
+        ]),
+    ])
+    sync = SecurityMetadataSync("", db_manager=None, cache=cache)
+
+    cursor = FakeCursor([{"symbol": "SPY"}, {"symbol": "VTSAX"}])
+    symbols = sync.find_symbols_to_sync(cursor, ["spy"])
+    assert cursor.executed[0][1][1] == ["SPY"]
+
+    profiles = asyncio.run(sync.fetch_profiles(symbols))
+    assert [profile_security_type(p) for p in profiles] == ["ETF", "Mutual Fund"]
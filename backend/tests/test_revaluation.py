@@ -0,0 +1,172 @@
+# backend/tests/test_revaluation.py
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import main
+
+
+class FakeCursor:
+    """Answers the revaluation UPDATE as if assets without an FX rate were not matched"""
+
+    def __init__(self, assets, fx_currencies=("USD", "EUR")):
+        self.assets = assets
+        self.fx_currencies = set(fx_currencies)
+        self.executed = []
+        self.rows = []
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+        asset_ids, values, is_api = params
+        latest = dict(zip(asset_ids, values))
+        self.rows = [
+            {'asset_id': asset_id, 'base_currency': self.assets[asset_id], 'current_value_original': value}
+            for asset_id, value in sorted(latest.items())
+            if asset_id in self.assets and self.assets[asset_id] in self.fx_currencies
+        ]
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def api(monkeypatch):
+    cursor = FakeCursor({1: 'USD', 2: 'EUR', 3: 'GBP'})
+    connections = []
+
+    def get_db_connection(primary=False):
+        connections.append(FakeConnection(cursor))
+        return connections[-1]
+
+    monkeypatch.setattr(main, "_db_router", None)
+    monkeypatch.setattr(main, "get_db_connection", get_db_connection)
+    return TestClient(main.app), cursor, connections
+
+
+def test_revaluations_are_applied_in_one_statement():
+    cursor = FakeCursor({1: 'USD', 2: 'EUR'})
+    revaluations = [
+        main.AssetRevaluation(asset_id=1, value_original=Decimal('100')),
+        main.AssetRevaluation(asset_id=2, value_original=Decimal('250.5'), valuation_method='api'),
+    ]
+
+    result = main.apply_revaluations(FakeConnection(cursor), revaluations)
+
+    assert len(cursor.executed) == 1
+    query, params = cursor.executed[0]
+    assert 'UPDATE assets' in query
+    assert params == ([1, 2], [Decimal('100'), Decimal('250.5')], [False, True])
+    assert result['updated_count'] == 2
+    assert result['skipped_asset_ids'] == []
+
+
+def test_fx_cte_uses_latest_positive_usd_rates_and_identity_for_usd():
+    cursor = FakeCursor({1: 'USD'})
+    main.apply_revaluations(FakeConnection(cursor), [main.AssetRevaluation(asset_id=1, value_original=Decimal('1'))])
+
+    query = cursor.executed[0][0]
+    assert "WHERE from_currency = 'USD' AND rate > 0" in query
+    assert "ORDER BY to_currency, rate_date DESC" in query
+    assert "SELECT 'USD', 1" in query
+    assert "ROUND(v.value_original / fx.rate, 4)" in query
+
+
+def test_assets_without_fx_rate_or_unknown_are_skipped():
+    cursor = FakeCursor({1: 'USD', 3: 'GBP'})
+    revaluations = [
+        main.AssetRevaluation(asset_id=asset_id, value_original=Decimal('10'))
+        for asset_id in (1, 3, 99)
+    ]
+
+    result = main.apply_revaluations(FakeConnection(cursor), revaluations)
+
+    assert result['updated_count'] == 1
+    assert result['skipped_asset_ids'] == [3, 99]
+
+
+def test_unknown_valuation_method_is_rejected():
+    cursor = FakeCursor({1: 'USD'})
+    with pytest.raises(HTTPException) as exc:
+        main.apply_revaluations(
+            FakeConnection(cursor),
+            [main.AssetRevaluation(asset_id=1, value_original=Decimal('1'), valuation_method='Guess')],
+        )
+
+    assert exc.value.status_code == 400
+    assert cursor.executed == []
+
+
+def test_revalue_commits_once(api):
+    client, cursor, connections = api
+
+    response = client.post("/api/assets/revalue", json=[
+        {"asset_id": 1, "value_original": 100},
+        {"asset_id": 2, "value_original": "250.50"},
+    ])
+
+    assert response.status_code == 200
+    assert response.json()['updated_count'] == 2
+    assert len(cursor.executed) == 1
+    assert connections[0].commits == 1
+    assert connections[0].closed
+
+
+@pytest.mark.parametrize("value", ["NaN", "Infinity", "-Infinity", -1, "-0.01"])
+def test_revalue_rejects_non_finite_and_negative_values(api, value):
+    client, cursor, connections = api
+
+    response = client.post("/api/assets/revalue", json=[{"asset_id": 1, "value_original": value}])
+
+    assert response.status_code == 422
+    assert cursor.executed == []
+    assert connections == []
+
+
+def test_revalue_csv_reports_every_bad_row(api):
+    client, cursor, connections = api
+    content = "asset_id,value_original\n1,100\n2,NaN\nx,5\n3,-4\n"
+
+    response = client.post("/api/assets/revalue/csv", files={"file": ("values.csv", content, "text/csv")})
+
+    assert response.status_code == 400
+    rows = response.json()['detail']['rows']
+    assert [r['row'] for r in rows] == [3, 4, 5]
+    assert cursor.executed == []
+    assert connections == []
+
+
+def test_revalue_csv_applies_valid_file(api):
+    client, cursor, connections = api
+    content = "asset_id,value_original,valuation_method\n1,100,Manual\n2,0,API\n"
+
+    response = client.post("/api/assets/revalue/csv", files={"file": ("values.csv", content, "text/csv")})
+
+    assert response.status_code == 200
+    assert cursor.executed[0][1] == ([1, 2], [Decimal('100'), Decimal('0')], [False, True])
+    assert connections[0].commits == 1
@@ -0,0 +1,73 @@
+# backend/tests/test_security_metadata.py
+import pytest
+
+import security_metadata
+from security_metadata import FALLBACK_ASSET_CLASS, SecurityLookup, get_security_lookup
+
+TYPE_CLASSES = {'Stock': 'Equities', 'ETF': 'Equities', 'Bond': 'Fixed Income'}
+
+
+def _security(symbol, security_type, sector=None):
+    return {'symbol': symbol, 'security_type': security_type, 'sector': sector}
+
+
+def test_lookup_resolves_asset_classes_with_fallback():
+    lookup = SecurityLookup(
+        {'AAPL': _security('AAPL', 'Stock', 'Technology'), 'VTSAX': _security('VTSAX', 'Mutual Fund')},
+        TYPE_CLASSES,
+    )
+
+    assert lookup.asset_class('AAPL') == 'Equities'
+    # Funds stay unmapped, as in the original CASE expression
+    assert lookup.asset_class('VTSAX') == FALLBACK_ASSET_CLASS
+    assert lookup.asset_class('UNKNOWN') == FALLBACK_ASSET_CLASS
+    assert lookup.annotate([{'symbol': 'AAPL'}]) == [
+        {'symbol': 'AAPL', 'sector': 'Technology', 'asset_class': 'Equities'},
+    ]
+
+
+class FakeCursor:
+    """Answers the version and load queries from in-memory tables"""
+
+    def __init__(self, securities, type_classes):
+        self.securities = securities
+        self.type_classes = type_classes
+        self.versions = {'securities_master': 1, 'security_type_asset_classes': 1}
+        self.loads = 0
+        self.result = None
+
+    def execute(self, query, params=None):
+        if 'FROM data_versions' in query:
+            self.result = [{'table_name': t, 'version': v} for t, v in self.versions.items()]
+        elif 'FROM security_type_asset_classes' in query:
+            self.loads += 1
+            self.result = [{'security_type': t, 'asset_class': c} for t, c in self.type_classes.items()]
+        else:
+            self.result = [dict(row) for row in self.securities]
+
+    def fetchone(self):
+        return self.result[0]
+
+    def fetchall(self):
+        return self.result
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    security_metadata._cache.clear()
+    yield
+    security_metadata._cache.clear()
+
+
+def test_lookup_reloads_only_when_the_fingerprint_changes():
+    cursor = FakeCursor([_security('XYZ', 'Stock')], dict(TYPE_CLASSES))
+
+    assert get_security_lookup(cursor).asset_class('XYZ') == 'Equities'
+    get_security_lookup(cursor)
+    assert cursor.loads == 1
+
+    # Any write statement, including a manual UPDATE, bumps the table's version
+    cursor.securities[0]['security_type'] = 'Bond'
+    cursor.versions['securities_master'] += 1
+    assert get_security_lookup(cursor).asset_class('XYZ') == 'Fixed Income'
+    assert cursor.loads == 2
@@ -0,0 +1,92 @@
+# backend/tests/test_simulation.py
+import asyncio
+
+import numpy as np
+import pytest
+
+import simulation
+from simulation import cash_flow_schedule, run_simulation, simulate_batch
+
+
+def test_cash_flow_schedule_monthly_amounts_growth_and_window():
+    schedule = cash_flow_schedule([
+        {'annual_amount': 12000, 'growth': 0.10},
+        {'annual_amount': -2400, 'start_year': 1, 'end_year': 2},
+    ], 36)
+
+    assert schedule[0] == pytest.approx(1000)
+    assert schedule[12] == pytest.approx(1100 - 200)
+    assert schedule[24] == pytest.approx(1210)
+
+
+def _batch(paths=500, months=120, **overrides):
+    args = dict(
+        seed=7,
+        paths=paths,
+        initial=np.array([60000.0, 40000.0]),
+        target=np.array([0.6, 0.4]),
+        flows=np.zeros(months),
+        rebalance_every=12,
+        history=None,
+        bootstrap_mask=np.array([False, False]),
+        mu=np.array([0.07, 0.03]),
+        sigma=np.array([0.16, 0.06]),
+    )
+    args.update(overrides)
+    return simulate_batch(**args)
+
+
+def test_simulate_batch_shape_and_reproducibility():
+    totals, depleted = _batch()
+
+    assert totals.shape == (500, 11)
+    assert totals.dtype == np.float32
+    assert np.all(totals[:, 0] == 100000)
+    assert not depleted.any()
+    np.testing.assert_array_equal(totals, _batch()[0])
+
+
+def test_simulate_batch_zero_volatility_compounds_expected_return():
+    totals, _ = _batch(paths=10, months=24, sigma=np.zeros(2), mu=np.array([0.05, 0.05]))
+    np.testing.assert_allclose(totals[:, 2], 100000 * 1.05 ** 2, rtol=1e-5)
+
+
+def test_simulate_batch_flags_depleted_paths():
+    totals, depleted = _batch(paths=50, months=60, flows=np.full(60, -5000.0))
+    assert depleted.all()
+    assert np.all(totals[:, -1] == 0)
+
+
+def test_simulate_batch_bootstraps_history_months():
+    # Every historical month returns exactly +1% for both classes
+    history = np.full((36, 2), 0.01)
+    totals, _ = _batch(paths=20, months=12, history=history, bootstrap_mask=np.array([True, True]))
+    np.testing.assert_allclose(totals[:, 1], 100000 * 1.01 ** 12, rtol=1e-5)
+
+
+def test_run_simulation_caches_by_inputs(monkeypatch):
+    # Run batches in-process instead of spawning the worker pool
+    async def run_inline(executor, fn, *args):
+        return fn(*args)
+
+    async def run():
+        monkeypatch.setattr(asyncio.get_running_loop(), "run_in_executor", run_inline)
+        params = {'years': 5, 'paths': 1000, 'method': 'parametric', 'rebalance': 'annual'}
+        first = await run_simulation({'Equities': 1000.0}, {}, params)
+        second = await run_simulation({'Equities': 1000.0}, {}, params)
+        return first, second
+
+    monkeypatch.setattr(simulation, "get_executor", lambda: None)
+    simulation._cache.clear()
+    first, second = asyncio.run(run())
+
+    assert not first['cached'] and second['cached']
+    assert set(first['percentiles']) == {'p5', 'p25', 'p50', 'p75', 'p95'}
+    assert first['allocation'][0]['returns'] == 'parametric'
+
+
+def test_shutdown_executor_is_idempotent():
+    simulation.get_executor()
+    simulation.shutdown_executor()
+    assert simulation._executor is None
+    simulation.shutdown_executor()
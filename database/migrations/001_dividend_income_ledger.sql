@@ -0,0 +1,340 @@
+-- Migration: 001_dividend_income_ledger
+-- Date: 2026-10-18
+-- Author: Treviwise Contributors
+--
+-- Materialized per-account dividend income. Each row is the quantity an
+-- account held going into an ex-dividend date times the dividend amount.
+-- Holdings are rebuilt from transactions; accounts with no transactions for
+-- a symbol fall back to the current position quantity, but only for
+-- dividends going ex after the position's held_since date. Earlier dividends
+-- for those holdings cannot be attributed and are listed in
+-- unattributed_dividends instead of being credited at today's quantity.
+-- Triggers keep the ledger up to date for just the dividends, accounts and
+-- symbols that changed.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS schema_versions (
+    version VARCHAR(10) PRIMARY KEY,
+    description TEXT,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Share movement for a transaction row (dividends, fees etc. don't move shares)
+CREATE OR REPLACE FUNCTION transaction_share_delta(
+    p_transaction_type VARCHAR,
+    p_quantity NUMERIC
+)
+RETURNS NUMERIC AS $$
+    SELECT CASE UPPER(p_transaction_type)
+        WHEN 'BUY' THEN ABS(COALESCE(p_quantity, 0))
+        WHEN 'REINVEST' THEN ABS(COALESCE(p_quantity, 0))
+        WHEN 'TRANSFER_IN' THEN ABS(COALESCE(p_quantity, 0))
+        WHEN 'SPLIT' THEN COALESCE(p_quantity, 0)
+        WHEN 'SELL' THEN -ABS(COALESCE(p_quantity, 0))
+        WHEN 'TRANSFER_OUT' THEN -ABS(COALESCE(p_quantity, 0))
+        ELSE 0
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE TABLE IF NOT EXISTS dividend_income_ledger (
+    account_id INTEGER NOT NULL REFERENCES investment_accounts(account_id),
+    symbol VARCHAR(20) NOT NULL REFERENCES securities_master(symbol),
+    ex_dividend_date DATE NOT NULL,
+    payment_date DATE,
+    income_date DATE NOT NULL,  -- payment date, or ex-date when the payment date is unknown
+    dividend_amount NUMERIC(12,6) NOT NULL,
+    quantity_held NUMERIC(15,6) NOT NULL,
+    income_amount NUMERIC(15,4) NOT NULL,
+    currency VARCHAR(3),
+    quantity_source VARCHAR(20) NOT NULL,  -- 'Transactions' or 'Current Position'
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (account_id, symbol, ex_dividend_date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_dividend_ledger_income_date ON dividend_income_ledger(income_date);
+CREATE INDEX IF NOT EXISTS idx_dividend_ledger_account_income_date ON dividend_income_ledger(account_id, income_date);
+CREATE INDEX IF NOT EXISTS idx_dividend_ledger_symbol_exdate ON dividend_income_ledger(symbol, ex_dividend_date);
+
+-- First date a position is known to be held. Existing rows stay NULL (unknown);
+-- new rows and positions reopened from zero start today.
+ALTER TABLE positions ADD COLUMN IF NOT EXISTS held_since DATE;
+ALTER TABLE positions ALTER COLUMN held_since SET DEFAULT CURRENT_DATE;
+
+CREATE OR REPLACE FUNCTION set_position_held_since()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.held_since := CURRENT_DATE;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS position_reopened_held_since ON positions;
+CREATE TRIGGER position_reopened_held_since
+    BEFORE UPDATE OF quantity ON positions
+    FOR EACH ROW
+    WHEN (OLD.quantity <= 0 AND NEW.quantity > 0)
+    EXECUTE FUNCTION set_position_held_since();
+
+-- As-of lookups: holdings of one symbol in one account before a date
+CREATE INDEX IF NOT EXISTS idx_transactions_account_symbol_date ON transactions(account_id, symbol, transaction_date);
+
+-- Every (dividend, account) entitlement, computed on demand. Callers always
+-- filter by symbol/ex-date or account so only the affected slice is evaluated.
+CREATE OR REPLACE VIEW dividend_entitlements AS
+SELECT
+    h.account_id,
+    d.symbol,
+    d.ex_dividend_date,
+    d.payment_date,
+    COALESCE(d.payment_date, d.ex_dividend_date) AS income_date,
+    d.dividend_amount,
+    q.quantity_held,
+    ROUND(q.quantity_held * d.dividend_amount, 4) AS income_amount,
+    d.currency,
+    CASE WHEN src.has_transactions THEN 'Transactions' ELSE 'Current Position' END AS quantity_source
+FROM dividends d
+JOIN (
+    SELECT account_id, symbol FROM transactions WHERE symbol IS NOT NULL
+    UNION
+    SELECT account_id, symbol FROM positions WHERE symbol IS NOT NULL
+) h ON h.symbol = d.symbol
+CROSS JOIN LATERAL (
+    SELECT EXISTS (
+        SELECT 1 FROM transactions t
+        WHERE t.account_id = h.account_id AND t.symbol = d.symbol
+    ) AS has_transactions
+) src
+CROSS JOIN LATERAL (
+    SELECT CASE
+        WHEN src.has_transactions THEN (
+            SELECT COALESCE(SUM(transaction_share_delta(t.transaction_type, t.quantity)), 0)
+            FROM transactions t
+            WHERE t.account_id = h.account_id
+            AND t.symbol = d.symbol
+            AND t.transaction_date < d.ex_dividend_date
+        )
+        -- No history: today's quantity, and only for dividends since it was held
+        ELSE (
+            SELECT COALESCE(SUM(p.quantity), 0)
+            FROM positions p
+            WHERE p.account_id = h.account_id AND p.symbol = d.symbol
+            AND p.held_since < d.ex_dividend_date
+        )
+    END AS quantity_held
+) q
+WHERE q.quantity_held > 0;
+
+-- Dividends on holdings without transactions that went ex before the position
+-- was known to be held (or with held_since unknown); not credited in the ledger
+CREATE OR REPLACE VIEW unattributed_dividends AS
+SELECT
+    p.account_id,
+    d.symbol,
+    d.ex_dividend_date,
+    d.payment_date,
+    d.dividend_amount,
+    p.quantity AS current_quantity,
+    p.held_since
+FROM positions p
+JOIN dividends d ON d.symbol = p.symbol
+WHERE p.quantity > 0
+AND (p.held_since IS NULL OR d.ex_dividend_date <= p.held_since)
+AND NOT EXISTS (
+    SELECT 1 FROM transactions t
+    WHERE t.account_id = p.account_id AND t.symbol = p.symbol
+);
+
+-- Recompute the ledger slice matching the given filters (all NULL = full rebuild)
+CREATE OR REPLACE FUNCTION refresh_dividend_ledger(
+    p_account_id INTEGER DEFAULT NULL,
+    p_symbol VARCHAR DEFAULT NULL,
+    p_ex_dividend_date DATE DEFAULT NULL
+)
+RETURNS INTEGER AS $$
+DECLARE
+    rows_written INTEGER;
+BEGIN
+    DELETE FROM dividend_income_ledger l
+    WHERE (p_account_id IS NULL OR l.account_id = p_account_id)
+    AND (p_symbol IS NULL OR l.symbol = p_symbol)
+    AND (p_ex_dividend_date IS NULL OR l.ex_dividend_date = p_ex_dividend_date);
+
+    INSERT INTO dividend_income_ledger (
+        account_id, symbol, ex_dividend_date, payment_date, income_date,
+        dividend_amount, quantity_held, income_amount, currency, quantity_source
+    )
+    SELECT
+        e.account_id, e.symbol, e.ex_dividend_date, e.payment_date, e.income_date,
+        e.dividend_amount, e.quantity_held, e.income_amount, e.currency, e.quantity_source
+    FROM dividend_entitlements e
+    WHERE (p_account_id IS NULL OR e.account_id = p_account_id)
+    AND (p_symbol IS NULL OR e.symbol = p_symbol)
+    AND (p_ex_dividend_date IS NULL OR e.ex_dividend_date = p_ex_dividend_date);
+
+    GET DIAGNOSTICS rows_written = ROW_COUNT;
+    RETURN rows_written;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Dividends: refresh only the (symbol, ex-date) pairs touched by the statement.
+-- The collector re-upserts full histories, so unchanged updates are skipped.
+CREATE OR REPLACE FUNCTION maintain_dividend_ledger_from_dividends()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed RECORD;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        FOR changed IN SELECT DISTINCT symbol, ex_dividend_date FROM new_dividends LOOP
+            PERFORM refresh_dividend_ledger(NULL, changed.symbol, changed.ex_dividend_date);
+        END LOOP;
+    ELSIF TG_OP = 'UPDATE' THEN
+        FOR changed IN
+            SELECT DISTINCT n.symbol, n.ex_dividend_date
+            FROM new_dividends n
+            JOIN old_dividends o ON o.dividend_id = n.dividend_id
+            WHERE (n.symbol, n.ex_dividend_date, n.payment_date, n.dividend_amount, n.currency)
+                IS DISTINCT FROM (o.symbol, o.ex_dividend_date, o.payment_date, o.dividend_amount, o.currency)
+            UNION
+            SELECT DISTINCT o.symbol, o.ex_dividend_date
+            FROM old_dividends o
+            JOIN new_dividends n ON n.dividend_id = o.dividend_id
+            WHERE (n.symbol, n.ex_dividend_date) IS DISTINCT FROM (o.symbol, o.ex_dividend_date)
+        LOOP
+            PERFORM refresh_dividend_ledger(NULL, changed.symbol, changed.ex_dividend_date);
+        END LOOP;
+    ELSIF TG_OP = 'DELETE' THEN
+        DELETE FROM dividend_income_ledger l
+        USING old_dividends o
+        WHERE l.symbol = o.symbol AND l.ex_dividend_date = o.ex_dividend_date;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transactions: rebuild the affected account/symbol holdings only
+CREATE OR REPLACE FUNCTION maintain_dividend_ledger_from_transactions()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed RECORD;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        FOR changed IN
+            SELECT DISTINCT account_id, symbol FROM new_transactions WHERE symbol IS NOT NULL
+        LOOP
+            PERFORM refresh_dividend_ledger(changed.account_id, changed.symbol);
+        END LOOP;
+    ELSIF TG_OP = 'UPDATE' THEN
+        FOR changed IN
+            SELECT account_id, symbol FROM new_transactions WHERE symbol IS NOT NULL
+            UNION
+            SELECT account_id, symbol FROM old_transactions WHERE symbol IS NOT NULL
+        LOOP
+            PERFORM refresh_dividend_ledger(changed.account_id, changed.symbol);
+        END LOOP;
+    ELSIF TG_OP = 'DELETE' THEN
+        FOR changed IN
+            SELECT DISTINCT account_id, symbol FROM old_transactions WHERE symbol IS NOT NULL
+        LOOP
+            PERFORM refresh_dividend_ledger(changed.account_id, changed.symbol);
+        END LOOP;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Positions: only matters for holdings without transaction history
+CREATE OR REPLACE FUNCTION maintain_dividend_ledger_from_positions()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.symbol IS NOT NULL THEN
+        IF NOT EXISTS (
+            SELECT 1 FROM transactions t
+            WHERE t.account_id = OLD.account_id AND t.symbol = OLD.symbol
+        ) THEN
+            PERFORM refresh_dividend_ledger(OLD.account_id, OLD.symbol);
+        END IF;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.symbol IS NOT NULL THEN
+        IF NOT EXISTS (
+            SELECT 1 FROM transactions t
+            WHERE t.account_id = NEW.account_id AND t.symbol = NEW.symbol
+        ) THEN
+            PERFORM refresh_dividend_ledger(NEW.account_id, NEW.symbol);
+        END IF;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS dividend_ledger_dividends_insert ON dividends;
+CREATE TRIGGER dividend_ledger_dividends_insert
+    AFTER INSERT ON dividends
+    REFERENCING NEW TABLE AS new_dividends
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_dividend_ledger_from_dividends();
+
+DROP TRIGGER IF EXISTS dividend_ledger_dividends_update ON dividends;
+CREATE TRIGGER dividend_ledger_dividends_update
+    AFTER UPDATE ON dividends
+    REFERENCING OLD TABLE AS old_dividends NEW TABLE AS new_dividends
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_dividend_ledger_from_dividends();
+
+DROP TRIGGER IF EXISTS dividend_ledger_dividends_delete ON dividends;
+CREATE TRIGGER dividend_ledger_dividends_delete
+    AFTER DELETE ON dividends
+    REFERENCING OLD TABLE AS old_dividends
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_dividend_ledger_from_dividends();
+
+DROP TRIGGER IF EXISTS dividend_ledger_transactions_insert ON transactions;
+CREATE TRIGGER dividend_ledger_transactions_insert
+    AFTER INSERT ON transactions
+    REFERENCING NEW TABLE AS new_transactions
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_dividend_ledger_from_transactions();
+
+DROP TRIGGER IF EXISTS dividend_ledger_transactions_update ON transactions;
+CREATE TRIGGER dividend_ledger_transactions_update
+    AFTER UPDATE ON transactions
+    REFERENCING OLD TABLE AS old_transactions NEW TABLE AS new_transactions
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_dividend_ledger_from_transactions();
+
+DROP TRIGGER IF EXISTS dividend_ledger_transactions_delete ON transactions;
+CREATE TRIGGER dividend_ledger_transactions_delete
+    AFTER DELETE ON transactions
+    REFERENCING OLD TABLE AS old_transactions
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_dividend_ledger_from_transactions();
+
+-- Repricing rewrites positions constantly; only quantity changes matter here
+DROP TRIGGER IF EXISTS dividend_ledger_positions_change ON positions;
+CREATE TRIGGER dividend_ledger_positions_change
+    AFTER UPDATE OF quantity, account_id, symbol, held_since ON positions
+    FOR EACH ROW
+    WHEN (
+        (OLD.quantity, OLD.account_id, OLD.symbol, OLD.held_since)
+        IS DISTINCT FROM (NEW.quantity, NEW.account_id, NEW.symbol, NEW.held_since)
+    )
+    EXECUTE FUNCTION maintain_dividend_ledger_from_positions();
+
+DROP TRIGGER IF EXISTS dividend_ledger_positions_insert_delete ON positions;
+CREATE TRIGGER dividend_ledger_positions_insert_delete
+    AFTER INSERT OR DELETE ON positions
+    FOR EACH ROW
+    EXECUTE FUNCTION maintain_dividend_ledger_from_positions();
+
+-- Initial backfill
+SELECT refresh_dividend_ledger() AS ledger_rows_written;
+
+-- Update version
+INSERT INTO schema_versions (version, description, applied_at)
+VALUES ('001', 'Dividend income ledger with incremental maintenance', CURRENT_TIMESTAMP);
+
+COMMIT;
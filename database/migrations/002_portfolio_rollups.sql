@@ -0,0 +1,367 @@
+-- Migration: 002_portfolio_rollups
+-- Date: 2026-10-18
+-- Author: Treviwise Contributors
+--
+-- Per-account and portfolio-level rollups (cost basis, market value,
+-- unrealized P&L, cash, position count) maintained by triggers that apply
+-- deltas, so summary reads are O(accounts) instead of re-aggregating
+-- positions on every request. Account rollups count every position row, like
+-- the original account views; the portfolio rollup counts positions with a
+-- positive quantity, like the original summary query, and is updated once per
+-- statement so a bulk reprice touches the singleton row once. Cost basis is
+-- rounded per row to the stored scale so deltas stay exact, and portfolio
+-- cash only counts active accounts. check_rollup_consistency() compares the
+-- rollups against a full recomputation; rebuild_rollups() re-seeds them.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS account_rollups (
+    account_id INTEGER PRIMARY KEY REFERENCES investment_accounts(account_id) ON DELETE CASCADE,
+    cost_basis NUMERIC(18,4) NOT NULL DEFAULT 0,
+    market_value NUMERIC(18,4) NOT NULL DEFAULT 0,
+    unrealized_gain_loss NUMERIC(18,4) NOT NULL DEFAULT 0,
+    cash_balance NUMERIC(15,4) NOT NULL DEFAULT 0,
+    position_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Single-row table; portfolio position totals span all accounts like the
+-- original summary query, cash and account count only active accounts
+CREATE TABLE IF NOT EXISTS portfolio_rollup (
+    singleton BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+    cost_basis NUMERIC(18,4) NOT NULL DEFAULT 0,
+    market_value NUMERIC(18,4) NOT NULL DEFAULT 0,
+    unrealized_gain_loss NUMERIC(18,4) NOT NULL DEFAULT 0,
+    cash_balance NUMERIC(18,4) NOT NULL DEFAULT 0,
+    position_count INTEGER NOT NULL DEFAULT 0,
+    account_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO portfolio_rollup (singleton) VALUES (TRUE) ON CONFLICT DO NOTHING;
+
+-- Positions: subtract the old row's contribution to its account, add the new one
+CREATE OR REPLACE FUNCTION apply_position_rollup_delta()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.account_id IS NOT NULL THEN
+        UPDATE account_rollups SET
+            cost_basis = cost_basis - COALESCE(ROUND(OLD.quantity * OLD.average_cost_basis, 4), 0),
+            market_value = market_value - COALESCE(OLD.market_value, 0),
+            unrealized_gain_loss = unrealized_gain_loss - COALESCE(OLD.unrealized_gain_loss, 0),
+            position_count = position_count - 1,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE account_id = OLD.account_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.account_id IS NOT NULL THEN
+        INSERT INTO account_rollups (
+            account_id, cost_basis, market_value, unrealized_gain_loss, position_count
+        ) VALUES (
+            NEW.account_id,
+            COALESCE(ROUND(NEW.quantity * NEW.average_cost_basis, 4), 0),
+            COALESCE(NEW.market_value, 0),
+            COALESCE(NEW.unrealized_gain_loss, 0),
+            1
+        )
+        ON CONFLICT (account_id) DO UPDATE SET
+            cost_basis = account_rollups.cost_basis + EXCLUDED.cost_basis,
+            market_value = account_rollups.market_value + EXCLUDED.market_value,
+            unrealized_gain_loss = account_rollups.unrealized_gain_loss + EXCLUDED.unrealized_gain_loss,
+            position_count = account_rollups.position_count + 1,
+            updated_at = CURRENT_TIMESTAMP;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Positions: net the statement's old and new rows into one portfolio update,
+-- so the singleton row is locked once per statement rather than once per row
+CREATE OR REPLACE FUNCTION apply_portfolio_rollup_delta()
+RETURNS TRIGGER AS $$
+DECLARE
+    old_cost NUMERIC := 0;
+    old_value NUMERIC := 0;
+    old_gain NUMERIC := 0;
+    old_count INTEGER := 0;
+    new_cost NUMERIC := 0;
+    new_value NUMERIC := 0;
+    new_gain NUMERIC := 0;
+    new_count INTEGER := 0;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT
+            COALESCE(SUM(COALESCE(ROUND(quantity * average_cost_basis, 4), 0)), 0),
+            COALESCE(SUM(COALESCE(market_value, 0)), 0),
+            COALESCE(SUM(COALESCE(unrealized_gain_loss, 0)), 0),
+            COUNT(*)
+        INTO old_cost, old_value, old_gain, old_count
+        FROM old_positions
+        WHERE quantity > 0;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT
+            COALESCE(SUM(COALESCE(ROUND(quantity * average_cost_basis, 4), 0)), 0),
+            COALESCE(SUM(COALESCE(market_value, 0)), 0),
+            COALESCE(SUM(COALESCE(unrealized_gain_loss, 0)), 0),
+            COUNT(*)
+        INTO new_cost, new_value, new_gain, new_count
+        FROM new_positions
+        WHERE quantity > 0;
+    END IF;
+
+    -- Statements that leave the totals unchanged don't touch the singleton
+    IF (new_cost - old_cost, new_value - old_value, new_gain - old_gain, new_count - old_count)
+        = (0::NUMERIC, 0::NUMERIC, 0::NUMERIC, 0) THEN
+        RETURN NULL;
+    END IF;
+
+    UPDATE portfolio_rollup SET
+        cost_basis = cost_basis - old_cost + new_cost,
+        market_value = market_value - old_value + new_value,
+        unrealized_gain_loss = unrealized_gain_loss - old_gain + new_gain,
+        position_count = position_count - old_count + new_count,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE singleton;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Accounts: track cash and active status
+CREATE OR REPLACE FUNCTION apply_account_rollup_delta()
+RETURNS TRIGGER AS $$
+DECLARE
+    old_active BOOLEAN := TG_OP IN ('UPDATE', 'DELETE') AND COALESCE(OLD.is_active, FALSE);
+    new_active BOOLEAN := TG_OP IN ('INSERT', 'UPDATE') AND COALESCE(NEW.is_active, FALSE);
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO account_rollups (account_id, cash_balance)
+        VALUES (NEW.account_id, COALESCE(NEW.cash_balance, 0))
+        ON CONFLICT (account_id) DO UPDATE SET
+            cash_balance = EXCLUDED.cash_balance,
+            updated_at = CURRENT_TIMESTAMP;
+    END IF;
+
+    UPDATE portfolio_rollup SET
+        cash_balance = cash_balance
+            - CASE WHEN old_active THEN COALESCE(OLD.cash_balance, 0) ELSE 0 END
+            + CASE WHEN new_active THEN COALESCE(NEW.cash_balance, 0) ELSE 0 END,
+        account_count = account_count
+            - CASE WHEN old_active THEN 1 ELSE 0 END
+            + CASE WHEN new_active THEN 1 ELSE 0 END,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE singleton;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS position_rollup_insert_delete ON positions;
+CREATE TRIGGER position_rollup_insert_delete
+    AFTER INSERT OR DELETE ON positions
+    FOR EACH ROW
+    EXECUTE FUNCTION apply_position_rollup_delta();
+
+DROP TRIGGER IF EXISTS position_rollup_update ON positions;
+CREATE TRIGGER position_rollup_update
+    AFTER UPDATE ON positions
+    FOR EACH ROW
+    WHEN (
+        (OLD.account_id, OLD.quantity, OLD.average_cost_basis, OLD.market_value, OLD.unrealized_gain_loss)
+        IS DISTINCT FROM
+        (NEW.account_id, NEW.quantity, NEW.average_cost_basis, NEW.market_value, NEW.unrealized_gain_loss)
+    )
+    EXECUTE FUNCTION apply_position_rollup_delta();
+
+-- Transition tables allow only one event per trigger
+DROP TRIGGER IF EXISTS portfolio_rollup_positions_insert ON positions;
+CREATE TRIGGER portfolio_rollup_positions_insert
+    AFTER INSERT ON positions
+    REFERENCING NEW TABLE AS new_positions
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_portfolio_rollup_delta();
+
+DROP TRIGGER IF EXISTS portfolio_rollup_positions_update ON positions;
+CREATE TRIGGER portfolio_rollup_positions_update
+    AFTER UPDATE ON positions
+    REFERENCING OLD TABLE AS old_positions NEW TABLE AS new_positions
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_portfolio_rollup_delta();
+
+DROP TRIGGER IF EXISTS portfolio_rollup_positions_delete ON positions;
+CREATE TRIGGER portfolio_rollup_positions_delete
+    AFTER DELETE ON positions
+    REFERENCING OLD TABLE AS old_positions
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION apply_portfolio_rollup_delta();
+
+DROP TRIGGER IF EXISTS account_rollup_insert_delete ON investment_accounts;
+CREATE TRIGGER account_rollup_insert_delete
+    AFTER INSERT OR DELETE ON investment_accounts
+    FOR EACH ROW
+    EXECUTE FUNCTION apply_account_rollup_delta();
+
+DROP TRIGGER IF EXISTS account_rollup_update ON investment_accounts;
+CREATE TRIGGER account_rollup_update
+    AFTER UPDATE ON investment_accounts
+    FOR EACH ROW
+    WHEN (
+        (OLD.cash_balance, OLD.is_active) IS DISTINCT FROM (NEW.cash_balance, NEW.is_active)
+    )
+    EXECUTE FUNCTION apply_account_rollup_delta();
+
+-- Full recomputation, used for seeding and by the consistency checker
+CREATE OR REPLACE VIEW account_rollups_recomputed AS
+SELECT
+    ia.account_id,
+    COALESCE(SUM(ROUND(p.quantity * p.average_cost_basis, 4)), 0) AS cost_basis,
+    COALESCE(SUM(p.market_value), 0) AS market_value,
+    COALESCE(SUM(p.unrealized_gain_loss), 0) AS unrealized_gain_loss,
+    COALESCE(ia.cash_balance, 0) AS cash_balance,
+    COUNT(p.position_id)::INTEGER AS position_count
+FROM investment_accounts ia
+LEFT JOIN positions p ON p.account_id = ia.account_id
+GROUP BY ia.account_id, ia.cash_balance;
+
+CREATE OR REPLACE VIEW portfolio_rollup_recomputed AS
+SELECT
+    COALESCE(pos.cost_basis, 0) AS cost_basis,
+    COALESCE(pos.market_value, 0) AS market_value,
+    COALESCE(pos.unrealized_gain_loss, 0) AS unrealized_gain_loss,
+    COALESCE(acc.cash_balance, 0) AS cash_balance,
+    pos.position_count,
+    acc.account_count
+FROM (
+    SELECT
+        SUM(COALESCE(ROUND(quantity * average_cost_basis, 4), 0)) AS cost_basis,
+        SUM(COALESCE(market_value, 0)) AS market_value,
+        SUM(COALESCE(unrealized_gain_loss, 0)) AS unrealized_gain_loss,
+        COUNT(*)::INTEGER AS position_count
+    FROM positions
+    WHERE quantity > 0
+) pos
+CROSS JOIN (
+    SELECT
+        SUM(COALESCE(cash_balance, 0)) AS cash_balance,
+        COUNT(*)::INTEGER AS account_count
+    FROM investment_accounts
+    WHERE is_active = TRUE
+) acc;
+
+CREATE OR REPLACE FUNCTION rebuild_rollups()
+RETURNS VOID AS $$
+BEGIN
+    -- Serialize with the delta triggers while re-seeding
+    LOCK TABLE positions, investment_accounts IN SHARE MODE;
+
+    DELETE FROM account_rollups;
+    INSERT INTO account_rollups (
+        account_id, cost_basis, market_value, unrealized_gain_loss, cash_balance, position_count
+    )
+    SELECT account_id, cost_basis, market_value, unrealized_gain_loss, cash_balance, position_count
+    FROM account_rollups_recomputed;
+
+    UPDATE portfolio_rollup pr SET
+        cost_basis = r.cost_basis,
+        market_value = r.market_value,
+        unrealized_gain_loss = r.unrealized_gain_loss,
+        cash_balance = r.cash_balance,
+        position_count = r.position_count,
+        account_count = r.account_count,
+        updated_at = CURRENT_TIMESTAMP
+    FROM portfolio_rollup_recomputed r
+    WHERE pr.singleton;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Rows where a rollup disagrees with a full recomputation (empty = consistent)
+CREATE OR REPLACE FUNCTION check_rollup_consistency()
+RETURNS TABLE(
+    scope VARCHAR(20),
+    account_id INTEGER,
+    metric VARCHAR(30),
+    rollup_value NUMERIC,
+    recomputed_value NUMERIC
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        'account'::VARCHAR(20),
+        COALESCE(r.account_id, a.account_id),
+        m.metric::VARCHAR(30),
+        m.rollup_value,
+        m.recomputed_value
+    FROM account_rollups_recomputed r
+    FULL JOIN account_rollups a ON a.account_id = r.account_id
+    CROSS JOIN LATERAL (VALUES
+        ('cost_basis', a.cost_basis, r.cost_basis),
+        ('market_value', a.market_value, r.market_value),
+        ('unrealized_gain_loss', a.unrealized_gain_loss, r.unrealized_gain_loss),
+        ('cash_balance', a.cash_balance, r.cash_balance),
+        ('position_count', a.position_count::NUMERIC, r.position_count::NUMERIC)
+    ) AS m(metric, rollup_value, recomputed_value)
+    WHERE m.rollup_value IS DISTINCT FROM m.recomputed_value
+
+    UNION ALL
+
+    SELECT
+        'portfolio'::VARCHAR(20),
+        NULL::INTEGER,
+        m.metric::VARCHAR(30),
+        m.rollup_value,
+        m.recomputed_value
+    FROM portfolio_rollup p
+    CROSS JOIN portfolio_rollup_recomputed r
+    CROSS JOIN LATERAL (VALUES
+        ('cost_basis', p.cost_basis, r.cost_basis),
+        ('market_value', p.market_value, r.market_value),
+        ('unrealized_gain_loss', p.unrealized_gain_loss, r.unrealized_gain_loss),
+        ('cash_balance', p.cash_balance, r.cash_balance),
+        ('position_count', p.position_count::NUMERIC, r.position_count::NUMERIC),
+        ('account_count', p.account_count::NUMERIC, r.account_count::NUMERIC)
+    ) AS m(metric, rollup_value, recomputed_value)
+    WHERE m.rollup_value IS DISTINCT FROM m.recomputed_value;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Summary views now read the rollups instead of aggregating positions; like
+-- the originals they count every position row of an account (plain NUMERIC
+-- casts keep the column types, and totals stay NULL without positions)
+CREATE OR REPLACE VIEW account_total_values AS
+SELECT
+    ia.account_id,
+    a.asset_name as account_name,
+    ia.cash_balance,
+    COALESCE(r.market_value, 0)::NUMERIC as positions_value,
+    ia.cash_balance + COALESCE(r.market_value, 0)::NUMERIC as total_account_value,
+    ia.base_currency,
+    ia.last_sync,
+    COALESCE(r.position_count, 0)::BIGINT as positions_count
+FROM investment_accounts ia
+JOIN assets a ON ia.asset_id = a.asset_id
+LEFT JOIN account_rollups r ON r.account_id = ia.account_id
+WHERE ia.is_active = TRUE;
+
+CREATE OR REPLACE VIEW portfolio_summary AS
+SELECT ia.account_id,
+    i.institution_name,
+    ia.account_type,
+    CASE WHEN r.position_count > 0 THEN r.market_value END::NUMERIC AS total_market_value,
+    CASE WHEN r.position_count > 0 THEN r.unrealized_gain_loss END::NUMERIC AS total_unrealized_gain_loss,
+    COALESCE(r.position_count, 0)::BIGINT AS positions_count
+FROM investment_accounts ia
+JOIN institutions i ON ia.institution_id = i.institution_id
+LEFT JOIN account_rollups r ON r.account_id = ia.account_id
+WHERE ia.is_active = TRUE;
+
+-- Initial seed
+SELECT rebuild_rollups();
+
+-- Update version
+INSERT INTO schema_versions (version, description, applied_at)
+VALUES ('002', 'Trigger-maintained account and portfolio rollups', CURRENT_TIMESTAMP);
+
+COMMIT;
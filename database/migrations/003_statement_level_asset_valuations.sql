@@ -0,0 +1,56 @@
+-- Migration: 003_statement_level_asset_valuations
+-- Date: 2026-10-18
+-- Author: Treviwise Contributors
+--
+-- Replace the FOR EACH ROW asset_value_change_trigger with a statement-level
+-- trigger using transition tables, so a bulk revaluation of N assets inserts
+-- its N asset_valuations rows in a single INSERT ... SELECT without building
+-- a per-row note string.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION track_asset_value_changes_batch()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO asset_valuations (
+        asset_id,
+        valuation_date,
+        value_original_currency,
+        value_usd,
+        valuation_method,
+        notes
+    )
+    SELECT
+        n.asset_id,
+        CURRENT_DATE,
+        n.current_value_original,
+        n.current_value_usd,
+        CASE
+            WHEN n.last_api_update > COALESCE(o.last_api_update, '1900-01-01') THEN 'API'
+            WHEN n.last_manual_update > COALESCE(o.last_manual_update, '1900-01-01') THEN 'Manual'
+            ELSE 'System'
+        END,
+        -- Constant note; the previous value is the asset's prior valuation row
+        'Auto-tracked value change'
+    FROM new_assets n
+    JOIN old_assets o ON o.asset_id = n.asset_id
+    WHERE o.current_value_original IS DISTINCT FROM n.current_value_original;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS asset_value_change_trigger ON assets;
+CREATE TRIGGER asset_value_change_trigger
+    AFTER UPDATE ON assets
+    REFERENCING OLD TABLE AS old_assets NEW TABLE AS new_assets
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION track_asset_value_changes_batch();
+
+DROP FUNCTION IF EXISTS track_asset_value_changes();
+
+-- Update version
+INSERT INTO schema_versions (version, description, applied_at)
+VALUES ('003', 'Statement-level asset value change tracking', CURRENT_TIMESTAMP);
+
+COMMIT;
@@ -0,0 +1,94 @@
+-- Migration: 004_security_metadata
+-- Date: 2026-10-18
+-- Author: Treviwise Contributors
+--
+-- Track when securities_master metadata was last synced from the provider, and
+-- move the security_type -> asset class mapping out of the CASE expression in
+-- current_net_worth_detailed into a lookup table shared with the API.
+
+BEGIN;
+
+ALTER TABLE securities_master
+    ADD COLUMN IF NOT EXISTS metadata_updated_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_securities_master_metadata_updated
+    ON securities_master(metadata_updated_at NULLS FIRST);
+
+CREATE TABLE IF NOT EXISTS security_type_asset_classes (
+    security_type VARCHAR(30) PRIMARY KEY,
+    asset_class VARCHAR(50) NOT NULL
+);
+
+-- Same mapping as the CASE in 02_schema_enhancements.sql. 'Mutual Fund' is
+-- deliberately left unmapped so funds keep falling back to 'Alternative
+-- Investments'; insert a row to reclassify them.
+INSERT INTO security_type_asset_classes (security_type, asset_class) VALUES
+    ('Stock', 'Equities'),
+    ('ETF', 'Equities'),
+    ('Bond', 'Fixed Income')
+ON CONFLICT (security_type) DO NOTHING;
+
+-- Same definition as 02_schema_enhancements.sql, with the mapping joined in;
+-- unmapped types still fall back to 'Alternative Investments'
+DROP MATERIALIZED VIEW IF EXISTS current_net_worth_detailed;
+
+CREATE MATERIALIZED VIEW current_net_worth_detailed AS
+SELECT
+    -- Direct assets (bank accounts, real estate, etc.)
+    'Direct Asset' as source_type,
+    a.asset_id as source_id,
+    a.asset_name as source_name,
+    ac.class_name as asset_class,
+    a.current_value_original as value_original,
+    a.current_value_usd as value_usd,
+    a.base_currency,
+    a.last_manual_update,
+    a.last_api_update
+FROM assets a
+JOIN asset_classes ac ON a.class_id = ac.class_id
+WHERE a.is_active = TRUE
+-- Exclude trading accounts since they're handled separately below
+AND a.asset_id NOT IN (SELECT asset_id FROM investment_accounts WHERE asset_id IS NOT NULL)
+
+UNION ALL
+
+SELECT
+    -- Investment account cash
+    'Account Cash' as source_type,
+    ia.account_id as source_id,
+    a.asset_name || ' (Cash)' as source_name,
+    'Cash & Equivalents' as asset_class,
+    ia.cash_balance as value_original,
+    ia.cash_balance as value_usd, -- Will need currency conversion later
+    ia.base_currency,
+    ia.cash_balance_last_updated as last_manual_update,
+    ia.last_sync as last_api_update
+FROM investment_accounts ia
+JOIN assets a ON ia.asset_id = a.asset_id
+WHERE ia.is_active = TRUE AND ia.cash_balance > 0
+
+UNION ALL
+
+SELECT
+    -- Investment positions
+    'Investment Position' as source_type,
+    p.position_id as source_id,
+    sm.security_name || ' (' || a.asset_name || ')' as source_name,
+    COALESCE(stac.asset_class, 'Alternative Investments') as asset_class,
+    COALESCE(p.market_value, p.quantity * p.average_cost_basis) as value_original,
+    COALESCE(p.market_value, p.quantity * p.average_cost_basis) as value_usd,
+    p.currency as base_currency,
+    p.last_updated as last_manual_update,
+    p.last_updated as last_api_update
+FROM positions p
+JOIN investment_accounts ia ON p.account_id = ia.account_id
+JOIN assets a ON ia.asset_id = a.asset_id
+JOIN securities_master sm ON p.symbol = sm.symbol
+LEFT JOIN security_type_asset_classes stac ON stac.security_type = sm.security_type
+WHERE ia.is_active = TRUE AND p.quantity > 0;
+
+-- Update version
+INSERT INTO schema_versions (version, description, applied_at)
+VALUES ('004', 'Security metadata sync tracking and asset class lookup', CURRENT_TIMESTAMP);
+
+COMMIT;
@@ -0,0 +1,57 @@
+-- Migration: 005_data_versions
+-- Date: 2026-10-18
+-- Author: Treviwise Contributors
+--
+-- Per-table change counters for API caches. A statement-level trigger bumps
+-- the table's counter once per write statement, so a cache can check whether
+-- its inputs changed with a primary-key read instead of scanning the tables.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS data_versions (
+    table_name VARCHAR(63) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE OR REPLACE FUNCTION bump_data_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO data_versions (table_name, version, changed_at)
+    VALUES (TG_TABLE_NAME, 1, CURRENT_TIMESTAMP)
+    ON CONFLICT (table_name) DO UPDATE SET
+        version = data_versions.version + 1,
+        changed_at = EXCLUDED.changed_at;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    tracked TEXT;
+BEGIN
+    FOREACH tracked IN ARRAY ARRAY[
+        'dividends',
+        'positions',
+        'investment_accounts',
+        'institutions',
+        'securities_master',
+        'security_type_asset_classes'
+    ]
+    LOOP
+        INSERT INTO data_versions (table_name) VALUES (tracked) ON CONFLICT DO NOTHING;
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', tracked || '_data_version', tracked);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I '
+            'FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version()',
+            tracked || '_data_version', tracked
+        );
+    END LOOP;
+END;
+$$;
+
+-- Update version
+INSERT INTO schema_versions (version, description, applied_at)
+VALUES ('005', 'Per-table data version counters for API caches', CURRENT_TIMESTAMP);
+
+COMMIT;
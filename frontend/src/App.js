@@ -1,5 +1,5 @@
 // src/App.js
-import React, { useState, useEffect } from 'react';
+import React, { useState } from 'react';
 import {
   ThemeProvider,
   CssBaseline,
@@ -7,7 +7,6 @@ import {
   AppBar,
   Toolbar,
   Typography,
-  Box,
   Alert,
   Snackbar,
   CircularProgress,
@@ -21,57 +20,27 @@ import {
 
 import theme from './theme/theme';
 import apiService from './services/api';
+import { revalidateAll } from './services/resourceCache';
+import useResource from './hooks/useResource';
 import Dashboard from './components/Dashboard/Dashboard';
 
+const DIVIDENDS_LIMIT = 20;
+
 function App() {
-  const [loading, setLoading] = useState(true);
-  const [error, setError] = useState(null);
-  const [data, setData] = useState({
-    portfolio: null,
-    positions: null,
-    assets: null,
-    netWorth: null,
-    dividends: null,
-  });
+  // Each resource paints from cache immediately and revalidates on its own
+  const resources = {
+    portfolio: useResource('portfolio-summary', apiService.getPortfolioSummary),
+    positions: useResource('positions', apiService.getPositions),
+    assets: useResource('assets', apiService.getAssets),
+    netWorth: useResource('net-worth', apiService.getNetWorth),
+    dividends: useResource(`dividends:${DIVIDENDS_LIMIT}`, () => apiService.getDividends(DIVIDENDS_LIMIT)),
+    dividendProjection: useResource('dividend-projection', apiService.getDividendProjection),
+  };
   const [refreshing, setRefreshing] = useState(false);
   const [snackbar, setSnackbar] = useState({ open: false, message: '', severity: 'info' });
 
-  // Load all data on component mount
-  useEffect(() => {
-    loadAllData();
-  }, []);
-
-  const loadAllData = async () => {
-    try {
-      setLoading(true);
-      setError(null);
-
-      // Load all data in parallel
-      const [portfolio, positions, assets, netWorth, dividends] = await Promise.all([
-        apiService.getPortfolioSummary(),
-        apiService.getPositions(),
-        apiService.getAssets(),
-        apiService.getNetWorth(),
-        apiService.getDividends(20),
-      ]);
-
-      setData({
-        portfolio,
-        positions,
-        assets,
-        netWorth,
-        dividends,
-      });
-
-      showSnackbar('Data loaded successfully', 'success');
-    } catch (err) {
-      console.error('Failed to load data:', err);
-      setError(err.message || 'Failed to load data. Please check if the backend is running.');
-      showSnackbar('Failed to load data', 'error');
-    } finally {
-      setLoading(false);
-    }
-  };
+  const lastUpdated = Math.max(...Object.values(resources).map((resource) => resource.updatedAt || 0));
+  const validating = Object.values(resources).some((resource) => resource.isValidating);
 
   const handleRefresh = async () => {
     try {
@@ -80,10 +49,15 @@ function App() {
       // Trigger backend data refresh
       await apiService.refreshData();
       
-      // Reload all data
-      await loadAllData();
+      // Revalidate every resource in the background; cached data stays on screen
+      const results = await revalidateAll();
+      const failed = results.filter((result) => result.status === 'rejected').length;
       
-      showSnackbar('Data refreshed successfully', 'success');
+      if (failed > 0) {
+        showSnackbar(`Refreshed with ${failed} section(s) failing to load`, 'warning');
+      } else {
+        showSnackbar('Data refreshed successfully', 'success');
+      }
     } catch (err) {
       console.error('Failed to refresh data:', err);
       showSnackbar('Failed to refresh data', 'error');
@@ -100,50 +74,6 @@ function App() {
     setSnackbar({ ...snackbar, open: false });
   };
 
-  if (loading) {
-    return (
-      <ThemeProvider theme={theme}>
-        <CssBaseline />
-        <Box
-          display="flex"
-          justifyContent="center"
-          alignItems="center"
-          minHeight="100vh"
-          flexDirection="column"
-        >
-          <CircularProgress size={60} />
-          <Typography variant="h6" sx={{ mt: 2 }}>
-            Loading your wealth data...
-          </Typography>
-        </Box>
-      </ThemeProvider>
-    );
-  }
-
-  if (error) {
-    return (
-      <ThemeProvider theme={theme}>
-        <CssBaseline />
-        <Container maxWidth="md" sx={{ mt: 4 }}>
-          <Alert 
-            severity="error" 
-            action={
-              <button onClick={loadAllData}>
-                Retry
-              </button>
-            }
-          >
-            <Typography variant="h6">Connection Error</Typography>
-            <Typography variant="body2">{error}</Typography>
-            <Typography variant="caption" display="block" sx={{ mt: 1 }}>
-              Make sure your FastAPI backend is running on http://localhost:8000
-            </Typography>
-          </Alert>
-        </Container>
-      </ThemeProvider>
-    );
-  }
-
   return (
     <ThemeProvider theme={theme}>
       <CssBaseline />
@@ -155,15 +85,18 @@ function App() {
           <Typography variant="h6" component="div" sx={{ flexGrow: 1 }}>
             Wealth Tracker
           </Typography>
+          {validating && <CircularProgress size={16} color="inherit" sx={{ mr: 1 }} />}
           <Typography variant="body2" sx={{ opacity: 0.8 }}>
-            Last updated: {new Date().toLocaleTimeString()}
+            {lastUpdated > 0
+              ? `Last updated: ${new Date(lastUpdated).toLocaleTimeString()}`
+              : 'Loading your wealth data...'}
           </Typography>
         </Toolbar>
       </AppBar>
 
       {/* Main Content */}
       <Container maxWidth="xl" sx={{ mt: 3, mb: 3 }}>
-        <Dashboard data={data} onRefresh={loadAllData} />
+        <Dashboard resources={resources} />
       </Container>
 
       {/* Floating Refresh Button */}
@@ -0,0 +1,39 @@
+// src/components/Common/ResourceState.js
+import React from 'react';
+import { Alert, Box, Button, CircularProgress, Typography } from '@mui/material';
+
+/**
+ * Renders one widget's loading / error state, or its children once data exists.
+ * Stale data keeps rendering while a background revalidation is running.
+ */
+function ResourceState({ resource, label, minHeight = 160, children }) {
+  if (resource.data !== undefined) {
+    return children(resource.data);
+  }
+
+  if (resource.error) {
+    return (
+      <Alert
+        severity="error"
+        action={
+          <Button color="inherit" size="small" onClick={() => resource.reload().catch(() => {})}>
+            Retry
+          </Button>
+        }
+      >
+        Failed to load {label}: {resource.error.message}
+      </Alert>
+    );
+  }
+
+  return (
+    <Box display="flex" alignItems="center" justifyContent="center" minHeight={minHeight}>
+      <CircularProgress size={32} />
+      <Typography variant="body2" color="text.secondary" sx={{ ml: 2 }}>
+        Loading {label}...
+      </Typography>
+    </Box>
+  );
+}
+
+export default ResourceState;
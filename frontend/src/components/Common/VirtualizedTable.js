@@ -0,0 +1,78 @@
+// src/components/Common/VirtualizedTable.js
+import React, { useCallback, useEffect, useRef, useState } from 'react';
+import {
+  Table,
+  TableBody,
+  TableCell,
+  TableContainer,
+  TableHead,
+  TableRow,
+  Paper,
+} from '@mui/material';
+
+/**
+ * Table that only mounts the rows visible in its scroll window (plus overscan).
+ * Rows are assumed to be roughly `rowHeight` pixels tall; spacer rows above and
+ * below keep the scrollbar proportional to the full list.
+ */
+function VirtualizedTable({
+  rows,
+  header,
+  renderRow,
+  columnCount,
+  rowHeight = 72,
+  maxHeight = 640,
+  overscan = 10,
+}) {
+  const containerRef = useRef(null);
+  const frameRef = useRef(null);
+  const [scrollTop, setScrollTop] = useState(0);
+
+  const handleScroll = useCallback(() => {
+    if (frameRef.current) return;
+    // Coalesce scroll events to one state update per animation frame
+    frameRef.current = window.requestAnimationFrame(() => {
+      frameRef.current = null;
+      if (containerRef.current) {
+        setScrollTop(containerRef.current.scrollTop);
+      }
+    });
+  }, []);
+
+  useEffect(() => () => {
+    if (frameRef.current) window.cancelAnimationFrame(frameRef.current);
+  }, []);
+
+  const visibleCount = Math.ceil(maxHeight / rowHeight);
+  const start = Math.max(0, Math.floor(scrollTop / rowHeight) - overscan);
+  const end = Math.min(rows.length, start + visibleCount + overscan * 2);
+  const topPadding = start * rowHeight;
+  const bottomPadding = (rows.length - end) * rowHeight;
+
+  const spacer = (height, key) => (
+    <TableRow key={key} style={{ height }}>
+      <TableCell colSpan={columnCount} sx={{ p: 0, border: 0 }} />
+    </TableRow>
+  );
+
+  return (
+    <TableContainer
+      component={Paper}
+      variant="outlined"
+      ref={containerRef}
+      onScroll={handleScroll}
+      sx={{ maxHeight }}
+    >
+      <Table stickyHeader>
+        <TableHead>{header}</TableHead>
+        <TableBody sx={{ '& > .MuiTableRow-root': { height: rowHeight } }}>
+          {topPadding > 0 && spacer(topPadding, 'top-spacer')}
+          {rows.slice(start, end).map((row, offset) => renderRow(row, start + offset))}
+          {bottomPadding > 0 && spacer(bottomPadding, 'bottom-spacer')}
+        </TableBody>
+      </Table>
+    </TableContainer>
+  );
+}
+
+export default VirtualizedTable;
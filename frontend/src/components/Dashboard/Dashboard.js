@@ -9,6 +9,7 @@ import {
   Tabs,
   Tab,
   Chip,
+  Skeleton,
   useTheme,
 } from '@mui/material';
 import {
@@ -25,6 +26,19 @@ import AssetsTable from '../Assets/AssetsTable';
 import NetWorthChart from '../Charts/NetWorthChart';
 import AllocationChart from '../Charts/AllocationChart';
 import DividendsTable from '../Portfolio/DividendsTable';
+import ResourceState from '../Common/ResourceState';
+
+// Metric value, or a placeholder while its resource has never loaded
+function MetricValue({ resource, children }) {
+  if (resource.data === undefined) {
+    return <Skeleton variant="text" width="70%" sx={{ fontSize: '2.125rem' }} />;
+  }
+  return (
+    <Typography variant="h4" fontWeight="bold">
+      {children}
+    </Typography>
+  );
+}
 
 function TabPanel({ children, value, index, ...other }) {
   return (
@@ -40,11 +54,12 @@ function TabPanel({ children, value, index, ...other }) {
   );
 }
 
-function Dashboard({ data, onRefresh }) {
+function Dashboard({ resources }) {
   const theme = useTheme();
   const [activeTab, setActiveTab] = useState(0);
 
-  const { portfolio, positions, assets, netWorth, dividends } = data;
+  const portfolio = resources.portfolio.data;
+  const netWorth = resources.netWorth.data;
 
   const handleTabChange = (event, newValue) => {
     setActiveTab(newValue);
@@ -74,9 +89,9 @@ function Dashboard({ data, onRefresh }) {
                   Total Net Worth
                 </Typography>
               </Box>
-              <Typography variant="h4" fontWeight="bold">
+              <MetricValue resource={resources.netWorth}>
                 {formatCurrency(totalNetWorth)}
-              </Typography>
+              </MetricValue>
               <Typography variant="body2" color="text.secondary">
                 Across all asset classes
               </Typography>
@@ -94,9 +109,9 @@ function Dashboard({ data, onRefresh }) {
                   Portfolio Value
                 </Typography>
               </Box>
-              <Typography variant="h4" fontWeight="bold">
+              <MetricValue resource={resources.portfolio}>
                 {formatCurrency(totalMarketValue)}
-              </Typography>
+              </MetricValue>
               <Typography variant="body2" color="text.secondary">
                 Securities only
               </Typography>
@@ -144,9 +159,9 @@ function Dashboard({ data, onRefresh }) {
                   Positions
                 </Typography>
               </Box>
-              <Typography variant="h4" fontWeight="bold">
+              <MetricValue resource={resources.portfolio}>
                 {portfolioTotals.total_positions || 0}
-              </Typography>
+              </MetricValue>
               <Typography variant="body2" color="text.secondary">
                 Active securities
               </Typography>
@@ -156,7 +171,9 @@ function Dashboard({ data, onRefresh }) {
       </Grid>
 
       {/* Portfolio Summary */}
-      <PortfolioSummary data={portfolio} />
+      <ResourceState resource={resources.portfolio} label="account breakdown">
+        {(portfolioData) => <PortfolioSummary data={portfolioData} />}
+      </ResourceState>
 
       {/* Tabbed Content */}
       <Card sx={{ mt: 3 }}>
@@ -171,132 +188,148 @@ function Dashboard({ data, onRefresh }) {
         </Box>
 
         <TabPanel value={activeTab} index={0}>
-          <PositionsTable positions={positions || []} />
+          <ResourceState resource={resources.positions} label="positions">
+            {(positions) => <PositionsTable positions={positions || []} />}
+          </ResourceState>
         </TabPanel>
 
         <TabPanel value={activeTab} index={1}>
-          <AssetsTable assets={assets || []} />
+          <ResourceState resource={resources.assets} label="assets">
+            {(assets) => <AssetsTable assets={assets || []} />}
+          </ResourceState>
         </TabPanel>
 
         <TabPanel value={activeTab} index={2}>
-          <DividendsTable dividends={dividends || []} />
+          <ResourceState resource={resources.dividends} label="dividends">
+            {(dividends) => (
+              <DividendsTable dividends={dividends || []} projection={resources.dividendProjection.data} />
+            )}
+          </ResourceState>
         </TabPanel>
 
         <TabPanel value={activeTab} index={3}>
-          <Box>
-            <Typography variant="h5" gutterBottom sx={{ mb: 3 }}>
-              Asset Allocation Analysis
-            </Typography>
-            <Grid container spacing={3}>
-              <Grid item xs={12} lg={8}>
-                <Card sx={{ p: 4 }}>
-                  <Typography variant="h6" gutterBottom>
-                    Asset Allocation Chart
-                  </Typography>
-                  <Box sx={{ height: 400, width: 400, minHeight: 400 }}>
-                    <AllocationChart data={netWorth?.summary_by_class || []} />
-                  </Box>
-                </Card>
-              </Grid>
-              <Grid item xs={12} lg={4}>
-                <Card sx={{ p: 3, height: 'fit-content' }}>
-                  <Typography variant="h6" gutterBottom>
-                    Allocation Summary
-                  </Typography>
-                  {assetClasses.map((assetClass, index) => (
-                    <Box key={index} sx={{ mb: 3 }}>
-                      <Box display="flex" justifyContent="space-between" alignItems="center" mb={1}>
-                        <Typography variant="body1" fontWeight="600">
-                          {assetClass.asset_class}
-                        </Typography>
-                        <Typography variant="body1" color="primary" fontWeight="bold">
-                          {formatPercentage(assetClass.percentage)}
-                        </Typography>
-                      </Box>
-                      <Box display="flex" justifyContent="space-between" alignItems="center" mb={1}>
-                        <Typography variant="body2" color="text.secondary">
-                          {formatCurrency(assetClass.total_value)}
-                        </Typography>
-                        <Typography variant="body2" color="text.secondary">
-                          {assetClass.items} items
-                        </Typography>
-                      </Box>
-                      <Box sx={{ width: '100%', height: 6, backgroundColor: 'grey.200', borderRadius: 3 }}>
-                        <Box 
-                          sx={{ 
-                            width: `${assetClass.percentage}%`, 
-                            height: '100%', 
-                            backgroundColor: 'primary.main', 
-                            borderRadius: 3 
-                          }} 
-                        />
+          <ResourceState resource={resources.netWorth} label="asset allocation">
+            {() => (
+              <Box>
+                <Typography variant="h5" gutterBottom sx={{ mb: 3 }}>
+                  Asset Allocation Analysis
+                </Typography>
+                <Grid container spacing={3}>
+                  <Grid item xs={12} lg={8}>
+                    <Card sx={{ p: 4 }}>
+                      <Typography variant="h6" gutterBottom>
+                        Asset Allocation Chart
+                      </Typography>
+                      <Box sx={{ height: 400, width: 400, minHeight: 400 }}>
+                        <AllocationChart data={netWorth?.summary_by_class || []} />
                       </Box>
-                    </Box>
-                  ))}
-                </Card>
-              </Grid>
-            </Grid>
-          </Box>
+                    </Card>
+                  </Grid>
+                  <Grid item xs={12} lg={4}>
+                    <Card sx={{ p: 3, height: 'fit-content' }}>
+                      <Typography variant="h6" gutterBottom>
+                        Allocation Summary
+                      </Typography>
+                      {assetClasses.map((assetClass, index) => (
+                        <Box key={index} sx={{ mb: 3 }}>
+                          <Box display="flex" justifyContent="space-between" alignItems="center" mb={1}>
+                            <Typography variant="body1" fontWeight="600">
+                              {assetClass.asset_class}
+                            </Typography>
+                            <Typography variant="body1" color="primary" fontWeight="bold">
+                              {formatPercentage(assetClass.percentage)}
+                            </Typography>
+                          </Box>
+                          <Box display="flex" justifyContent="space-between" alignItems="center" mb={1}>
+                            <Typography variant="body2" color="text.secondary">
+                              {formatCurrency(assetClass.total_value)}
+                            </Typography>
+                            <Typography variant="body2" color="text.secondary">
+                              {assetClass.items} items
+                            </Typography>
+                          </Box>
+                          <Box sx={{ width: '100%', height: 6, backgroundColor: 'grey.200', borderRadius: 3 }}>
+                            <Box 
+                              sx={{ 
+                                width: `${assetClass.percentage}%`, 
+                                height: '100%', 
+                                backgroundColor: 'primary.main', 
+                                borderRadius: 3 
+                              }} 
+                            />
+                          </Box>
+                        </Box>
+                      ))}
+                    </Card>
+                  </Grid>
+                </Grid>
+              </Box>
+            )}
+          </ResourceState>
         </TabPanel>
 
         <TabPanel value={activeTab} index={4}>
-          <Box>
-            <Typography variant="h5" gutterBottom sx={{ mb: 3 }}>
-              Net Worth Breakdown by Asset Class
-            </Typography>
-            <Grid container spacing={3}>
-              <Grid item xs={12}>
-                <Card sx={{ p: 3 }}>
-                  <Typography variant="h6" gutterBottom>
-                    Net Worth Distribution
-                  </Typography>
-                  <Box sx={{ height: 350, width: 350, minHeight: 350 }}>
-                    <NetWorthChart data={netWorth?.detailed_breakdown || []} />
-                  </Box>
-                </Card>
-              </Grid>
-              <Grid item xs={12}>
-                <Card sx={{ p: 3 }}>
-                  <Typography variant="h6" gutterBottom>
-                    Asset Class Summary
-                  </Typography>
-                  <Grid container spacing={3}>
-                    {assetClasses.map((assetClass, index) => (
-                      <Grid item xs={12} sm={6} lg={4} key={index}>
-                        <Box 
-                          sx={{ 
-                            p: 3, 
-                            border: '2px solid', 
-                            borderColor: 'primary.light', 
-                            borderRadius: 3,
-                            textAlign: 'center',
-                            '&:hover': {
-                              borderColor: 'primary.main',
-                              boxShadow: 2
-                            }
-                          }}
-                        >
-                          <Typography variant="h6" fontWeight="bold" color="primary.main" gutterBottom>
-                            {assetClass.asset_class}
-                          </Typography>
-                          <Typography variant="h4" fontWeight="bold" sx={{ my: 2 }}>
-                            {formatCurrency(assetClass.total_value)}
-                          </Typography>
-                          <Chip 
-                            label={`${formatPercentage(assetClass.percentage)} • ${assetClass.items} items`}
-                            size="medium"
-                            color="primary"
-                            variant="outlined"
-                            sx={{ fontWeight: 'bold' }}
-                          />
-                        </Box>
+          <ResourceState resource={resources.netWorth} label="net worth">
+            {() => (
+              <Box>
+                <Typography variant="h5" gutterBottom sx={{ mb: 3 }}>
+                  Net Worth Breakdown by Asset Class
+                </Typography>
+                <Grid container spacing={3}>
+                  <Grid item xs={12}>
+                    <Card sx={{ p: 3 }}>
+                      <Typography variant="h6" gutterBottom>
+                        Net Worth Distribution
+                      </Typography>
+                      <Box sx={{ height: 350, width: 350, minHeight: 350 }}>
+                        <NetWorthChart data={netWorth?.detailed_breakdown || []} />
+                      </Box>
+                    </Card>
+                  </Grid>
+                  <Grid item xs={12}>
+                    <Card sx={{ p: 3 }}>
+                      <Typography variant="h6" gutterBottom>
+                        Asset Class Summary
+                      </Typography>
+                      <Grid container spacing={3}>
+                        {assetClasses.map((assetClass, index) => (
+                          <Grid item xs={12} sm={6} lg={4} key={index}>
+                            <Box 
+                              sx={{ 
+                                p: 3, 
+                                border: '2px solid', 
+                                borderColor: 'primary.light', 
+                                borderRadius: 3,
+                                textAlign: 'center',
+                                '&:hover': {
+                                  borderColor: 'primary.main',
+                                  boxShadow: 2
+                                }
+                              }}
+                            >
+                              <Typography variant="h6" fontWeight="bold" color="primary.main" gutterBottom>
+                                {assetClass.asset_class}
+                              </Typography>
+                              <Typography variant="h4" fontWeight="bold" sx={{ my: 2 }}>
+                                {formatCurrency(assetClass.total_value)}
+                              </Typography>
+                              <Chip 
+                                label={`${formatPercentage(assetClass.percentage)} • ${assetClass.items} items`}
+                                size="medium"
+                                color="primary"
+                                variant="outlined"
+                                sx={{ fontWeight: 'bold' }}
+                              />
+                            </Box>
+                          </Grid>
+                        ))}
                       </Grid>
-                    ))}
+                    </Card>
                   </Grid>
-                </Card>
-              </Grid>
-            </Grid>
-          </Box>
+                </Grid>
+              </Box>
+            )}
+          </ResourceState>
         </TabPanel>
       </Card>
     </Box>
@@ -15,95 +15,162 @@ import {
 
 import { formatCurrency, formatDate } from '../../utils/formatters';
 
-function DividendsTable({ dividends }) {
-  if (!dividends || dividends.length === 0) {
-    return (
-      <Box textAlign="center" py={4}>
-        <Typography variant="body1" color="text.secondary">
-          No dividend data found
-        </Typography>
-      </Box>
-    );
-  }
-
-  const getFrequencyColor = (frequency) => {
-    const colorMap = {
-      'Monthly': 'success',
-      'Quarterly': 'primary',
-      'Semi-Annual': 'warning',
-      'Annual': 'secondary',
-    };
-    return colorMap[frequency] || 'default';
+const getFrequencyColor = (frequency) => {
+  const colorMap = {
+    'Monthly': 'success',
+    'Quarterly': 'primary',
+    'Semi-Annual': 'warning',
+    'Annual': 'secondary',
   };
+  return colorMap[frequency] || 'default';
+};
+
+// Forward income per symbol, rendered as served by /api/dividends/projection
+function ProjectedIncome({ projection }) {
+  if (!projection || projection.symbols.length === 0) {
+    return null;
+  }
 
   return (
-    <TableContainer component={Paper} variant="outlined">
-      <Table>
-        <TableHead>
-          <TableRow>
-            <TableCell>Security</TableCell>
-            <TableCell>Ex-Dividend Date</TableCell>
-            <TableCell>Payment Date</TableCell>
-            <TableCell align="right">Dividend per Share</TableCell>
-            <TableCell align="right">Total Received</TableCell>
-            <TableCell>Frequency</TableCell>
-          </TableRow>
-        </TableHead>
-        <TableBody>
-          {dividends.map((dividend, index) => (
-            <TableRow key={index} hover>
-              <TableCell>
-                <Box>
-                  <Typography variant="body1" fontWeight="500">
-                    {dividend.symbol}
-                  </Typography>
-                  <Typography variant="caption" color="text.secondary">
-                    {dividend.security_name}
+    <Box mb={3}>
+      <Box display="flex" justifyContent="space-between" alignItems="baseline" mb={1}>
+        <Typography variant="subtitle1" color="text.secondary">
+          Projected income, next 12 months
+        </Typography>
+        <Typography variant="h6" fontWeight="bold" color="success.main">
+          {formatCurrency(projection.next_12_months_income)}
+        </Typography>
+      </Box>
+      <TableContainer component={Paper} variant="outlined">
+        <Table size="small">
+          <TableHead>
+            <TableRow>
+              <TableCell>Security</TableCell>
+              <TableCell>Frequency</TableCell>
+              <TableCell align="right">Next 12 Months</TableCell>
+              <TableCell align="right">Annual Run Rate</TableCell>
+            </TableRow>
+          </TableHead>
+          <TableBody>
+            {projection.symbols.map((row) => (
+              <TableRow key={row.symbol} hover>
+                <TableCell>
+                  <Typography variant="body2" fontWeight="500">
+                    {row.symbol}
                   </Typography>
-                </Box>
-              </TableCell>
-              <TableCell>
-                <Typography variant="body2">
-                  {formatDate(dividend.ex_dividend_date)}
-                </Typography>
-              </TableCell>
-              <TableCell>
-                <Typography variant="body2">
-                  {dividend.payment_date ? formatDate(dividend.payment_date) : 'TBD'}
-                </Typography>
-              </TableCell>
-              <TableCell align="right">
-                <Typography variant="body2" fontWeight="500">
-                  {formatCurrency(dividend.dividend_amount)}
-                </Typography>
-              </TableCell>
-              <TableCell align="right">
-                <Typography 
-                  variant="body1" 
-                  fontWeight="bold"
-                  color={dividend.total_dividend_received > 0 ? 'success.main' : 'text.secondary'}
-                >
-                  {dividend.total_dividend_received > 0 
-                    ? formatCurrency(dividend.total_dividend_received)
-                    : 'Not owned'
-                  }
-                </Typography>
-              </TableCell>
-              <TableCell>
-                {dividend.frequency && (
+                </TableCell>
+                <TableCell>
                   <Chip
-                    label={dividend.frequency}
+                    label={row.frequency}
                     size="small"
-                    color={getFrequencyColor(dividend.frequency)}
+                    color={getFrequencyColor(row.frequency)}
                     variant="outlined"
                   />
-                )}
-              </TableCell>
+                </TableCell>
+                <TableCell align="right">
+                  <Typography variant="body2" fontWeight="bold">
+                    {formatCurrency(row.next_12_months_income)}
+                  </Typography>
+                </TableCell>
+                <TableCell align="right">
+                  <Typography variant="body2" color="text.secondary">
+                    {formatCurrency(row.annual_income)}
+                  </Typography>
+                </TableCell>
+              </TableRow>
+            ))}
+          </TableBody>
+        </Table>
+      </TableContainer>
+    </Box>
+  );
+}
+
+function DividendsTable({ dividends, projection }) {
+  if (!dividends || dividends.length === 0) {
+    return (
+      <Box>
+        <ProjectedIncome projection={projection} />
+        <Box textAlign="center" py={4}>
+          <Typography variant="body1" color="text.secondary">
+            No dividend data found
+          </Typography>
+        </Box>
+      </Box>
+    );
+  }
+
+  return (
+    <Box>
+      <ProjectedIncome projection={projection} />
+      <TableContainer component={Paper} variant="outlined">
+        <Table>
+          <TableHead>
+            <TableRow>
+              <TableCell>Security</TableCell>
+              <TableCell>Ex-Dividend Date</TableCell>
+              <TableCell>Payment Date</TableCell>
+              <TableCell align="right">Dividend per Share</TableCell>
+              <TableCell align="right">Total Received</TableCell>
+              <TableCell>Frequency</TableCell>
             </TableRow>
-          ))}
-        </TableBody>
-      </Table>
-    </TableContainer>
+          </TableHead>
+          <TableBody>
+            {dividends.map((dividend, index) => (
+              <TableRow key={index} hover>
+                <TableCell>
+                  <Box>
+                    <Typography variant="body1" fontWeight="500">
+                      {dividend.symbol}
+                    </Typography>
+                    <Typography variant="caption" color="text.secondary">
+                      {dividend.security_name}
+                    </Typography>
+                  </Box>
+                </TableCell>
+                <TableCell>
+                  <Typography variant="body2">
+                    {formatDate(dividend.ex_dividend_date)}
+                  </Typography>
+                </TableCell>
+                <TableCell>
+                  <Typography variant="body2">
+                    {dividend.payment_date ? formatDate(dividend.payment_date) : 'TBD'}
+                  </Typography>
+                </TableCell>
+                <TableCell align="right">
+                  <Typography variant="body2" fontWeight="500">
+                    {formatCurrency(dividend.dividend_amount)}
+                  </Typography>
+                </TableCell>
+                <TableCell align="right">
+                  <Typography 
+                    variant="body1" 
+                    fontWeight="bold"
+                    color={dividend.total_dividend_received > 0 ? 'success.main' : 'text.secondary'}
+                  >
+                    {dividend.total_dividend_received > 0 
+                      ? formatCurrency(dividend.total_dividend_received)
+                      : 'Not owned'
+                    }
+                  </Typography>
+                </TableCell>
+                <TableCell>
+                  {dividend.frequency && (
+                    <Chip
+                      label={dividend.frequency}
+                      size="small"
+                      color={getFrequencyColor(dividend.frequency)}
+                      variant="outlined"
+                    />
+                  )}
+                </TableCell>
+              </TableRow>
+            ))}
+          </TableBody>
+        </Table>
+      </TableContainer>
+    </Box>
   );
 }
 
@@ -1,19 +1,97 @@
 // src/components/Portfolio/PositionsTable.js
-import React from 'react';
+import React, { memo } from 'react';
 import {
-  Table,
-  TableBody,
   TableCell,
-  TableContainer,
-  TableHead,
   TableRow,
-  Paper,
   Chip,
   Typography,
   Box,
 } from '@mui/material';
 
 import { formatCurrency, formatPercentage, formatGainLoss, getSecurityTypeInfo } from '../../utils/formatters';
+import VirtualizedTable from '../Common/VirtualizedTable';
+
+// Rows must stay this tall for the virtualized spacers to line up, so text
+// cells never wrap
+const ROW_HEIGHT = 73;
+const NBSP = '\u00a0';
+
+const PositionRow = memo(function PositionRow({ position }) {
+  const gainLoss = formatGainLoss(position.unrealized_gain_loss);
+  const gainLossPercent = formatGainLoss(position.unrealized_gain_loss_percent, 'percentage');
+  const securityTypeInfo = getSecurityTypeInfo(position.security_type);
+
+  return (
+    <TableRow hover sx={{ height: ROW_HEIGHT }}>
+      <TableCell>
+        <Box sx={{ maxWidth: 240 }}>
+          <Typography variant="body1" fontWeight="500" noWrap>
+            {position.symbol}
+          </Typography>
+          <Typography variant="caption" color="text.secondary" display="block" noWrap title={position.security_name}>
+            {position.security_name || NBSP}
+          </Typography>
+        </Box>
+      </TableCell>
+      <TableCell>
+        <Chip
+          label={position.security_type}
+          size="small"
+          sx={{
+            backgroundColor: securityTypeInfo.color,
+            color: 'white',
+            fontWeight: 'bold',
+          }}
+        />
+      </TableCell>
+      <TableCell align="right">
+        <Typography variant="body2">
+          {Number(position.quantity).toLocaleString()}
+        </Typography>
+      </TableCell>
+      <TableCell align="right">
+        <Typography variant="body2">
+          {formatCurrency(position.average_cost_basis)}
+        </Typography>
+      </TableCell>
+      <TableCell align="right">
+        <Typography variant="body2" fontWeight="500">
+          {formatCurrency(position.current_price)}
+        </Typography>
+      </TableCell>
+      <TableCell align="right">
+        <Typography variant="body1" fontWeight="bold">
+          {formatCurrency(position.market_value)}
+        </Typography>
+      </TableCell>
+      <TableCell align="right">
+        <Typography 
+          variant="body2" 
+          fontWeight="500"
+          sx={{ color: gainLoss.color }}
+        >
+          {gainLoss.value}
+        </Typography>
+      </TableCell>
+      <TableCell align="right">
+        <Chip
+          label={gainLossPercent.value}
+          size="small"
+          sx={{
+            backgroundColor: gainLossPercent.color,
+            color: 'white',
+            fontWeight: 'bold',
+          }}
+        />
+      </TableCell>
+      <TableCell>
+        <Typography variant="caption" color="text.secondary" display="block" noWrap sx={{ maxWidth: 200 }} title={position.brokerage}>
+          {position.brokerage}
+        </Typography>
+      </TableCell>
+    </TableRow>
+  );
+});
 
 function PositionsTable({ positions }) {
   if (!positions || positions.length === 0) {
@@ -27,101 +105,27 @@ function PositionsTable({ positions }) {
   }
 
   return (
-    <TableContainer component={Paper} variant="outlined">
-      <Table>
-        <TableHead>
-          <TableRow>
-            <TableCell>Security</TableCell>
-            <TableCell>Type</TableCell>
-            <TableCell align="right">Quantity</TableCell>
-            <TableCell align="right">Avg Cost</TableCell>
-            <TableCell align="right">Current Price</TableCell>
-            <TableCell align="right">Market Value</TableCell>
-            <TableCell align="right">Gain/Loss</TableCell>
-            <TableCell align="right">% Change</TableCell>
-            <TableCell>Brokerage</TableCell>
-          </TableRow>
-        </TableHead>
-        <TableBody>
-          {positions.map((position, index) => {
-            const gainLoss = formatGainLoss(position.unrealized_gain_loss);
-            const gainLossPercent = formatGainLoss(position.unrealized_gain_loss_percent, 'percentage');
-            const securityTypeInfo = getSecurityTypeInfo(position.security_type);
-
-            return (
-              <TableRow key={index} hover>
-                <TableCell>
-                  <Box>
-                    <Typography variant="body1" fontWeight="500">
-                      {position.symbol}
-                    </Typography>
-                    <Typography variant="caption" color="text.secondary">
-                      {position.security_name}
-                    </Typography>
-                  </Box>
-                </TableCell>
-                <TableCell>
-                  <Chip
-                    label={position.security_type}
-                    size="small"
-                    sx={{
-                      backgroundColor: securityTypeInfo.color,
-                      color: 'white',
-                      fontWeight: 'bold',
-                    }}
-                  />
-                </TableCell>
-                <TableCell align="right">
-                  <Typography variant="body2">
-                    {Number(position.quantity).toLocaleString()}
-                  </Typography>
-                </TableCell>
-                <TableCell align="right">
-                  <Typography variant="body2">
-                    {formatCurrency(position.average_cost_basis)}
-                  </Typography>
-                </TableCell>
-                <TableCell align="right">
-                  <Typography variant="body2" fontWeight="500">
-                    {formatCurrency(position.current_price)}
-                  </Typography>
-                </TableCell>
-                <TableCell align="right">
-                  <Typography variant="body1" fontWeight="bold">
-                    {formatCurrency(position.market_value)}
-                  </Typography>
-                </TableCell>
-                <TableCell align="right">
-                  <Typography 
-                    variant="body2" 
-                    fontWeight="500"
-                    sx={{ color: gainLoss.color }}
-                  >
-                    {gainLoss.value}
-                  </Typography>
-                </TableCell>
-                <TableCell align="right">
-                  <Chip
-                    label={gainLossPercent.value}
-                    size="small"
-                    sx={{
-                      backgroundColor: gainLossPercent.color,
-                      color: 'white',
-                      fontWeight: 'bold',
-                    }}
-                  />
-                </TableCell>
-                <TableCell>
-                  <Typography variant="caption" color="text.secondary">
-                    {position.brokerage}
-                  </Typography>
-                </TableCell>
-              </TableRow>
-            );
-          })}
-        </TableBody>
-      </Table>
-    </TableContainer>
+    <VirtualizedTable
+      rows={positions}
+      columnCount={9}
+      rowHeight={ROW_HEIGHT}
+      header={
+        <TableRow>
+          <TableCell>Security</TableCell>
+          <TableCell>Type</TableCell>
+          <TableCell align="right">Quantity</TableCell>
+          <TableCell align="right">Avg Cost</TableCell>
+          <TableCell align="right">Current Price</TableCell>
+          <TableCell align="right">Market Value</TableCell>
+          <TableCell align="right">Gain/Loss</TableCell>
+          <TableCell align="right">% Change</TableCell>
+          <TableCell>Brokerage</TableCell>
+        </TableRow>
+      }
+      renderRow={(position, index) => (
+        <PositionRow key={`${position.brokerage}-${position.symbol}-${index}`} position={position} />
+      )}
+    />
   );
 }
 
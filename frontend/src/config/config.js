@@ -41,9 +41,13 @@ const config = {
     POSITIONS: '/api/positions',
     ASSETS: '/api/assets',
     DIVIDENDS: '/api/dividends',
+    DIVIDEND_PROJECTION: '/api/dividends/projection',
     NET_WORTH: '/api/net-worth',
     MARKET_PRICES: '/api/market-prices',
     ASSET_HISTORY: '/api/asset', // Will be used as `/api/asset/{id}/history`
+    ASSETS_HISTORY: '/api/assets/history',
+    PRICE_HISTORY: '/api/prices/history',
+    MONTE_CARLO: '/api/simulations/monte-carlo',
     REFRESH_DATA: '/api/refresh-data',
   },
 };
@@ -0,0 +1,36 @@
+// src/hooks/useResource.js
+import { useCallback, useEffect, useSyncExternalStore } from 'react';
+
+import { getEntry, subscribe, revalidate, registerFetcher } from '../services/resourceCache';
+
+/**
+ * Subscribe a component to one cached API resource.
+ * Returns cached data immediately and revalidates in the background on mount.
+ */
+function useResource(key, fetcher, { maxAgeMs = 0 } = {}) {
+  const entry = useSyncExternalStore(
+    useCallback((listener) => subscribe(key, listener), [key]),
+    () => getEntry(key)
+  );
+
+  useEffect(() => {
+    registerFetcher(key, fetcher);
+    // Errors are kept on the entry; nothing to handle here
+    revalidate(key, fetcher, { maxAgeMs }).catch(() => {});
+    // fetcher identity is not part of the resource identity
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [key, maxAgeMs]);
+
+  const reload = useCallback(() => revalidate(key, fetcher), [key, fetcher]);
+
+  return {
+    data: entry.data,
+    error: entry.error,
+    isLoading: entry.data === undefined && !entry.error,
+    isValidating: Boolean(entry.promise),
+    updatedAt: entry.updatedAt,
+    reload,
+  };
+}
+
+export default useResource;
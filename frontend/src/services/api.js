@@ -2,12 +2,35 @@
 import axios from 'axios';
 import config, { getApiUrl, getAssetHistoryUrl } from '../config/config';
 
+const CLIENT_ID_KEY = 'treviwise:client-id';
+
+// Stable per-browser id; the backend pins a client's reads to the primary
+// right after its writes, and falls back to the IP address without it
+const getClientId = () => {
+  try {
+    let clientId = window.localStorage.getItem(CLIENT_ID_KEY);
+    if (!clientId) {
+      clientId = window.crypto?.randomUUID
+        ? window.crypto.randomUUID()
+        : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+      window.localStorage.setItem(CLIENT_ID_KEY, clientId);
+    }
+    return clientId;
+  } catch (err) {
+    // Storage disabled: the id lasts for this page load
+    return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+  }
+};
+
+const CLIENT_ID = getClientId();
+
 // Create axios instance with configuration from environment variables
 const api = axios.create({
   baseURL: `${config.API_BASE_URL}/api`, // Note: keeping your existing structure with /api suffix
   timeout: 10000,
   headers: {
     'Content-Type': 'application/json',
+    'X-Client-Id': CLIENT_ID,
   },
 });
 
@@ -70,12 +93,33 @@ export const apiService = {
     return response.data;
   },
 
+  // Bulk revaluation: [{ asset_id, value_original, valuation_method }]
+  async revalueAssets(revaluations) {
+    const response = await api.post('/assets/revalue', revaluations);
+    return response.data;
+  },
+
+  async revalueAssetsCsv(file) {
+    const formData = new FormData();
+    formData.append('file', file);
+    const response = await api.post('/assets/revalue/csv', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return response.data;
+  },
+
   // Dividends data
   async getDividends(limit = 20) {
     const response = await api.get(`/dividends?limit=${limit}`);
     return response.data;
   },
 
+  // Forward 12-month dividend calendar, yields and annual income estimate
+  async getDividendProjection() {
+    const response = await api.get('/dividends/projection');
+    return response.data;
+  },
+
   // Market prices
   async getMarketPrices() {
     const response = await api.get('/market-prices');
@@ -86,7 +130,39 @@ export const apiService = {
   async getAssetHistory(assetId, days = 90) {
     // Using axios directly with the full URL from helper function
     // This maintains your existing API structure
-    const response = await axios.get(getAssetHistoryUrl(assetId, days));
+    const response = await axios.get(getAssetHistoryUrl(assetId, days), {
+      headers: { 'X-Client-Id': CLIENT_ID },
+    });
+    return response.data;
+  },
+
+  // Aligned, server-downsampled history for several assets (or a whole asset class)
+  async getAssetsHistory({ assetIds, assetClass, days = 365, points = 200, method = 'lttb' } = {}) {
+    const response = await api.get('/assets/history', {
+      params: {
+        asset_ids: assetIds,
+        asset_class: assetClass,
+        days,
+        points,
+        method,
+      },
+      // FastAPI expects repeated keys (asset_ids=1&asset_ids=2), not asset_ids[]=1
+      paramsSerializer: { indexes: null },
+    });
+    return response.data;
+  },
+
+  async getPriceHistory({ symbols, days = 365, points = 200, method = 'lttb' } = {}) {
+    const response = await api.get('/prices/history', {
+      params: { symbols, days, points, method },
+      paramsSerializer: { indexes: null },
+    });
+    return response.data;
+  },
+
+  // Monte Carlo projection; see SimulationRequest in backend/main.py for the fields
+  async runSimulation(request) {
+    const response = await api.post('/simulations/monte-carlo', request);
     return response.data;
   },
 
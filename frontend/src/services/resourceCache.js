@@ -0,0 +1,102 @@
+// src/services/resourceCache.js
+/**
+ * Stale-while-revalidate cache for API resources
+ * - Cached data is returned immediately (including from a previous visit)
+ * - Revalidation runs in the background and notifies subscribers
+ * - Concurrent requests for the same key share one in-flight promise
+ */
+
+const STORAGE_PREFIX = 'treviwise:cache:v1:';
+
+// key -> { data, error, updatedAt, promise }
+const entries = new Map();
+// key -> Set of listeners
+const listeners = new Map();
+
+const readPersisted = (key) => {
+  try {
+    const raw = window.localStorage.getItem(STORAGE_PREFIX + key);
+    return raw ? JSON.parse(raw) : null;
+  } catch (err) {
+    return null;
+  }
+};
+
+const writePersisted = (key, data, updatedAt) => {
+  try {
+    window.localStorage.setItem(STORAGE_PREFIX + key, JSON.stringify({ data, updatedAt }));
+  } catch (err) {
+    // Quota exceeded or storage disabled: the in-memory cache still works
+  }
+};
+
+const notify = (key) => {
+  (listeners.get(key) || []).forEach((listener) => listener());
+};
+
+const setEntry = (key, patch) => {
+  // Snapshots must be new objects so React sees the change
+  entries.set(key, { ...getEntry(key), ...patch });
+  notify(key);
+};
+
+export const getEntry = (key) => {
+  if (!entries.has(key)) {
+    const persisted = readPersisted(key);
+    entries.set(key, {
+      data: persisted ? persisted.data : undefined,
+      updatedAt: persisted ? persisted.updatedAt : 0,
+      error: null,
+      promise: null,
+    });
+  }
+  return entries.get(key);
+};
+
+export const subscribe = (key, listener) => {
+  if (!listeners.has(key)) listeners.set(key, new Set());
+  listeners.get(key).add(listener);
+  return () => listeners.get(key).delete(listener);
+};
+
+/**
+ * Fetch `key` with `fetcher` unless a request is already in flight or the
+ * cached value is younger than `maxAgeMs`. Resolves with the latest data.
+ */
+export const revalidate = (key, fetcher, { maxAgeMs = 0 } = {}) => {
+  const entry = getEntry(key);
+
+  if (entry.promise) return entry.promise;
+  if (maxAgeMs > 0 && entry.data !== undefined && Date.now() - entry.updatedAt < maxAgeMs) {
+    return Promise.resolve(entry.data);
+  }
+
+  const promise = Promise.resolve()
+    .then(fetcher)
+    .then((data) => {
+      const updatedAt = Date.now();
+      setEntry(key, { data, updatedAt, error: null, promise: null });
+      writePersisted(key, data, updatedAt);
+      return data;
+    })
+    .catch((error) => {
+      // Keep serving the stale data; only this resource reports the error
+      setEntry(key, { error, promise: null });
+      throw error;
+    });
+
+  setEntry(key, { promise });
+  return promise;
+};
+
+// Registered fetchers, so every mounted resource can be revalidated at once
+const fetchers = new Map();
+
+export const registerFetcher = (key, fetcher) => {
+  fetchers.set(key, fetcher);
+};
+
+export const revalidateAll = () =>
+  Promise.allSettled(
+    Array.from(fetchers.entries()).map(([key, fetcher]) => revalidate(key, fetcher))
+  );
@@ -102,6 +102,26 @@ load_enhancements() {
     echo -e "${GREEN}✅ Schema enhancements loaded successfully${NC}"
 }
 
+# Function to apply numbered migrations in order
+load_migrations() {
+    echo -e "${BLUE}🔄 Applying migrations${NC}"
+    
+    shopt -s nullglob
+    migrations=(database/migrations/*.sql)
+    shopt -u nullglob
+    
+    if [ ${#migrations[@]} -eq 0 ]; then
+        echo -e "${YELLOW}No migrations found, skipping...${NC}"
+        return 0
+    fi
+    
+    for migration in "${migrations[@]}"; do
+        echo "   ➡️  $(basename "$migration")"
+        psql -h $DB_HOST -p $DB_PORT -U $DB_USER -d $DB_NAME -v ON_ERROR_STOP=1 -f "$migration" -q
+    done
+    echo -e "${GREEN}✅ Migrations applied successfully${NC}"
+}
+
 # Function to load sample data
 load_sample_data() {
     echo -e "${BLUE}📊 Loading sample data${NC}"
@@ -178,6 +198,7 @@ main() {
     create_database
     load_schema
     load_enhancements
+    load_migrations
     
     if [ "$LOAD_SAMPLE_DATA" = true ]; then
         load_sample_data